@@ -9,6 +9,7 @@ import traceback
 from typing import Literal
 from pathlib import Path
 from functools import wraps
+import httpx
 import redis
 from jose import jwt
 import bcrypt
@@ -362,15 +363,7 @@ def get_data(url: str | Path):
         else:
             error = f'file {C.NOT_FOUND}'
     except Exception as e:
-        if res is None:
-            error = 'no response'
-        elif 'unexpected error' in res.text:
-            error = 'unexpected error'
-        elif '404 Not Found' in res.text:
-            error = C.NOT_FOUND
-        else:
-            error = res.text
-        error = f'{e}: {error}'
+        error = get_data_error(e, res)
 
     res = {
         C.DATA: data,
@@ -379,13 +372,54 @@ def get_data(url: str | Path):
         C.TIME_TAKEN: time_taken_get(start),
     }
 
-    in_logs(
-        res[C.TIME_TAKEN], str(url), 'logs_url', {C.ERROR: error} if error else None
-    )
+    get_data_log(res)
 
     return res
 
 
+async def get_data_async(client: httpx.AsyncClient, url: str):
+    '''Same as `get_data` for url, logging left to caller thread'''
+    start = time.perf_counter()
+    data = {}
+    res = None
+    error = None
+
+    try:
+        res = await client.get(url)
+        data = res.json()
+    except Exception as e:
+        error = get_data_error(e, res)
+
+    return {
+        C.DATA: data,
+        C.ERROR: error,
+        'url': url,
+        C.TIME_TAKEN: time_taken_get(start),
+    }
+
+
+def get_data_error(e: Exception, res) -> str:
+    if res is None:
+        error = 'no response'
+    elif 'unexpected error' in res.text:
+        error = 'unexpected error'
+    elif '404 Not Found' in res.text:
+        error = C.NOT_FOUND
+    else:
+        error = res.text
+
+    return f'{e}: {error}'
+
+
+def get_data_log(res: dict):
+    in_logs(
+        res[C.TIME_TAKEN],
+        str(res['url']),
+        'logs_url',
+        {C.ERROR: res[C.ERROR]} if res[C.ERROR] else None,
+    )
+
+
 def time_taken_get(start: float):
     time_taken = f'{(time.perf_counter() - start):.02f}'
     seconds, milliseconds = tuple(map(int, time_taken.split('.')))
@@ -255,6 +255,7 @@ RedisTargetHash = Literal[
     'player',
     'group',
     'user',
+    'platform_affinity',
     # f'matches:{str}',
 ]
 RedisTarget = RedisTargetGet | RedisTargetList | RedisTargetHash
@@ -101,13 +101,16 @@ from apps.tracker.tests.main import (
     test_players_get,
     test_matches_router,
     test_match_get,
+    test_match_job,
     test_match_stats_get,
+    test_loadouts_encode,
     test_clear_fullmatches_doubles,
     test_player_clear_match_doubles,
     test_labels_get,
     test_labels_put,
     test_labels_post,
     test_reset,
+    test_play_with,
     test_task_queues_delete,
     test_player_delete,
     test_labels_delete,
@@ -0,0 +1,137 @@
+import csv
+import datetime
+import io
+from zoneinfo import ZoneInfo
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from apps.tracker.crud.match_formatter import MF
+from apps.tracker.schemas.main import ColumnPlan, GameMode
+
+
+class BulkInsert:
+    '''
+    Write formatted matches without orm objects \n
+    Small packs go with multi-row `INSERT ... ON CONFLICT DO NOTHING`,
+    bigger with `COPY FROM STDIN`
+    '''
+
+    COPY_THRESHOLD = 100
+    NULL = r'\N'
+
+    def __init__(self):
+        self.plans: dict[str, ColumnPlan] = {}
+        self.timezone: datetime.tzinfo | None = None
+
+    def plan_get(self, table, game_mode: GameMode) -> ColumnPlan:
+        '''
+        Table columns in `MF.GAME_COLUMNS` order without id,
+        with values server would set for missing not null columns
+        '''
+        plan = self.plans.get(table.__tablename__)
+        if plan is not None:
+            return plan
+
+        table_columns = table.__table__.columns
+        columns = [
+            column
+            for column in MF.GAME_COLUMNS[game_mode]
+            if column in table_columns and table_columns[column].primary_key is False
+        ]
+        # fullmatches basic tables can have columns missing in matches table
+        columns += [
+            column.name
+            for column in table_columns
+            if column.name not in columns and column.primary_key is False
+        ]
+
+        defaults = []
+        for column in columns:
+            column = table_columns[column]
+            default = None
+            if column.server_default is not None and isinstance(
+                column.server_default.arg, str
+            ):
+                default = column.type.python_type(column.server_default.arg)
+            defaults.append(default)
+
+        plan = ColumnPlan(columns=tuple(columns), defaults=tuple(defaults))
+        self.plans[table.__tablename__] = plan
+
+        return plan
+
+    def rows_get(self, plan: ColumnPlan, matches: list[dict]):
+        return [
+            tuple(
+                match.get(column, default)
+                for column, default in zip(plan.columns, plan.defaults)
+            )
+            for match in matches
+        ]
+
+    def insert(self, db: Session, table, game_mode: GameMode, matches: list[dict]):
+        '''Add matches in current transaction, commit left to caller'''
+        if not matches:
+            return 0
+
+        plan = self.plan_get(table, game_mode)
+        rows = self.rows_get(plan, matches)
+
+        if len(rows) < self.COPY_THRESHOLD:
+            db.execute(
+                insert(table).on_conflict_do_nothing(),
+                [dict(zip(plan.columns, row)) for row in rows],
+            )
+        else:
+            self.copy(db, table.__tablename__, plan.columns, rows)
+
+        return len(rows)
+
+    def copy(
+        self,
+        db: Session,
+        table_name: str,
+        columns: tuple[str, ...],
+        rows: list[tuple],
+    ):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        timezone = self.timezone_get(db)
+        for row in rows:
+            writer.writerow(self.copy_value(value, timezone) for value in row)
+        buffer.seek(0)
+
+        columns_sql = ', '.join(f'"{column}"' for column in columns)
+        cursor = db.connection().connection.cursor()
+        cursor.copy_expert(
+            f'''COPY {table_name} ({columns_sql}) \
+FROM STDIN WITH (FORMAT csv, NULL '{self.NULL}')''',
+            buffer,
+        )
+        cursor.close()
+
+    def copy_value(self, value, timezone: datetime.tzinfo):
+        if value is None:
+            return self.NULL
+        if isinstance(value, datetime.datetime) and value.tzinfo is not None:
+            # same as server cast from timestamptz to timestamp
+            return value.astimezone(timezone).replace(tzinfo=None).isoformat()
+        if isinstance(value, bool):
+            return 't' if value else 'f'
+        if isinstance(value, bytes):
+            return f'\\x{value.hex()}'
+        return value
+
+    def timezone_get(self, db: Session):
+        if self.timezone is None:
+            name = db.execute(text('SHOW TimeZone')).scalar()
+            try:
+                self.timezone = ZoneInfo(name)
+            except Exception:
+                self.timezone = datetime.UTC
+
+        return self.timezone
+
+
+BI = BulkInsert()
@@ -0,0 +1,103 @@
+import datetime
+from collections import Counter
+import redis
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from core.config import settings
+
+from apps.base.schemas.main import C
+from apps.base.crud.utils import now
+
+from apps.tracker.crud.store_tables import STT
+from apps.tracker.crud.bulk_insert import BI
+from apps.tracker.schemas.main import GameModeOnly
+
+
+class ChartRollup:
+    '''
+    Matches count by day for each player and game mode,
+    charts built from it instead of scanning matches tables \n
+    Filled by `GROUP BY` once, then updated with each saved matches pack,
+    finished fill marked in `cod_matches_daily_filled` key
+    '''
+
+    def __init__(self):
+        self.table = STT.matches_daily
+        self.name = self.table.__tablename__
+        self.filled_key = f'{self.name}_filled'
+        self.conn = redis.Redis(connection_pool=settings.REDIS_CONNECTION_POOL)
+
+    def is_filled(self) -> bool:
+        return bool(self.conn.exists(self.filled_key))
+
+    def add(self, db: Session, game_mode: GameModeOnly, matches: list[dict]):
+        '''Count new matches, commit left to caller'''
+        # day of time as saved by `BI` in server timezone, same as `fill` counts
+        timezone = BI.timezone_get(db)
+        days = Counter(
+            (match[C.TIME].astimezone(timezone).date(), match[C.UNO])
+            for match in matches
+            if isinstance(match.get(C.TIME), datetime.datetime)
+        )
+        if not days:
+            return
+
+        stmt = insert(self.table)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[
+                    self.table.date,
+                    self.table.uno,
+                    self.table.game_mode,
+                ],
+                set_={'count': self.table.count + stmt.excluded.count},
+            ),
+            [
+                {
+                    C.DATE: date,
+                    C.UNO: uno,
+                    C.GAME_MODE: game_mode,
+                    'count': count,
+                }
+                for (date, uno), count in days.items()
+            ],
+        )
+
+    def fill(self, db: Session, game_mode: GameModeOnly, uno: str | None = None):
+        table_name = STT.get_table(game_mode, C.MATCHES).name
+        db.execute(
+            text(
+                f'''INSERT INTO {self.name} (date, uno, game_mode, count)
+SELECT CAST(date_trunc('day', time) AS date), uno, :game_mode, COUNT(*)
+FROM {table_name} WHERE uno IS NOT NULL {'AND uno = :uno' if uno else ''}
+GROUP BY 1, 2'''
+            ),
+            {C.GAME_MODE: game_mode, C.UNO: uno},
+        )
+
+    def player_rebuild(self, db: Session, uno: str, game_modes: list[GameModeOnly]):
+        '''Count days of player again after matches deleted, commit left to caller'''
+        db.query(self.table).filter(
+            self.table.uno == uno, self.table.game_mode.in_(game_modes)
+        ).delete(synchronize_session=False)
+        for game_mode in game_modes:
+            self.fill(db, game_mode, uno)
+
+    def rebuild(self, db: Session):
+        db.execute(text(f'TRUNCATE {self.name}'))
+        for t in STT.get_tables(C.ALL, C.ALL, C.MATCHES):
+            self.fill(db, t.game_mode)
+        db.commit()
+        self.conn.set(self.filled_key, now(C.ISO))
+
+    def rows_get(self, db: Session) -> list[tuple[datetime.date, str, str, int]]:
+        if not self.is_filled():
+            self.rebuild(db)
+        return db.query(
+            self.table.date, self.table.uno, self.table.game_mode, self.table.count
+        ).all()
+
+
+CR = ChartRollup()
@@ -0,0 +1,168 @@
+from collections import Counter
+from sqlalchemy import String, and_, column, func, select, union_all, values
+from sqlalchemy.orm import Session
+
+from apps.base.schemas.main import C
+
+from apps.tracker.schemas.main import TableGameData
+
+
+class CoOccurrence:
+    '''
+    Players found in same fullmatches, counted by one self join
+    of distinct (uno, matchID) rows of game mode tables \n
+    Replaces query per player and per match in `most_play_with_update`
+    '''
+
+    def entries_get(self, game_tables: list[TableGameData]):
+        '''Distinct (uno, matchID) of all tables, match doubles counted once'''
+        selects = [select(t.table.uno, t.table.matchID) for t in game_tables]
+        all_entries = union_all(*selects).subquery('all_entries')
+        return (
+            select(all_entries.c.uno, all_entries.c.matchID)
+            .where(all_entries.c.uno.isnot(None), all_entries.c.matchID.isnot(None))
+            .distinct()
+            .cte('entries')
+        )
+
+    def matches_count(
+        self, db: Session, game_tables: list[TableGameData], unos: list[str]
+    ) -> dict[str, int]:
+        entries = self.entries_get(game_tables)
+        query = (
+            select(entries.c.uno, func.count())
+            .where(entries.c.uno.in_(unos))
+            .group_by(entries.c.uno)
+        )
+        return dict(db.execute(query).all())
+
+    def pairs_get(self, game_tables: list[TableGameData], unos: list[str]):
+        '''Select (uno, other_uno, count) of `unos` and players of their matches'''
+        entries = self.entries_get(game_tables)
+        player = entries.alias('player')
+        other = entries.alias('other')
+        return (
+            select(
+                player.c.uno,
+                other.c.uno.label('other_uno'),
+                func.count().label(C.COUNT),
+            )
+            .join_from(
+                player,
+                other,
+                and_(
+                    player.c.matchID == other.c.matchID,
+                    player.c.uno != other.c.uno,
+                ),
+            )
+            .where(player.c.uno.in_(unos))
+            .group_by(player.c.uno, other.c.uno)
+        )
+
+    def players_top(
+        self,
+        db: Session,
+        game_tables: list[TableGameData],
+        unos: list[str],
+        top_limit: int,
+        count_required: int,
+    ) -> dict[str, list[tuple[str, int]]]:
+        '''
+        For each of `unos` most common players of its matches,
+        played together more than `count_required` times
+        '''
+        pairs = (
+            self.pairs_get(game_tables, unos)
+            .having(func.count() > count_required)
+            .subquery('pairs')
+        )
+        ranked = select(
+            pairs,
+            func.row_number()
+            .over(partition_by=pairs.c.uno, order_by=pairs.c[C.COUNT].desc())
+            .label('rank'),
+        ).subquery('ranked')
+        query = (
+            select(ranked.c.uno, ranked.c.other_uno, ranked.c[C.COUNT])
+            .where(ranked.c.rank <= top_limit)
+            .order_by(ranked.c.uno, ranked.c.rank)
+        )
+
+        top: dict[str, list[tuple[str, int]]] = {uno: [] for uno in unos}
+        for uno, other_uno, count in db.execute(query):
+            top[uno].append((other_uno, count))
+        return top
+
+    def groups_count(
+        self,
+        db: Session,
+        game_tables: list[TableGameData],
+        player_to_group: dict[str, str],
+    ) -> dict[str, Counter[str]]:
+        '''
+        Players of matches played by any group member,
+        each match counted once for group, own group members not counted
+        '''
+        groups: dict[str, Counter[str]] = {
+            group: Counter() for group in player_to_group.values()
+        }
+        if not player_to_group:
+            return groups
+
+        entries = self.entries_get(game_tables)
+        members, same_group = (
+            values(column(C.UNO, String), column(C.GROUP, String), name=name).data(
+                list(player_to_group.items())
+            )
+            for name in ('members', 'same_group')
+        )
+        group_matches = (
+            select(members.c.group, entries.c.matchID)
+            .join_from(members, entries, members.c.uno == entries.c.uno)
+            .distinct()
+            .subquery('group_matches')
+        )
+        query = (
+            select(group_matches.c.group, entries.c.uno, func.count())
+            .join_from(
+                group_matches,
+                entries,
+                group_matches.c.matchID == entries.c.matchID,
+            )
+            .outerjoin(
+                same_group,
+                and_(
+                    same_group.c.uno == entries.c.uno,
+                    same_group.c.group == group_matches.c.group,
+                ),
+            )
+            .where(same_group.c.uno.is_(None))
+            .group_by(group_matches.c.group, entries.c.uno)
+        )
+
+        for group, uno, count in db.execute(query):
+            groups[group][uno] = count
+        return groups
+
+    def tags_get(
+        self, db: Session, game_tables: list[TableGameData], unos: set[str]
+    ) -> dict[str, dict[str, str]]:
+        '''Latest username and clantag of `unos`, one query for each table'''
+        tags: dict[str, dict[str, str]] = {}
+        for t in game_tables:
+            missing = list(unos - tags.keys())
+            if not missing:
+                break
+            query = (
+                select(t.table.uno, t.table.username, t.table.clantag)
+                .where(t.table.uno.in_(missing), t.table.username.isnot(None))
+                .distinct(t.table.uno)
+                .order_by(t.table.uno, t.table.time.desc())
+            )
+            for uno, username, clantag in db.execute(query):
+                tags[uno] = {C.USERNAME: username, C.CLANTAG: clantag or ''}
+
+        return tags
+
+
+CO = CoOccurrence()
@@ -0,0 +1,207 @@
+import fcntl
+import mmap
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+import simplejson as json
+
+from apps.base.schemas.main import C
+from apps.base.crud.utils import time_taken_get
+
+
+class GameDataStore:
+    '''
+    Append-only store for game data responses \n
+    Records are zlib compressed json appended to segment files,
+    sqlite index keeps key -> (segment, offset, length),
+    key is data file path relative to data folder without suffix
+    '''
+
+    SEGMENT_LIMIT = 256 * 1024 * 1024
+    COMPRESS_LEVEL = 6
+    PACK_COMMIT_STEP = 1000
+
+    def __init__(self):
+        self.data_directory = Path.cwd().parent / C.STATIC / C.FILES / C.DATA
+        self.directory = Path.cwd().parent / C.STATIC / C.FILES / 'data_store'
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.maps: dict[int, mmap.mmap] = {}
+
+    def key_get(self, file_path: Path) -> str:
+        return file_path.relative_to(self.data_directory).with_suffix('').as_posix()
+
+    def index_get(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self.local, 'conn', None)
+        if conn is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.directory / 'index.sqlite', timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                '''CREATE TABLE IF NOT EXISTS records (
+                key TEXT PRIMARY KEY,
+                segment INTEGER NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL
+                )'''
+            )
+            self.local.conn = conn
+        return conn
+
+    def segment_path(self, segment: int):
+        return self.directory / f'segment_{segment:06}.bin'
+
+    def read(self, key: str) -> bytes | None:
+        record = (
+            self.index_get()
+            .execute(
+                'SELECT segment, offset, length FROM records WHERE key = ?', (key,)
+            )
+            .fetchone()
+        )
+        if record is None:
+            return None
+
+        segment, offset, length = record
+        with self.lock:
+            segment_map = self.maps.get(segment)
+            if segment_map is None or len(segment_map) < offset + length:
+                # segment grown after it was mapped
+                if segment_map is not None:
+                    segment_map.close()
+                with open(self.segment_path(segment), 'rb') as file:
+                    segment_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                self.maps[segment] = segment_map
+            compressed = segment_map[offset : offset + length]
+
+        return zlib.decompress(compressed)
+
+    def get(self, key: str) -> dict | None:
+        raw = self.read(key)
+        if raw is None:
+            return None
+        return json.loads(raw)
+
+    def get_data(self, file_path: Path) -> dict | None:
+        '''Same result as `get_data` for local file'''
+        start = time.perf_counter()
+        data = self.get(self.key_get(file_path))
+        if data is None:
+            return None
+
+        return {
+            C.DATA: data,
+            C.ERROR: None,
+            'url': file_path,
+            C.TIME_TAKEN: time_taken_get(start),
+        }
+
+    def keys_get(self, prefix: str) -> list[str]:
+        '''Keys of records under `prefix` folder, like `fullmatches/mw_wz/`'''
+        records = self.index_get().execute(
+            "SELECT key FROM records WHERE key LIKE ? ESCAPE '\\'",
+            (prefix.replace('_', '\\_').replace('%', '\\%') + '%',),
+        )
+        return [key for (key,) in records]
+
+    def put(self, file_path: Path, data: dict):
+        self.put_raw(self.key_get(file_path), json.dumps(data).encode())
+
+    def is_exist(self, key: str) -> bool:
+        record = (
+            self.index_get()
+            .execute('SELECT 1 FROM records WHERE key = ?', (key,))
+            .fetchone()
+        )
+        return record is not None
+
+    def put_raw(self, key: str, raw: bytes) -> bool:
+        return self.put_many([(key, raw)]) == 1
+
+    def put_many(self, records: list[tuple[str, bytes]]) -> int:
+        '''
+        Append records with not saved keys, returns count of appended \n
+        Keys checked again and index committed while file lock held,
+        so writers of same key don't append it twice
+        '''
+        compressed: dict[str, bytes] = {
+            key: zlib.compress(raw, self.COMPRESS_LEVEL)
+            for key, raw in records
+            if not self.is_exist(key)
+        }
+        if not compressed:
+            return 0
+
+        index = self.index_get()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        rows: list[tuple[str, int, int, int]] = []
+
+        # one writer for all processes
+        with open(self.directory / 'lock', 'w', encoding='utf8') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                segment = (
+                    index.execute('SELECT MAX(segment) FROM records').fetchone()[0]
+                    or 1
+                )
+                file = open(self.segment_path(segment), 'ab')
+                try:
+                    for key, data in compressed.items():
+                        if self.is_exist(key):
+                            continue
+                        if file.tell() and file.tell() + len(data) > self.SEGMENT_LIMIT:
+                            file.close()
+                            segment += 1
+                            file = open(self.segment_path(segment), 'ab')
+                        rows.append((key, segment, file.tell(), len(data)))
+                        file.write(data)
+                finally:
+                    file.close()
+
+                index.executemany('INSERT INTO records VALUES (?, ?, ?, ?)', rows)
+                index.commit()
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+        return len(rows)
+
+    def pack(self, remove=False):
+        '''Move existing data files into segments'''
+        start = time.perf_counter()
+        packed = 0
+        skipped = 0
+
+        file_paths = list(self.data_directory.rglob('*.json'))
+        for step in range(0, len(file_paths), self.PACK_COMMIT_STEP):
+            step_paths = file_paths[step : step + self.PACK_COMMIT_STEP]
+            step_packed = self.put_many(
+                [
+                    (self.key_get(file_path), file_path.read_bytes())
+                    for file_path in step_paths
+                ]
+            )
+            packed += step_packed
+            skipped += len(step_paths) - step_packed
+
+            seconds = time.perf_counter() - start
+            print(
+                f'{packed} packed, {skipped} skipped,',
+                f'{int((packed + skipped) / seconds)} files/s',
+            )
+
+            # removed only after step committed
+            if remove:
+                for file_path in step_paths:
+                    file_path.unlink()
+
+        print(
+            f'{packed} packed, {skipped} skipped',
+            f'[{time_taken_get(start)}]',
+        )
+
+        return packed
+
+
+GDS = GameDataStore()
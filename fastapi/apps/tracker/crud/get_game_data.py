@@ -1,5 +1,11 @@
+import asyncio
+import threading
 import time
+import uuid
+from contextlib import contextmanager
 from pathlib import Path
+import httpx
+import redis
 import simplejson as json
 
 from core.config import settings
@@ -8,6 +14,8 @@ from apps.base.schemas.main import C
 from apps.base.crud.utils import (
     date_format,
     get_data,
+    get_data_async,
+    get_data_log,
     in_logs,
     in_logs_cod_logs_cache,
     redis_manage,
@@ -17,6 +25,166 @@ from apps.base.crud.utils import (
 from apps.tracker.crud.store_game_modes import SGM
 from apps.tracker.schemas.main import GameDataSlugs
 from apps.tracker.crud.utils import make_break
+from apps.tracker.crud.rate_limit import RATE_LIMIT
+from apps.tracker.crud.game_data_store import GDS
+
+
+class GameDataFetcher:
+    '''
+    Runs requests on own event loop thread with shared keep-alive pool \n
+    `FETCH_CONCURRENCY` requests in flight, starts spaced by `sleep` seconds
+    and paced by `RATE_LIMIT` token bucket
+    '''
+
+    def __init__(self):
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.client: httpx.AsyncClient | None = None
+        self.semaphore: asyncio.Semaphore | None = None
+        self.next_start = 0.0
+        self.lock = threading.Lock()
+
+    def start(self):
+        with self.lock:
+            if self.loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name=GameDataFetcher.__name__, daemon=True
+            ).start()
+            asyncio.run_coroutine_threadsafe(self.client_init(), loop).result()
+            self.loop = loop
+
+    async def client_init(self):
+        self.client = httpx.AsyncClient(
+            headers=dict(settings.SESSION.headers),
+            cookies=settings.SESSION.cookies.get_dict(),
+            timeout=settings.FETCH_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=settings.FETCH_CONCURRENCY,
+                max_keepalive_connections=settings.FETCH_CONCURRENCY,
+            ),
+        )
+        self.semaphore = asyncio.Semaphore(settings.FETCH_CONCURRENCY)
+
+    async def pace(self, sleep: float):
+        current = self.loop.time()
+        start = max(current, self.next_start)
+        self.next_start = start + sleep
+        await asyncio.sleep(start - current)
+        # shared budget for all processes
+        await asyncio.sleep(await asyncio.to_thread(RATE_LIMIT.acquire))
+
+    async def fetch(self, url: str, sleep: float):
+        async with self.semaphore:
+            await self.pace(sleep)
+            return await get_data_async(self.client, url)
+
+    async def fetch_all(self, urls: list[str], sleep: float):
+        return await asyncio.gather(*(self.fetch(url, sleep) for url in urls))
+
+    def get(self, urls: list[str], sleep: float) -> list[dict]:
+        self.start()
+        results = asyncio.run_coroutine_threadsafe(
+            self.fetch_all(urls, sleep), self.loop
+        ).result()
+
+        for res in results:
+            get_data_log(res)
+
+        return results
+
+
+FETCHER = GameDataFetcher()
+
+
+class SingleFlight:
+    '''
+    Same slugs requested by several callers fetched only once \n
+    First caller takes redis lock for slugs and publish handled result,
+    others wait for that result instead of own request \n
+    Leader lock extended while request runs, it can wait rate limit penalty
+    longer than lock expire
+    '''
+
+    LOCK = 'game_data_lock'
+    RESULT = 'game_data_result'
+    RESULT_EXPIRE = 60
+    WAIT_STEP = 0.2
+
+    def __init__(self):
+        self.conn = redis.Redis(connection_pool=settings.REDIS_CONNECTION_POOL)
+        self.lock_expire = settings.FETCH_TIMEOUT * 4
+
+    def key_get(self, slugs: GameDataSlugs):
+        return '/'.join(map(str, slugs)).lower()
+
+    def lock(self, slugs: GameDataSlugs) -> str | None:
+        '''Returns token when caller became leader for slugs'''
+        token = uuid.uuid4().hex
+        key = self.key_get(slugs)
+        if self.conn.set(f'{self.LOCK}:{key}', token, nx=True, ex=self.lock_expire):
+            return token
+        return None
+
+    def publish(self, slugs: GameDataSlugs, token: str, result: dict | list | None):
+        self.conn.set(
+            f'{self.RESULT}:{self.key_get(slugs)}',
+            json.dumps({C.DATA: result}),
+            ex=self.RESULT_EXPIRE,
+        )
+        self.release(slugs, token)
+
+    def release(self, slugs: GameDataSlugs, token: str):
+        '''Remove lock if it still belongs to caller'''
+        key = f'{self.LOCK}:{self.key_get(slugs)}'
+        lock_token = self.conn.get(key)
+        if lock_token is not None and lock_token.decode() == token:
+            self.conn.delete(key)
+
+    def extend(self, slugs: GameDataSlugs, token: str):
+        '''Reset lock expire if it still belongs to caller'''
+        key = f'{self.LOCK}:{self.key_get(slugs)}'
+        lock_token = self.conn.get(key)
+        if lock_token is not None and lock_token.decode() == token:
+            self.conn.expire(key, self.lock_expire)
+
+    @contextmanager
+    def hold(self, locks: list[tuple[GameDataSlugs, str]]):
+        '''Extend leader `locks` in background until block finished'''
+        stop = threading.Event()
+
+        def heartbeat():
+            while not stop.wait(self.lock_expire / 3):
+                for slugs, token in locks:
+                    self.extend(slugs, token)
+
+        thread = threading.Thread(target=heartbeat, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def wait(self, slugs: GameDataSlugs) -> tuple[bool, dict | list | None]:
+        '''
+        Wait leader result, returns (False, None)
+        when leader gone without result and caller must fetch self
+        '''
+        key = self.key_get(slugs)
+        while True:
+            pipe = self.conn.pipeline()
+            pipe.get(f'{self.RESULT}:{key}')
+            pipe.exists(f'{self.LOCK}:{key}')
+            result, is_locked = pipe.execute()
+            if result is not None:
+                return True, json.loads(result)[C.DATA]
+            if not is_locked:
+                return False, None
+            time.sleep(self.WAIT_STEP)
+
+
+SINGLE_FLIGHT = SingleFlight()
 
 
 class GameData:
@@ -103,12 +271,84 @@ crm/cod/v2/{C.PLATFORM}/{platform}/\
     @staticmethod
     def get(
         slugs: GameDataSlugs,
-        sleep: int,
+        sleep: float,
         ignore_status=False,
     ) -> dict | list | None:
+        return GameData.get_batch([slugs], sleep, ignore_status)[0]
+
+    @staticmethod
+    def get_batch(
+        slugs_list: list[GameDataSlugs],
+        sleep: float,
+        ignore_status=False,
+    ) -> list[dict | list | None]:
+        '''Fetch slugs concurrently, results returned in same order'''
+        if not slugs_list:
+            return []
         if ignore_status is False and redis_manage(C.STATUS) != C.ACTIVE:
-            return
+            return [None] * len(slugs_list)
+
+        is_have_token = settings.SESSION.cookies.get('ACT_SSO_COOKIE') is not None
+
+        breaks: set[str] = set()
+
+        if is_have_token is False:
+            results = []
+            for slugs in slugs_list:
+                file_path = GameData.generate_file_path(slugs)
+                data = GDS.get_data(file_path) or get_data(file_path)
+                results.append(GameData.handle(slugs, data, is_have_token, breaks))
+            return results
+
+        results: list[dict | list | None] = [None] * len(slugs_list)
+        leaders: dict[int, str] = {}
+        waiters: list[int] = []
+        for index, slugs in enumerate(slugs_list):
+            token = SINGLE_FLIGHT.lock(slugs)
+            if token is None:
+                waiters.append(index)
+            else:
+                leaders[index] = token
 
+        try:
+            urls = [GameData.get_url(slugs_list[index]) for index in leaders]
+            locks = [(slugs_list[index], token) for index, token in leaders.items()]
+            # handle can sleep rate limit penalty too
+            with SINGLE_FLIGHT.hold(locks):
+                responses = FETCHER.get(urls, sleep) if urls else []
+                for index, data in zip(list(leaders), responses):
+                    slugs = slugs_list[index]
+                    results[index] = GameData.handle(
+                        slugs, data, is_have_token, breaks
+                    )
+                    SINGLE_FLIGHT.publish(slugs, leaders.pop(index), results[index])
+        finally:
+            # waiters fetch self when leader failed
+            for index, token in leaders.items():
+                SINGLE_FLIGHT.release(slugs_list[index], token)
+
+        missed: list[int] = []
+        for index in waiters:
+            is_shared, results[index] = SINGLE_FLIGHT.wait(slugs_list[index])
+            if is_shared is False:
+                missed.append(index)
+
+        if missed:
+            urls = [GameData.get_url(slugs_list[index]) for index in missed]
+            for index, data in zip(missed, FETCHER.get(urls, sleep)):
+                results[index] = GameData.handle(
+                    slugs_list[index], data, is_have_token, breaks
+                )
+
+        return results
+
+    @staticmethod
+    def handle(
+        slugs: GameDataSlugs,
+        data: dict,
+        is_have_token: bool,
+        breaks: set[str],
+    ) -> dict | list | None:
         target, game_mode, data_type, platform, start_time = slugs
         player_username: str | None = (
             redis_manage(f'{C.PLAYER}:{C.UNO}_{target}', 'hget', C.USERNAME) or [None]
@@ -117,15 +357,6 @@ crm/cod/v2/{C.PLATFORM}/{platform}/\
         info = ' '.join((username, game_mode, data_type, platform))
         file_path = GameData.generate_file_path(slugs)
 
-        is_have_token = settings.SESSION.cookies.get('ACT_SSO_COOKIE') is not None
-
-        if is_have_token:
-            time.sleep(sleep)
-            data = get_data(GameData.get_url(slugs))
-        else:
-            data = get_data(file_path)
-
-
         message = f'[{data[C.TIME_TAKEN]}]'
         if start_time:
             message += f' [{date_format(start_time, C.DATETIME)}]'
@@ -137,10 +368,10 @@ crm/cod/v2/{C.PLATFORM}/{platform}/\
             if is_have_token is False:
                 if isinstance(data['url'], Path): # was loaded from local file
                     message += ' [local]'
-                else: # save to local file
-                    GameData.save_data(file_path, data[C.DATA])
+                else: # save to local store
+                    GDS.put(file_path, data[C.DATA])
             elif get_status('store_data'):
-                GameData.save_data(file_path, data[C.DATA])
+                GDS.put(file_path, data[C.DATA])
 
             if player_username:
                 in_logs(target, f'{info} {message}', 'cod_logs_player')
@@ -178,6 +409,11 @@ crm/cod/v2/{C.PLATFORM}/{platform}/\
         #     'Could not load data from datastore, full exception logged as error.'
         # ):...
 
+        # one break for same error in batch
+        if break_minutes and message in breaks:
+            return
+        breaks.add(message)
+
         make_break(f'{target} {username}', game_mode, message, break_minutes)
 
     @staticmethod
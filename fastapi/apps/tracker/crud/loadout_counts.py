@@ -0,0 +1,142 @@
+import time
+from collections import Counter
+import redis
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from core.config import settings
+
+from apps.base.schemas.main import C
+from apps.base.crud.utils import now, time_taken_get
+
+from apps.tracker.crud.store_tables import STT
+from apps.tracker.crud.store_game_modes import SGM
+from apps.tracker.crud.match_formatter import MF
+from apps.tracker.schemas.main import GameModeMw, LoadoutStatsData
+
+
+class LoadoutCounts:
+    '''
+    Count of (Primary + Secondary) weapon pair for each player and MW game mode,
+    loadout stats built from it instead of decoding all matches loadouts \n
+    Filled from matches once, then updated with each saved matches pack,
+    finished fill marked in `cod_loadout_counts_filled` key
+    '''
+
+    STEP = 10_000
+    TOP = 50
+
+    def __init__(self):
+        self.table = STT.loadout_counts
+        self.name = self.table.__tablename__
+        self.filled_key = f'{self.name}_filled'
+        self.conn = redis.Redis(connection_pool=settings.REDIS_CONNECTION_POOL)
+
+    def is_filled(self) -> bool:
+        return bool(self.conn.exists(self.filled_key))
+
+    def pairs_count(self, matches) -> Counter[tuple[str, str, str]]:
+        '''(uno, primary, secondary) counted from matches loadouts'''
+        counter: Counter[tuple[str, str, str]] = Counter()
+        for match in matches:
+            loadouts = match.get('loadout_bin') or match.get(C.LOADOUT)
+            if not loadouts or not match.get(C.UNO):
+                continue
+            if isinstance(loadouts, memoryview):
+                loadouts = bytes(loadouts)
+            for primary, secondary in MF.loadout_pairs_cached(loadouts):
+                counter[(match[C.UNO], primary, secondary)] += 1
+        return counter
+
+    def save(self, db: Session, game_mode: GameModeMw, counter: Counter):
+        if not counter:
+            return
+
+        stmt = insert(self.table)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[
+                    self.table.uno,
+                    self.table.game_mode,
+                    self.table.primary_weapon,
+                    self.table.secondary_weapon,
+                ],
+                set_={'count': self.table.count + stmt.excluded.count},
+            ),
+            [
+                {
+                    C.UNO: uno,
+                    C.GAME_MODE: game_mode,
+                    'primary_weapon': primary,
+                    'secondary_weapon': secondary,
+                    'count': count,
+                }
+                for (uno, primary, secondary), count in counter.items()
+            ],
+        )
+
+    def add(self, db: Session, game_mode: GameModeMw, matches: list[dict]):
+        '''Count loadouts of new matches, commit left to caller'''
+        self.save(db, game_mode, self.pairs_count(matches))
+
+    def fill(self, db: Session, game_mode: GameModeMw, uno: str | None = None):
+        table = STT.get_table(game_mode).table
+        query = db.query(table.loadout, table.loadout_bin, table.uno)
+        if uno:
+            query = query.filter(table.uno == uno)
+
+        counter: Counter[tuple[str, str, str]] = Counter()
+        for match in query.yield_per(self.STEP):
+            counter.update(self.pairs_count([match._asdict()]))
+        self.save(db, game_mode, counter)
+
+    def player_rebuild(self, db: Session, uno: str, game_modes: list[GameModeMw]):
+        '''Count player loadouts again after matches deleted, commit left to caller'''
+        db.query(self.table).filter(
+            self.table.uno == uno, self.table.game_mode.in_(game_modes)
+        ).delete(synchronize_session=False)
+        for game_mode in game_modes:
+            self.fill(db, game_mode, uno)
+
+    def rebuild(self, db: Session):
+        start = time.perf_counter()
+        db.execute(text(f'TRUNCATE {self.name}'))
+        for game_mode in SGM.modes(C.MW):
+            self.fill(db, game_mode)
+        db.commit()
+        self.conn.set(self.filled_key, now(C.ISO))
+        print(f'{self.name} rebuild done [{time_taken_get(start)}]')
+
+    def top_get(
+        self, db: Session, game_modes: list[GameModeMw], unos: list[str] | None
+    ) -> list[LoadoutStatsData]:
+        '''
+        Most played weapon pairs of `unos` summed in `game_modes`,
+        all players if `unos` is None
+        '''
+        pairs = db.query(
+            self.table.primary_weapon,
+            self.table.secondary_weapon,
+            func.sum(self.table.count),
+        ).filter(self.table.game_mode.in_(game_modes))
+        if unos is not None:
+            pairs = pairs.filter(self.table.uno.in_(unos))
+        pairs = pairs.group_by(
+            self.table.primary_weapon, self.table.secondary_weapon
+        ).all()
+
+        # different indexes can have same weapon label
+        loadout: Counter[str] = Counter()
+        for primary, secondary, count in pairs:
+            name = ' + '.join(map(MF.weapon_name_get, (primary, secondary)))
+            if 'fists' not in name.lower():
+                loadout[name] += int(count)
+
+        return [
+            {C.NAME: name, C.COUNT: count}
+            for name, count in loadout.most_common(self.TOP)
+        ]
+
+
+LC = LoadoutCounts()
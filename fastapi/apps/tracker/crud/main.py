@@ -6,21 +6,28 @@ import os
 import base64
 import copy
 import shutil
+import queue
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from io import BytesIO
 
 from collections import Counter, defaultdict
-from typing import Literal
+from typing import Iterable, Literal
 from PIL import Image
 import simplejson as json
 
 from fastapi import WebSocket, status
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 from starlette.requests import Request
-from sqlalchemy import text
+from sqlalchemy import text, null
 from sqlalchemy.orm import Session
 from pydantic import ValidationError
 
 from core.config import settings
+from core.database import get_db, engine
 
 from apps.base.crud.store_tables import SBT
 from apps.base.crud.utils_data_init import LOGS_TABLES
@@ -59,11 +66,20 @@ from apps.base.schemas.main import (
 from apps.tracker.crud.store_tables import STT
 from apps.tracker.crud.store_game_modes import SGM
 from apps.tracker.crud.match_formatter import MF
+from apps.tracker.crud.game_data_store import GDS
 from apps.tracker.crud.utils_data_init import (
     GAMES_LIST,
     player_init,
 )
 from apps.tracker.crud.get_game_data import GameData
+from apps.tracker.crud.rate_limit import RATE_LIMIT
+from apps.tracker.crud.matches_cache import MC
+from apps.tracker.crud.match_index import MI
+from apps.tracker.crud.match_jobs import MJ
+from apps.tracker.crud.chart_rollup import CR
+from apps.tracker.crud.loadout_counts import LC
+from apps.tracker.crud.play_with import PW, PlayWithTarget
+from apps.tracker.crud.bulk_insert import BI
 from apps.tracker.schemas.main import (
     SC,
     GameModeMw,
@@ -71,6 +87,7 @@ from apps.tracker.schemas.main import (
     PlayerMatchesDeleteResponse,
     SGame,
     MatchBody,
+    LabelData,
     MatchesStats,
     PlayersSearch,
     Router,
@@ -78,6 +95,9 @@ from apps.tracker.schemas.main import (
     UpdateRouter,
     MatchesResponse,
     MatchData,
+    MatchSummary,
+    MatchJob,
+    MatchesSource,
     PlayerMatchesHistoryPars,
     GamesStatus,
     Error,
@@ -110,9 +130,12 @@ from apps.tracker.schemas.main import (
     LogsSearch,
     LogsSearchData,
     GroupData,
-    LoadoutStatsData,
+    Loadout,
+    PlayWithDelta,
     PlayerBasic,
     Player,
+    PlatformAffinity,
+    PlatformData,
     MatchStatsPlayer,
     GameModeOnly,
     ResetType,
@@ -155,6 +178,10 @@ from apps.tracker.crud.utils import (
     player_format_search,
     is_best_record,
     target_data_stats_save,
+    fullmatches_exist_get,
+    players_usernames_get,
+    platform_affinity_get,
+    platform_affinities_set,
 )
 
 
@@ -197,6 +224,8 @@ def panel_get(db: Session) -> Panel:
             C.AUTO_UPDATE: get_status(C.AUTO_UPDATE),
             'store_data': get_status('store_data'),
         },
+        'rate_limit': RATE_LIMIT.status(),
+        'matches_cache': MC.stats(),
         C.PAGES: pages,
         'resets': ResetType.__args__,
         C.TIME: monitor_time,
@@ -221,6 +250,8 @@ def reset(db: Session, reset_type: ResetType) -> ResetResponse | Error:
         'base_stats': update_base_stats,
         'tracker_stats': tracker_stats_update,
         'clear_players_match_doubles': clear_players_match_doubles,
+        'chart_rollup': CR.rebuild,
+        'play_with': play_with_rebuild,
     }
 
     if reset_type in reset_functions:
@@ -237,7 +268,9 @@ def reset(db: Session, reset_type: ResetType) -> ResetResponse | Error:
             C.INACTIVE if redis_manage(C.STATUS) == C.ACTIVE else C.ACTIVE,
         )
     elif reset_type == C.MATCHES:
-        redis_manage(f'{reset_type}:*', C.DELETE)
+        MC.reset()
+    elif reset_type == 'rate_limit':
+        RATE_LIMIT.reset()
     elif reset_type == C.MONITOR:
         current_status = manage_monitor(C.STATUS)
         action = 'stop' if current_status else 'start'
@@ -557,9 +590,13 @@ def player_matches_history_pars(uno: str) -> PlayerMatchesHistoryPars | Error:
 def player_find_tag_data(player_tag: str, platform: PlatformOnly) -> Player:
     player = player_init({platform: player_tag})
 
-    for game_mode in SGM.modes():
-        slugs = (player_tag, game_mode, C.MATCHES, platform, 0)
-        data = GameData.get(slugs, 0.5, True)
+    game_modes = list(SGM.modes())
+    slugs_list: list[GameDataSlugs] = [
+        (player_tag, game_mode, C.MATCHES, platform, 0) for game_mode in game_modes
+    ]
+    games_data = GameData.get_batch(slugs_list, 0.5, True)
+
+    for game_mode, data in zip(game_modes, games_data):
         if not data or C.MATCHES not in data:
             continue
 
@@ -577,14 +614,20 @@ def player_find_tag_data(player_tag: str, platform: PlatformOnly) -> Player:
     if not player[C.USERNAME]:
         return player
 
+    games: list[Game] = []
+    slugs_list = []
     for game in GAMES_LIST:
         if game == C.ALL:
             continue
         game_mode: GameModeOnly = f'{game}_{C.MP}'
         if player[C.GAMES][game_mode][C.STATUS] == SGame.NOT_ENABLED:
             continue
-        slugs = (player_tag, game_mode, C.STATS, platform, 0)
-        data = GameData.get(slugs, 0.5, True)
+        games.append(game)
+        slugs_list.append((player_tag, game_mode, C.STATS, platform, 0))
+    games_data = GameData.get_batch(slugs_list, 0.5, True)
+
+    for game, data in zip(games, games_data):
+        game_mode: GameModeOnly = f'{game}_{C.MP}'
         if data is None or data.get('title') is None:
             continue
         player[C.GAMES_STATS][game] = game_stats_format(data['lifetime'], game)
@@ -712,8 +755,9 @@ def player_add_game_mode(db: Session, body: TargetGameMode) -> Error | Message:
     if player[C.GAMES][game_mode][C.STATUS] != 0:
         return json_error(status.HTTP_302_FOUND, f'{info} already {C.ENABLED}')
 
-    data = get_data_from_platforms(player, game_mode, C.MATCHES)
+    data = get_data_from_platforms(db, player, game_mode, C.MATCHES)
     if not data[C.DATA]:
+        db.commit()
         return json_error(status.HTTP_405_METHOD_NOT_ALLOWED, f'{info} not available')
 
     add_to_task_queues(player[C.UNO], game_mode, C.MATCHES_HISTORY)
@@ -735,6 +779,7 @@ def player_matches_update(
     uno: str,
     game_mode: GameMode,
     data_type: Literal['matches', 'matches_history'],
+    prefetched: PlatformData | None = None,
 ):
     in_logs_game_status(db, uno, game_mode, data_type, 0)
 
@@ -760,7 +805,10 @@ def player_matches_update(
         end_time = query.order_by(table.time.desc()).first()
         end_time: int = int(end_time.time.timestamp()) if end_time else 0
 
-    data = get_data_from_platforms(player, game_mode, C.MATCHES, start_time)
+    if prefetched is None or start_time:
+        data = get_data_from_platforms(db, player, game_mode, C.MATCHES, start_time)
+    else:
+        data = prefetched
     player_tag: str = data[C.PLAYER_TAG]
     platform: PlatformOnly = data[C.PLATFORM]
     data: dict = data[C.DATA]
@@ -776,21 +824,28 @@ def player_matches_update(
     while new_matches := [
         match for match in data[C.MATCHES] if match['utcStartSeconds'] > end_time
     ]:
+        pars_list: list[FullmatchData] = []
+        formatted_matches: list[dict] = []
+        MF.labels_prepare(new_matches, game_mode)
         for match in new_matches:
             match = MF.format_match(match, game_mode)
             match[C.UNO] = match.get(C.UNO) or uno
-
-            new_match = table()
-            new_match.__dict__.update(match)
-            db.add(new_match)
+            formatted_matches.append(match)
 
             if is_matches_history is False and SGM.is_game_mode_mw(game_mode):
-                fullmatches_pars(
-                    db, match[C.MATCHID], game_mode, str(match[C.TIME].year)
+                pars_list.append(
+                    {C.MATCHID: match[C.MATCHID], C.YEAR: str(match[C.TIME].year)}
                 )
 
+        BI.insert(db, table, game_mode, formatted_matches)
+        CR.add(db, game_mode, formatted_matches)
+        if SGM.is_game_mode_mw(game_mode):
+            LC.add(db, game_mode, formatted_matches)
         db.commit()
 
+        if pars_list:
+            fullmatches_pars_pack(db, pars_list, game_mode)
+
         new_matches_found = len(new_matches)
         counter[C.MATCHES] += new_matches_found
         counter['pre_limit'] += new_matches_found
@@ -847,9 +902,13 @@ def player_matches_update(
             f'{uno} {username}', game_mode, f'{C.MATCHES} {counter[C.MATCHES]} found'
         )
 
-        # remove cached matches for player
-        uid = f'{C.MATCHES}:{C.UNO}_{uno}_{game_mode}'  # CacheUid
-        redis_manage(uid, C.DELETE)
+        # remove cached matches pages with player
+        player_group = redis_manage(f'{C.PLAYER}:{C.UNO}_{uno}', 'hget', C.GROUP)
+        MC.invalidate([uno], [player_group], game_mode)
+
+        if SGM.is_game_mode_mw(game_mode):
+            targets = [uno, player_group, C.ALL] if player_group else []
+            loadout_targets_update(db, [*targets, C.TRACKER])
 
         in_logs_game_status(db, uno, game_mode, data_type, counter[C.MATCHES])
         player_matches_stats_update(db, uno, game_mode)
@@ -883,8 +942,14 @@ def player_matches_delete(db: Session, uno: str, game_mode: GameMode):
         table = STT.get_table(game_mode, C.MATCHES).table
         result[game_mode] = db.query(table).filter(table.uno == uno).delete()
 
+    CR.player_rebuild(db, uno, game_modes)
+    LC.player_rebuild(db, uno, [gm for gm in game_modes if SGM.is_game_mode_mw(gm)])
     db.commit()
 
+    player_group = redis_manage(f'{C.PLAYER}:{C.UNO}_{uno}', 'hget', C.GROUP)
+    for game_mode in game_modes:
+        MC.invalidate([uno], [player_group], game_mode)
+
     in_logs(
         uno,
         f'{player_matches_delete.__name__} {game_mode}',
@@ -986,6 +1051,7 @@ def player_delete(db: Session, uno: str) -> Message | Error:
     set_table_sequence(db, STT.players.__tablename__)
     player_logs_delete(db, uno)
     players_cache_update(db)
+    MC.invalidate([uno], [player.group])
     in_logs(uno, message, 'cod_logs_player')
 
     return {C.MESSAGE: message}
@@ -1101,38 +1167,105 @@ def player_put(db: Session, body: EditTarget) -> EditPlayerResponse | Error:
 
     db.commit()
     players_cache_update(db)
+    # player games and group affects visible pages
+    MC.invalidate(
+        [player[C.UNO]], [player[C.GROUP], value if name == C.GROUP else None]
+    )
+
+    if name == C.GROUP:
+        # group counters count matches of current members only
+        PW.groups_add({group for group in (player[C.GROUP], value) if group})
 
     return res
 
 
 def get_data_from_platforms(
+    db: Session,
     player: PlayerBasic,
     game_mode: GameMode,
     data_type: Literal['matches', 'stats'],
     start_time=0,
-):
+) -> PlatformData:
+    return get_data_from_platforms_many(
+        db, [player], game_mode, data_type, start_time
+    )[0]
+
+
+def get_data_from_platforms_many(
+    db: Session,
+    players: list[PlayerBasic],
+    game_mode: GameMode,
+    data_type: Literal['matches', 'stats'],
+    start_time=0,
+) -> list[PlatformData]:
+    '''
+    Platform that last answered for player tried first,
+    then others in reversed `SC.PLATFORMS` order \n
+    Each round requested in one batch for all players still without data,
+    after `AFFINITY_FAILS` failed updates player probed by all platforms again \n
+    Affinity changes commit left to caller
+    '''
+    AFFINITY_FAILS = 3
     is_have_token = settings.SESSION.cookies.get('ACT_SSO_COOKIE') is not None
     attempts = 3 if is_have_token else 1
+    results: list[PlatformData] = [
+        {C.DATA: {}, C.PLAYER_TAG: None, C.PLATFORM: None} for _ in players
+    ]
+    affinities = platform_affinity_get(
+        db, [player[C.UNO] for player in players], game_mode
+    )
+
+    platforms_order: list[list[PlatformOnly]] = []
+    for player in players:
+        platforms = [platform for platform in SC.PLATFORMS[::-1] if player[platform]]
+        affinity = affinities.get(player[C.UNO])
+        if affinity and affinity[C.PLATFORM] in platforms:
+            platforms.remove(affinity[C.PLATFORM])
+            platforms.insert(0, affinity[C.PLATFORM])
+        platforms_order.append(platforms)
+
+    pending = list(range(len(players)))
+    # missing data of inactive tracker or local files is not platform failure
+    is_fetched = is_have_token and redis_manage(C.STATUS) == C.ACTIVE
+
     for _ in range(attempts):
-        for platform in SC.PLATFORMS[::-1]:
-            player_tag = player[platform]
-            if player_tag is None:
-                continue
-            slugs: GameDataSlugs = (
-                player_tag,
-                game_mode,
-                data_type,
-                platform,
-                start_time,
-            )
-            if data := GameData.get(slugs, 1):
-                return {C.DATA: data, C.PLAYER_TAG: player_tag, C.PLATFORM: platform}
+        for position in range(len(SC.PLATFORMS)):
+            batch = [
+                index for index in pending if position < len(platforms_order[index])
+            ]
+            slugs_list: list[GameDataSlugs] = []
+            for index in batch:
+                platform = platforms_order[index][position]
+                player_tag = players[index][platform]
+                slugs_list.append(
+                    (player_tag, game_mode, data_type, platform, start_time)
+                )
+            for index, slugs, data in zip(
+                batch, slugs_list, GameData.get_batch(slugs_list, 1)
+            ):
+                results[index][C.PLAYER_TAG] = slugs[0]
+                results[index][C.PLATFORM] = slugs[3]
+                if data:
+                    results[index][C.DATA] = data
+                    pending.remove(index)
+        if not pending:
+            break
 
-    return {
-        C.DATA: {},
-        C.PLAYER_TAG: player_tag,
-        C.PLATFORM: platform,  # pylint: disable=undefined-loop-variable
-    }
+    changed: dict[str, PlatformAffinity | None] = {}
+    for index, player in enumerate(players):
+        affinity = affinities.get(player[C.UNO])
+        if results[index][C.DATA]:
+            platform = results[index][C.PLATFORM]
+            if affinity != {C.PLATFORM: platform, 'fails': 0}:
+                changed[player[C.UNO]] = {C.PLATFORM: platform, 'fails': 0}
+        elif affinity and is_fetched:
+            affinity['fails'] += 1
+            if affinity['fails'] >= AFFINITY_FAILS:
+                affinity = None
+            changed[player[C.UNO]] = affinity
+    platform_affinities_set(db, game_mode, changed)
+
+    return results
 
 
 def validate_update_group(group: GroupData, game_mode: GameMode, data_type: DataType):
@@ -1278,6 +1411,31 @@ def group_update(db: Session, uno: str, g_game_mode: GameMode, data_type: DataTy
         update_players.append(update_player)
     redis_manage(C.UPDATE_PLAYERS, 'rpush', update_players)
 
+    # request first page for all pending players in batches
+    prefetched: dict[tuple[str, GameMode], PlatformData] = {}
+    for game_mode in game_modes:
+        players_basic: list[PlayerBasic] = []
+        for update_player in update_players:
+            if update_player.get(game_mode) != STask.PENDING:
+                continue
+            player = player_get(
+                db,
+                update_player[C.UNO],
+                C.BASIC,
+                f'{group_update.__name__} {game_mode=} {data_type=}',
+            )
+            if player is not None:
+                players_basic.append(player)
+
+        platforms_data = get_data_from_platforms_many(
+            db,
+            players_basic,
+            game_mode,
+            C.STATS if data_type == C.STATS else C.MATCHES,
+        )
+        for player, platform_data in zip(players_basic, platforms_data):
+            prefetched[(player[C.UNO], game_mode)] = platform_data
+
     game_counts = {game_mode: 0 for game_mode in SGM.modes()}
     group_game_counts = {C.ALL: copy.deepcopy(game_counts)}
     for index, update_player in enumerate(update_players):
@@ -1286,13 +1444,16 @@ def group_update(db: Session, uno: str, g_game_mode: GameMode, data_type: DataTy
         for game_mode in game_modes:
             if update_player.get(game_mode) != STask.PENDING:
                 continue
+            player_prefetched = prefetched.get((update_player[C.UNO], game_mode))
             if data_type == C.STATS:
-                stats_update_player(db, update_player[C.UNO], game_mode)
+                stats_update_player(
+                    db, update_player[C.UNO], game_mode, player_prefetched
+                )
                 update_player[game_mode] = 1
                 continue
 
             count = player_matches_update(
-                db, update_player[C.UNO], game_mode, C.MATCHES
+                db, update_player[C.UNO], game_mode, C.MATCHES, player_prefetched
             )
             update_player[game_mode] = count
             group_game_counts[update_player[C.GROUP]][game_mode] += count
@@ -1321,15 +1482,31 @@ def group_update(db: Session, uno: str, g_game_mode: GameMode, data_type: DataTy
 
 
 def fullmatches_pars(db: Session, matchID: str, game_mode: GameMode, year: YearWzTable):
-    table = STT.get_table(game_mode, C.MAIN, year).table
-    if db.query(table.id).filter(table.matchID == matchID).count():
+    match: FullmatchData = {C.MATCHID: matchID, C.YEAR: year}
+    exist = fullmatches_exist_get(db, [match], game_mode)
+    if matchID in exist[C.MAIN]:
         return  # already have match
 
     data = GameData.get((matchID, game_mode, C.FULLMATCHES, C.BATTLE, 0), 1)
+    players = fullmatches_format(matchID, game_mode, data)
 
-    if not (data or {}).get('allPlayers'):
+    if players is None:
         return False
 
+    fullmatches_save(db, game_mode, [(match, players)])
+
+    return True
+
+
+def fullmatches_format(
+    matchID: str, game_mode: GameMode, data: dict | None
+) -> list[dict] | None:
+    if not (data or {}).get('allPlayers'):
+        return None
+
+    players: list[dict] = []
+    MF.labels_prepare(data['allPlayers'], game_mode)
+
     for match in data['allPlayers']:
         match = MF.format_match(match, game_mode)
         if C.UNO not in match:
@@ -1340,50 +1517,100 @@ def fullmatches_pars(db: Session, matchID: str, game_mode: GameMode, year: YearW
                 {C.USERNAME: match.get(C.USERNAME), C.MATCHID: match[C.MATCHID]},
             )
             continue
+        players.append(match)
+
+    return players
 
-        new_match = table()
-        new_match.__dict__.update(match)
-        db.add(new_match)
 
-    # Check if double in basic table and delete
-    basic_table = STT.get_table(game_mode, C.BASIC, year).table
-    basic_matches = (
-        db.query(basic_table.id).filter(basic_table.matchID == matchID).all()
+def fullmatches_save(
+    db: Session,
+    game_mode: GameMode,
+    parsed: list[tuple[FullmatchData, list[dict]]],
+) -> int:
+    '''
+    Write formatted fullmatches by year tables,
+    remove doubles from basic for matchIDs found there by `fullmatches_exist_get` \n
+    Existence checked again right before write,
+    same match can be saved by other caller while this one was fetching \n
+    Matches locked until commit, so caller that shared fetch result
+    waits for first one and sees its rows
+    '''
+    match_keys = sorted({f'{game_mode}_{match[C.MATCHID]}' for match, _ in parsed})
+    # sorted keys, callers with overlapping matches can't lock each other
+    db.execute(
+        text(
+            '''
+SELECT pg_advisory_xact_lock(hashtext(key))
+FROM (SELECT unnest(CAST(:keys AS text[])) AS key ORDER BY 1) AS keys
+'''
+        ),
+        {'keys': match_keys},
     )
-    for match in basic_matches:
-        db.delete(match)
-        in_logs(
-            matchID,
-            f'[{match.matchID}] [{match.id}] {game_mode} {C.BASIC} {year} {C.DELETED}',
-            'cod_logs',
+    exist = fullmatches_exist_get(db, [match for match, _ in parsed], game_mode)
+    years: dict[YearWzTable, tuple[list[str], list[dict]]] = {}
+    for match, players in parsed:
+        if match[C.MATCHID] in exist[C.MAIN]:
+            continue
+        match_ids, rows = years.setdefault(match[C.YEAR], ([], []))
+        if match[C.MATCHID] in exist[C.BASIC]:
+            match_ids.append(match[C.MATCHID])
+        rows += players
+        exist[C.MAIN].add(match[C.MATCHID])
+
+    for year, (match_ids, rows) in years.items():
+        table = STT.get_table(game_mode, C.MAIN, year).table
+        BI.insert(db, table, game_mode, rows)
+        locations = {row[C.MATCHID]: year for row in rows}
+        MI.put(db, game_mode, C.MAIN, locations)
+        match_summaries_save(
+            db, game_mode, STT.get_table(game_mode, C.MAIN, year), list(locations)
         )
 
+        if not match_ids:
+            continue
+
+        basic_table = STT.get_table(game_mode, C.BASIC, year).table
+        basic_deleted = (
+            db.query(basic_table)
+            .filter(basic_table.matchID.in_(match_ids))
+            .delete(synchronize_session=False)
+        )
+        if basic_deleted:
+            in_logs(
+                f'{len(match_ids)} {C.MATCHES}',
+                f'[{basic_deleted}] {game_mode} {C.BASIC} {year} {C.DELETED}',
+                'cod_logs',
+            )
+
     db.commit()
 
-    return True
+    if years:
+        MC.invalidate(
+            [row[C.UNO] for _, rows in years.values() for row in rows],
+            game_mode=game_mode,
+        )
+        matches_unos: dict[str, set[str]] = {}
+        for _, rows in years.values():
+            for row in rows:
+                matches_unos.setdefault(row[C.MATCHID], set()).add(row[C.UNO])
+        PW.delta_add(game_mode, matches_unos)
+
+    return sum(len(rows) for _, rows in years.values())
 
 
 def fullmatches_pars_group(db: Session, uno: str, game_mode: GameMode):
     game, mode = SGM.desctruct_game_mode(game_mode)
-    game_modes = SGM.modes(game, mode).items()
+    game_modes = SGM.modes(game, mode)
     players = redis_manage(f'{C.GROUP}:{C.UNO}_{uno}', 'hget', C.PLAYERS)
 
-    for game_mode, (game, mode) in game_modes:
-        fullmatch_tables = STT.get_tables(game, mode, C.MAIN)
+    for game_mode in game_modes:
+        if SGM.is_game_mode_mw(game_mode) is False:
+            continue
         table = STT.get_table(game_mode).table
 
-        full_match_ids = set()
-        seen_match_ids = []
+        seen_match_ids: set[str] = set()
         pars_list: list[FullmatchData] = []
 
-        for t in fullmatch_tables:
-            full_matches_ids = db.query(
-                t.table.matchID.distinct(), t.table.matchID
-            ).all()
-            for match in full_matches_ids:
-                if match.matchID not in full_match_ids:
-                    full_match_ids.add(match.matchID)
-
         match_ids = (
             db.query(table.matchID.distinct(), table.matchID, table.time)
             .filter(table.uno.in_(players))
@@ -1392,11 +1619,13 @@ def fullmatches_pars_group(db: Session, uno: str, game_mode: GameMode):
         for match in match_ids:
             if match.matchID in seen_match_ids:
                 continue
-            if match.matchID not in full_match_ids:
-                pars_list.append(
-                    {C.MATCHID: match.matchID, C.YEAR: str(match.time.year)}
-                )
-                seen_match_ids.append(match.matchID)
+            pars_list.append({C.MATCHID: match.matchID, C.YEAR: str(match.time.year)})
+            seen_match_ids.add(match.matchID)
+
+        full_match_ids = fullmatches_exist_get(db, pars_list, game_mode)[C.MAIN]
+        pars_list = [
+            match for match in pars_list if match[C.MATCHID] not in full_match_ids
+        ]
 
         info = f'started actualize {C.FULLMATCHES}, '
         info += f'{len(pars_list)} {C.MATCHES} found from {len(match_ids)}'
@@ -1420,41 +1649,140 @@ def fullmatches_pars_player(db: Session, uno: str, game_mode: GameMode):
 def fullmatches_pars_pack(
     db: Session, pars_list: list[FullmatchData], game_mode: GameMode
 ):
+    '''
+    Pipeline with bounded queues between stages: \n
+    prefetch thread requests next matches in batches,
+    format thread runs `MF.format_match` for players,
+    current thread writes formatted matches and commit them in batches
+    '''
+    STEP = settings.FETCH_CONCURRENCY * 2
+    WRITE_STEP = 5
+    exist = fullmatches_exist_get(db, pars_list, game_mode)
+    pars_list = [match for match in pars_list if match[C.MATCHID] not in exist[C.MAIN]]
+    stop = threading.Event()
+    fetched: queue.Queue[tuple[FullmatchData, dict | None] | None] = queue.Queue(STEP)
+    formatted: queue.Queue[tuple[FullmatchData, list[dict] | None] | None] = (
+        queue.Queue(STEP)
+    )
+
+    def put(q: queue.Queue, item) -> bool:
+        while stop.is_set() is False:
+            try:
+                q.put(item, timeout=1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def prefetch():
+        try:
+            for index in range(0, len(pars_list), STEP):
+                if (tracker_status := redis_manage(C.STATUS)) != C.ACTIVE:
+                    in_logs(
+                        tracker_status or C.DISABLED,
+                        f'pars {C.FULLMATCHES} pack stopped',
+                        'cod_logs',
+                    )
+                    break
+
+                step = pars_list[index : index + STEP]
+                slugs_list: list[GameDataSlugs] = [
+                    (match[C.MATCHID], game_mode, C.FULLMATCHES, C.BATTLE, 0)
+                    for match in step
+                ]
+                for item in zip(step, GameData.get_batch(slugs_list, 1)):
+                    if put(fetched, item) is False:
+                        return
+        except Exception as e:
+            stop.set()
+            in_logs(
+                f'{C.FULLMATCHES} pack {game_mode}',
+                type(e).__name__,
+                'cod_logs_error',
+                {'trace': traceback.format_exc()},
+            )
+        finally:
+            put(fetched, None)
+
+    def format_players():
+        try:
+            while stop.is_set() is False:
+                try:
+                    item = fetched.get(timeout=1)
+                except queue.Empty:
+                    continue
+                if item is None:
+                    break
+                match, data = item
+                players = fullmatches_format(match[C.MATCHID], game_mode, data)
+                if put(formatted, (match, players)) is False:
+                    return
+        except Exception as e:
+            stop.set()
+            in_logs(
+                f'{C.FULLMATCHES} pack {game_mode}',
+                type(e).__name__,
+                'cod_logs_error',
+                {'trace': traceback.format_exc()},
+            )
+        finally:
+            put(formatted, None)
+
+    stages = (
+        threading.Thread(target=prefetch, daemon=True),
+        threading.Thread(target=format_players, daemon=True),
+    )
+    for stage in stages:
+        stage.start()
+
     is_parsed = False
     log_count = 0
     fail_count = 0
+    done_count = 0
+    parsed: list[tuple[FullmatchData, list[dict]]] = []
 
-    for index, match in enumerate(pars_list):
-        if (tracker_status := redis_manage(C.STATUS)) != C.ACTIVE:
-            in_logs(
-                tracker_status or C.DISABLED,
-                f'pars {C.FULLMATCHES} pack stopped',
-                'cod_logs',
-            )
-            break
+    try:
+        while True:
+            try:
+                item = formatted.get(timeout=1)
+            except queue.Empty:
+                if stop.is_set():
+                    break
+                continue
+            if item is None:
+                break
 
-        if fail_count > 3:
-            message = f'stopped due to a large number of {C.ERROR}'
-            in_logs_cod_logs_cache(f'{C.FULLMATCHES} pars', game_mode, message)
-            in_logs(f'{C.FULLMATCHES} pack', message, 'cod_logs_error')
-            break
+            match, players = item
+            done_count += 1
+            is_parsed = players is not None
+            if is_parsed:
+                fail_count = 0
+                parsed.append((match, players))
+            else:
+                fail_count += 1
 
-        is_parsed = fullmatches_pars(db, match[C.MATCHID], game_mode, match[C.YEAR])
+            if parsed and (len(parsed) >= WRITE_STEP or formatted.empty()):
+                fullmatches_save(db, game_mode, parsed)
+                parsed = []
 
-        if is_parsed is None:
-            continue
-        if is_parsed is False:
-            fail_count += 1
-        else:
-            fail_count = 0
+            if fail_count > 3:
+                message = f'stopped due to a large number of {C.ERROR}'
+                in_logs_cod_logs_cache(f'{C.FULLMATCHES} pars', game_mode, message)
+                in_logs(f'{C.FULLMATCHES} pack', message, 'cod_logs_error')
+                break
 
-        if index > log_count + 20:
-            log_count = index
-            message = f'{index}-{len(pars_list)} progress'
-            in_logs_cod_logs_cache(f'{C.FULLMATCHES} pars', game_mode, message)
-            in_logs(f'{C.FULLMATCHES} pack {game_mode}', message, 'cod_logs')
+            if done_count > log_count + 20:
+                log_count = done_count
+                message = f'{done_count}-{len(pars_list)} progress'
+                in_logs_cod_logs_cache(f'{C.FULLMATCHES} pars', game_mode, message)
+                in_logs(f'{C.FULLMATCHES} pack {game_mode}', message, 'cod_logs')
+    finally:
+        stop.set()
+        for stage in stages:
+            stage.join()
 
-        db.commit()
+    if parsed:
+        fullmatches_save(db, game_mode, parsed)
 
     return is_parsed
 
@@ -1462,7 +1790,7 @@ def fullmatches_pars_pack(
 def fullmatches_delete(
     db: Session, matchID: str, game_mode: GameMode, year: YearWzTable
 ):
-    data = match_data_get(db, matchID, game_mode, False, year)
+    data = match_data_get(db, matchID, game_mode, year)
 
     if data is None:
         return json_error(
@@ -1471,66 +1799,129 @@ def fullmatches_delete(
 
     t: TableGameData = data['table_data']
     rows_deleted = db.query(t.table).filter(t.table.matchID == matchID).delete()
+    MI.delete(db, matchID, game_mode)
     db.commit()
 
+    player_to_group = players_groups_get()
+    unos = {player[C.UNO] for player in data[C.PLAYERS]}
+    MC.invalidate(unos, {player_to_group.get(uno) for uno in unos}, game_mode)
+
     return rows_deleted
 
 
-def fullmatches_load(db: Session, game_mode: GameMode):
+def fullmatches_load(db: Session, game_mode: GameMode, workers: int | None = None):
+    '''
+    Load saved fullmatches files and records of game data store,
+    parsing and formatting runs in process pool, rows written with `COPY` \n
+    Finished files saved in checkpoint file, restart continue from it
+    '''
+    STEP = 500
     directory = Path.cwd().parent / C.STATIC / C.FILES / C.DATA
     directory = directory / C.FULLMATCHES / game_mode
-    fullmatches_files = list(directory.iterdir())
+    checkpoint = Path.cwd().parent / C.LOGS / f'{C.FULLMATCHES}_load_{game_mode}.txt'
+
+    finished: set[str] = set()
+    if checkpoint.exists():
+        finished = set(checkpoint.read_text(encoding='utf8').split())
 
+    # packed files keep same name in store key, file loaded if both exist
+    sources: dict[str, str] = {
+        f'{Path(key).name}.json': key
+        for key in GDS.keys_get(f'{C.FULLMATCHES}/{game_mode}/')
+    }
+    if directory.exists():
+        sources |= {
+            fullmatch.name: str(fullmatch) for fullmatch in directory.iterdir()
+        }
+    fullmatches_files = sorted(
+        source for name, source in sources.items() if name not in finished
+    )
     total_steps = len(fullmatches_files)
-    percent_step = 0
+    print(f'{total_steps} files to load, {len(finished)} already loaded')
 
-    for index, fullmatch in enumerate(fullmatches_files, 1):
-        current_percent = int((index / total_steps) * 100)
-        if current_percent > percent_step:
-            percent_step = current_percent
-            print(f'{index} / {total_steps} {current_percent}%')
+    start = time.perf_counter()
+    rows_count = 0
+
+    with ProcessPoolExecutor(
+        workers,
+        # fork would copy process with labels listener and fetcher threads
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=engine.dispose,
+        initargs=(False,),
+    ) as executor:
+        for index in range(0, total_steps, STEP):
+            step_files = fullmatches_files[index : index + STEP]
+            loaded: list[tuple[FullmatchData, list[dict]]] = []
+            step_finished: list[str] = []
+
+            futures = [
+                executor.submit(fullmatch_file_format, fullmatch, game_mode)
+                for fullmatch in step_files
+            ]
+            for fullmatch, future in zip(step_files, futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # file not checkpointed, next run try it again
+                    in_logs(
+                        fullmatch_name_get(fullmatch),
+                        f'{C.FULLMATCHES} load {type(e).__name__}: {e}',
+                        'cod_logs_error',
+                    )
+                    continue
+                if result is not None:
+                    loaded.append(result)
+                step_finished.append(fullmatch_name_get(fullmatch))
 
-        if (percent_step % 10) == 0:
-            print('commit progress')
-            db.commit()
+            rows_count += fullmatches_save(db, game_mode, loaded)
 
-        with open(fullmatch, 'r', encoding='utf8') as file:
-            data = json.load(file)
+            with open(checkpoint, 'a', encoding='utf8') as file:
+                file.write(''.join(f'{name}\n' for name in step_finished))
 
-        players = data[C.DATA].get('allPlayers')
+            done = min(index + STEP, total_steps)
+            seconds = time.perf_counter() - start
+            print(
+                f'{done} / {total_steps} {int(done / total_steps * 100)}%',
+                f'{rows_count} rows {int(rows_count / seconds)} rows/s',
+            )
 
-        if not players:
-            print(f'{fullmatch.name} {C.PLAYERS} {C.NOT_FOUND}')
-            continue
+    print(f'loaded {rows_count} rows [{time_taken_get(start)}]')
 
-        year = str(date_format(players[0]['utcStartSeconds']).year)
-        match_id = players[0][C.MATCHID]
-        table = STT.get_table(game_mode, C.MAIN, year).table
 
-        if found := db.query(table.id).filter(table.matchID == match_id).count():
-            print(
-                f'{match_id} {C.ALREADY_EXIST}',
-                f'{C.PLAYERS}: {len(players)}',
-                f'found rows: {found}',
-            )
-            continue
+def fullmatch_name_get(source: str) -> str:
+    '''Checkpoint name of file path or game data store key'''
+    name = Path(source).name
+    return name if name.endswith('.json') else f'{name}.json'
 
-        for player_match in players:
-            player_match = MF.format_match(player_match, game_mode)
-            if C.UNO not in player_match:
-                in_logs(
-                    f'{game_mode} {match_id}',
-                    f'{C.UNO} {C.NOT_FOUND}',
-                    'cod_logs_error',
-                    {C.USERNAME: player_match.get(C.USERNAME), C.MATCHID: match_id},
-                )
-                continue
 
-            new_match = table()
-            new_match.__dict__.update(player_match)
-            db.add(new_match)
+def fullmatch_file_format(
+    source: str, game_mode: GameMode
+) -> tuple[FullmatchData, list[dict]] | None:
+    '''
+    Runs in process pool of `fullmatches_load`,
+    `source` is file path or game data store key
+    '''
+    if source.endswith('.json'):
+        with open(source, 'r', encoding='utf8') as file:
+            data = json.load(file)
+    else:
+        data = GDS.get(source)
+        if data is None:
+            print(f'{source} {C.NOT_FOUND}')
+            return None
+
+    players = data[C.DATA].get('allPlayers')
+    if not players:
+        print(f'{fullmatch_name_get(source)} {C.PLAYERS} {C.NOT_FOUND}')
+        return None
+
+    match_id = players[0][C.MATCHID]
+    match: FullmatchData = {
+        C.MATCHID: match_id,
+        C.YEAR: str(date_format(players[0]['utcStartSeconds']).year),
+    }
 
-    db.commit()
+    return match, fullmatches_format(match_id, game_mode, data[C.DATA])
 
 
 def stats_router(db: Session, body: StatsRouter) -> GameStats | Error:
@@ -1612,7 +2003,12 @@ def stats_add_summary_all_modes(games_stats: dict[Game, GameStats]):
     return games_stats
 
 
-def stats_update_player(db: Session, uno: str, game_mode: GameModeOnly):
+def stats_update_player(
+    db: Session,
+    uno: str,
+    game_mode: GameModeOnly,
+    prefetched: PlatformData | None = None,
+):
     in_logs_game_status(db, uno, game_mode, C.STATS, 0)
 
     game = SGM.desctruct_game_mode(game_mode)[0]
@@ -1623,7 +2019,9 @@ def stats_update_player(db: Session, uno: str, game_mode: GameModeOnly):
         f'{stats_update_player.__name__} {game_mode=}',
     )
 
-    data = get_data_from_platforms(player, game_mode, C.STATS)[C.DATA]
+    if prefetched is None:
+        prefetched = get_data_from_platforms(db, player, game_mode, C.STATS)
+    data = prefetched[C.DATA]
 
     if data is None or data.get('title') is None:
         return
@@ -1694,12 +2092,17 @@ def matches_router(db: Session, body: Router) -> MatchesResponse:
     data_type, target = body.data_type, body.target
     game, mode, game_mode = body.game, body.mode, body.game_mode
     order, date, page = body.order, body.date, body.page
+    keyset = matches_cursor_decode(body.cursor)
+
+    if cached := MC.get(body):
+        return cached
 
     not_found_msg = f'{C.MATCHES} {data_type} [{target}] {C.NOT_FOUND}'
 
     games: GamesStatus = {}
     tables = []
     query_target = ''
+    cache_tags = MC.tags_get(game_modes=[game_mode])
 
     if data_type == C.UNO:
         target_type = target_type_define(target)
@@ -1708,6 +2111,7 @@ def matches_router(db: Session, body: Router) -> MatchesResponse:
             query_target = ' '
 
         elif target_type == C.GROUP:
+            cache_tags = MC.tags_get(groups=[target])
             group_games, players = redis_manage(
                 f'{target_type}:{C.UNO}_{target}', 'hmget', [C.GAMES, C.PLAYERS]
             )
@@ -1723,19 +2127,25 @@ def matches_router(db: Session, body: Router) -> MatchesResponse:
                 f'WHERE {data_type} in ({', '.join((f"'{uno}'" for uno in players))})'
             )
 
-        elif target_type == C.PLAYER:
-            player_games, player_group = redis_manage(
-                f'{target_type}:{C.UNO}_{target}', 'hmget', [C.GAMES, C.GROUP]
-            )
-            if player_group and player_games:
-                # target from tracker so search only in matches tables
-                games = player_games
-                tables = STT.get_tables(game, mode, C.MATCHES)
+        else:
+            cache_tags = MC.tags_get(unos=[target])
+
+            if target_type == C.PLAYER:
+                player_games, player_group = redis_manage(
+                    f'{target_type}:{C.UNO}_{target}', 'hmget', [C.GAMES, C.GROUP]
+                )
+                if player_group and player_games:
+                    # target from tracker so search only in matches tables
+                    games = player_games
+                    tables = STT.get_tables(game, mode, C.MATCHES)
 
     elif "'" in target or ':' in target:  # sanitize target
         search_target = target.translate(str.maketrans({"'": "''", ":": r"\:"}))
         query_target = f"WHERE {data_type} LIKE '%{search_target}%'"
 
+    # page not cached if invalidated while query runs
+    cache_generations = MC.generations_get(cache_tags)
+
     if date:
         not_found_msg += f' {C.DATE} [{date}]'
         date_length: Literal[1, 2, 3] = len(date.split('-'))
@@ -1750,6 +2160,42 @@ def matches_router(db: Session, body: Router) -> MatchesResponse:
     tables = tables or STT.get_tables_all(game, mode)
     query_target = query_target or f"WHERE {data_type} = '{target}'"
     selects: list[str] = []
+    branches: list[tuple[str, str]] = []
+
+    column = order.strip('-')
+    order_direction = 'DESC' if order[0] == '-' else 'ASC'
+    # id unique only in own table, so game mode and source break ties of tables
+    order_columns = [column] + [
+        extra_column
+        for extra_column in (C.TIME, C.ID, C.GAME_MODE, C.SOURCE)
+        if extra_column != column
+    ]
+    order_sql = ', '.join(
+        f'{format_column(order_column)} {order_direction}'
+        for order_column in order_columns
+    )
+    if keyset is not None and len(keyset) != len(order_columns):
+        keyset = None
+    offset = 0 if page < 1 or keyset else (page - 1) * settings.PAGE_LIMIT
+    query_keyset = ''
+    if keyset:
+        # rows after last row of previous page in same order,
+        # `{game_mode}` and `{source}` filled with table values
+        query_keyset = '({}) {} ({})'.format(
+            ', '.join(
+                f"'{{{order_column}}}'"
+                if order_column in (C.GAME_MODE, C.SOURCE)
+                else format_column(order_column)
+                for order_column in order_columns
+            ),
+            '<' if order_direction == 'DESC' else '>',
+            ', '.join(
+                f'CAST(:keyset_{index} AS timestamp)'
+                if order_column == C.TIME
+                else f':keyset_{index}'
+                for index, order_column in enumerate(order_columns)
+            ),
+        )
 
     for t in tables:
         if games[t.game_mode][C.STATUS] == SGame.NOT_ENABLED:
@@ -1769,32 +2215,38 @@ def matches_router(db: Session, body: Router) -> MatchesResponse:
         if query_date:
             query_table += ' AND ' if query_table.strip() else 'WHERE '
             query_table += query_date
+        branches.append((t.name, query_table))
 
+        if query_keyset:
+            query_table += ' AND ' if query_table.strip() else 'WHERE '
+            query_table += query_keyset.format(
+                **{C.GAME_MODE: t.game_mode, C.SOURCE: t.source}
+            )
+
+        # every table sorted and limited by own index before merge
         selects.append(
-            f'''
+            f'''(
 SELECT '{t.game_mode}' AS {C.GAME_MODE}, '{t.source}' AS {C.SOURCE}, \
 {C.USERNAME if is_mw else f'null AS {C.USERNAME}'}, \
-{C.LOADOUT if is_mw and t.source != C.BASIC else f'null AS {C.LOADOUT}'},
+{C.LOADOUT if is_mw and t.source != C.BASIC else f'null AS {C.LOADOUT}'}, \
+{'loadout_bin' if is_mw and t.source != C.BASIC else 'null AS loadout_bin'},
 {', '.join(map(format_column, SC.BASIC_STATS))}
 FROM {t.name} {query_table}
-'''
+ORDER BY {order_sql} LIMIT {offset + settings.PAGE_LIMIT}
+)'''
         )
 
     if not selects:
         return json_error(status.HTTP_404_NOT_FOUND, not_found_msg)
 
-    sql = '\nUNION\n'.join(selects)
-    offset = 0 if page < 1 else (page - 1) * settings.PAGE_LIMIT
-    found: int = db.execute(text(sql)).rowcount if offset == 0 else 0
-    column = order.strip('-')
-    order_direction = 'DESC' if order[0] == '-' else 'ASC'
-
-    sql += f'\nORDER BY {format_column(column)} {order_direction}'
-    if column != C.TIME:
-        sql += f', {C.TIME} {order_direction}'
+    found = 0
+    if offset == 0 and not keyset:
+        found = matches_found_get(db, branches)
 
-    sql += f' LIMIT {settings.PAGE_LIMIT} OFFSET {offset}'
-    matches_raw = list(map(to_dict, db.execute(text(sql)).fetchall()))
+    sql = '\nUNION ALL\n'.join(selects)
+    sql += f'\nORDER BY {order_sql} LIMIT {settings.PAGE_LIMIT} OFFSET {offset}'
+    params = {f'keyset_{index}': value for index, value in enumerate(keyset or ())}
+    matches_raw = list(map(to_dict, db.execute(text(sql), params).fetchall()))
     matches_loaded: int = len(matches_raw)
 
     if matches_loaded == 0 and page < 2:
@@ -1809,28 +2261,38 @@ FROM {t.name} {query_table}
         #         return matches_router(db, body)
         return json_error(status.HTTP_404_NOT_FOUND, not_found_msg)
 
+    # Resolve usernames and labels for whole page at once
+    usernames = players_usernames_get(
+        [match_raw[C.UNO] for match_raw in matches_raw if not match_raw[C.USERNAME]]
+    )
+    page_labels: dict[tuple[str, GameMode], dict[str | None, LabelData]] = {}
+    for label_type in (C.MAP, C.MODE):
+        page_names: defaultdict[GameMode, set[str | None]] = defaultdict(set)
+        for match_raw in matches_raw:
+            page_names[match_raw[C.GAME_MODE]].add(match_raw.get(label_type))
+        for page_game_mode, names in page_names.items():
+            page_labels[(label_type, page_game_mode)] = MF.get_modes(
+                names, label_type, page_game_mode
+            )
+
     # Format matches for table row
     matches: list[MatchesData] = []
     for match_raw in matches_raw:
+        match_game_mode = match_raw[C.GAME_MODE]
         match = {
-            C.GAME_MODE: match_raw[C.GAME_MODE],
+            C.GAME_MODE: match_game_mode,
             C.ID: match_raw[C.ID],
             C.TIME: date_format(match_raw[C.TIME], C.ISO),
             C.PLAYER: (
-                match_raw.get(C.USERNAME)
-                or (
-                    redis_manage(
-                        f'{C.PLAYER}:{C.UNO}_{match_raw[C.UNO]}', 'hget', C.USERNAME
-                    )
-                    or [None]
-                )[0]
-                or target
+                match_raw[C.USERNAME] or usernames.get(match_raw[C.UNO]) or target
             ),
             C.MATCHID: match_raw.get(C.MATCHID, 'unknown'),
-            C.MAP: MF.get_mode(match_raw.get(C.MAP), C.MAP, match_raw[C.GAME_MODE]),
-            C.MODE: MF.get_mode(match_raw.get(C.MODE), C.MODE, match_raw[C.GAME_MODE]),
+            C.MAP: page_labels[(C.MAP, match_game_mode)][match_raw.get(C.MAP)],
+            C.MODE: page_labels[(C.MODE, match_game_mode)][match_raw.get(C.MODE)],
             C.RESULT: match_raw.get(C.RESULT) or 0,
-            C.LOADOUT: MF.format_loadout([match_raw.get(C.LOADOUT) or '']),
+            C.LOADOUT: MF.format_loadout(
+                [match_raw.get('loadout_bin') or match_raw.get(C.LOADOUT)]
+            ),
             C.SOURCE: match_raw[C.SOURCE],
         } | {
             stat_name: match_raw.get(stat_name, 0)
@@ -1841,90 +2303,144 @@ FROM {t.name} {query_table}
     res: MatchesResponse = {
         C.MATCHES: matches,
         'found': found,
+        'cursor': None,
     }
+    if matches_loaded == settings.PAGE_LIMIT:
+        last_match = matches_raw[-1]
+        res['cursor'] = matches_cursor_encode(
+            [
+                (
+                    last_match[order_column].isoformat()
+                    if order_column == C.TIME
+                    else last_match[order_column]
+                )
+                for order_column in order_columns
+            ]
+        )
 
     # only player with fully parsed matches history
     # if games[C.ALL][C.STATUS] > SPlayerParsed.NONE:
 
-    uid = f'{C.MATCHES}:{data_type}_{target}_{game_mode}'  # CacheUid
-    key = f'{order}_{date}_{page}'  # CacheKey
-    redis_manage(uid, 'hset', {key: res})
+    MC.set(body, res, cache_tags, cache_generations)
 
     return res
 
 
+def matches_found_get(db: Session, branches: list[tuple[str, str]]) -> int:
+    '''
+    Planner estimate for not filtered tables,
+    count limited by `FOUND_LIMIT` for each filtered table
+    '''
+    FOUND_LIMIT = 10_000
+    counts: list[str] = []
+
+    for table_name, query_table in branches:
+        capped = f'''(SELECT COUNT(*) FROM \
+(SELECT 1 FROM {table_name} {query_table} LIMIT {FOUND_LIMIT}) capped)'''
+        if query_table.strip():
+            counts.append(f'SELECT {capped} AS found')
+        else:
+            # reltuples is -1 for table that was never analyzed
+            counts.append(
+                f'''SELECT CASE WHEN reltuples >= 0 THEN reltuples::bigint \
+ELSE {capped} END AS found FROM pg_class WHERE oid = '{table_name}'::regclass'''
+            )
+
+    sql = f'''SELECT COALESCE(SUM(found), 0) FROM (
+{' UNION ALL '.join(counts)}
+) counts'''
+
+    return int(db.execute(text(sql)).scalar())
+
+
+def matches_cursor_encode(values: list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def matches_cursor_decode(cursor: str) -> list | None:
+    if not cursor:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        return None
+    if not isinstance(values, list):
+        return None
+    return values
+
+
+def match_columns_get(
+    game_mode: GameModeMw,
+) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    '''Players columns with match meta columns, meta columns'''
+    columns_meta = SC.MATCH[game_mode]['meta']
+    columns = SC.MATCH[game_mode][C.BASIC]
+    columns += tuple(column for column in columns_meta if column not in columns)
+    return columns, columns_meta
+
+
+def match_player_format(player: dict) -> MatchPlayer:
+    return {
+        C.ID: player[C.ID],
+        C.UNO: player[C.UNO],
+        C.USERNAME: player[C.USERNAME],
+        C.CLANTAG: player[C.CLANTAG],
+        C.RESULT: player[C.RESULT],
+        C.STATS: {
+            stat_name: player.get(stat_name) or 0 for stat_name in SC.MATCH_STATS
+        },
+    }
+
+
 def match_data_get(
     db: Session,
     matchID: str,
     game_mode: GameModeMw,
-    need_pars: bool,
     year: YearWzTable | None = None,
 ):
     if not matchID:
         return
 
     game, mode = SGM.desctruct_game_mode(game_mode)
+    location = MI.get(db, matchID, game_mode)
+    if location and game_mode == C.MW_WZ and year and MI.year_get(location) != year:
+        location = None
     tables = STT.get_tables(game, mode, C.ALL, year)
-    columns_basic = SC.MATCH[game_mode][C.BASIC]
+    if location:
+        # indexed table first, others searched only if index outdated
+        tables = [location] + [t for t in tables if t.name != location.name]
+    columns, columns_meta = match_columns_get(game_mode)
 
     for t in tables:
-        select_columns = (t.table.__dict__.get(column) for column in columns_basic)
+        select_columns = (t.table.__dict__.get(column) for column in columns)
         match_query = db.query(*select_columns).filter(t.table.matchID == matchID).all()
         if match_query:
-            players: list[MatchPlayer] = []
-            for player in match_query:
-                player = to_dict(player)
-                players.append(
-                    {
-                        C.ID: player[C.ID],
-                        C.UNO: player[C.UNO],
-                        C.USERNAME: player[C.USERNAME],
-                        C.CLANTAG: player[C.CLANTAG],
-                        C.RESULT: player[C.RESULT],
-                        C.STATS: {
-                            stat_name: player.get(stat_name) or 0
-                            for stat_name in SC.MATCH_STATS
-                        },
-                    }
-                )
-
-            return {C.PLAYERS: players, 'table_data': t}
-
-    is_have_token = settings.SESSION.cookies.get('ACT_SSO_COOKIE') is not None
-
-    if need_pars and is_have_token:
-        # Check if matchID from our game table and get the year of the match
-        table = STT.get_table(game_mode).table
-        match = db.query(table.time)
-        match = match.filter(table.matchID == matchID).first()
-        if match is None:
-            return
-        pars_list: list[FullmatchData] = [
-            {C.MATCHID: matchID, C.YEAR: str(match.time.year)}
-        ]
-        is_parsed = fullmatches_pars_pack(db, pars_list, game_mode)
-        if is_parsed is True:
-            return match_data_get(db, matchID, game_mode, False)
-
+            if t is not location:
+                MI.put(db, game_mode, t.source, {matchID: MI.year_get(t)})
+                db.commit()
+            match_meta = to_dict(match_query[0])
+            players = [match_player_format(to_dict(player)) for player in match_query]
 
-def match_get(db: Session, matchID: str, game_mode: GameModeMw) -> MatchData | Error:
-    data = match_data_get(db, matchID, game_mode, True)
+            return {
+                C.PLAYERS: players,
+                'table_data': t,
+                'meta': {column: match_meta[column] for column in columns_meta},
+            }
 
-    if data is None:
-        return json_error(
-            status.HTTP_404_NOT_FOUND, f'{C.MATCHID} [{matchID}] {C.NOT_FOUND}'
-        )
 
-    t: TableGameData = data['table_data']
-    meta_columns = (t.table.__dict__[column] for column in SC.MATCH[game_mode]['meta'])
-    match_meta = db.query(*meta_columns).filter(t.table.matchID == matchID)
-    match_meta = to_dict(match_meta.first())
-    match: MatchData = {
-        C.MAP: MF.get_mode(match_meta.get(C.MAP), C.MAP, game_mode),
-        C.MODE: MF.get_mode(match_meta.get(C.MODE), C.MODE, game_mode),
+def match_summary_build(
+    game_mode: GameModeMw,
+    source: MatchesSource,
+    players: list[MatchPlayer],
+    match_meta: dict,
+) -> MatchSummary:
+    '''Teams and match totals, map and mode names resolved on read'''
+    match: MatchSummary = {
+        C.MAP: match_meta.get(C.MAP),
+        C.MODE: match_meta.get(C.MODE),
         C.DURATION: date_format(match_meta.get(C.DURATION), C.TIME),
-        C.TIME: match_meta[C.TIME],
-        C.SOURCE: t.source,
+        C.TIME: date_format(match_meta[C.TIME], C.ISO),
+        C.SOURCE: source,
         C.STATS: {stat_name: 0 for stat_name in SC.MATCH_STATS},
         C.TEAM: [],
     }
@@ -1932,7 +2448,7 @@ def match_get(db: Session, matchID: str, game_mode: GameModeMw) -> MatchData | E
     score_loss = min(match_meta.get('team1Score', 0), match_meta.get('team2Score', 0))
     team: dict[str, TeamData] = {}
 
-    for player in data[C.PLAYERS]:
+    for player in players:
         if game_mode == C.MW_WZ:
             team_name = player.pop(C.TEAM, None) or str(player[C.RESULT])
         elif player[C.RESULT] == MatchResultMp.WIN:
@@ -1977,10 +2493,127 @@ def match_get(db: Session, matchID: str, game_mode: GameModeMw) -> MatchData | E
     return match
 
 
+def match_summaries_save(
+    db: Session, game_mode: GameModeMw, t: TableGameData, match_ids: list[str]
+):
+    '''Build summaries for just saved matches, commit left to caller'''
+    columns, columns_meta = match_columns_get(game_mode)
+    select_columns = (t.table.__dict__.get(column) for column in columns)
+    rows = db.query(t.table.matchID, *select_columns)
+    rows = rows.filter(t.table.matchID.in_(match_ids)).all()
+
+    matches: defaultdict[str, list[dict]] = defaultdict(list)
+    for row in rows:
+        row = to_dict(row)
+        matches[row[C.MATCHID]].append(row)
+
+    MI.summaries_put(
+        db,
+        game_mode,
+        {
+            matchID: match_summary_build(
+                game_mode,
+                t.source,
+                list(map(match_player_format, players)),
+                {column: players[0][column] for column in columns_meta},
+            )
+            for matchID, players in matches.items()
+        },
+    )
+
+
+def match_get(
+    db: Session, matchID: str, game_mode: GameModeMw
+) -> MatchData | JSONResponse | Error:
+    '''Not saved match requested for parsing, answered with 202 and job'''
+    summary = MI.summary_get(db, matchID, game_mode)
+
+    if summary is None:
+        # matches saved before summaries or loaded from csv
+        data = match_data_get(db, matchID, game_mode)
+        if data is None:
+            return match_job_add(db, matchID, game_mode)
+        summary = match_summary_build(
+            game_mode, data['table_data'].source, data[C.PLAYERS], data['meta']
+        )
+        MI.summaries_put(db, game_mode, {matchID: summary})
+        db.commit()
+
+    match: MatchData = {
+        **summary,
+        C.MAP: MF.get_mode(summary[C.MAP], C.MAP, game_mode),
+        C.MODE: MF.get_mode(summary[C.MODE], C.MODE, game_mode),
+    }
+
+    return match
+
+
+def match_job_add(
+    db: Session, matchID: str, game_mode: GameModeMw
+) -> JSONResponse | Error:
+    not_found = json_error(
+        status.HTTP_404_NOT_FOUND, f'{C.MATCHID} [{matchID}] {C.NOT_FOUND}'
+    )
+    if settings.SESSION.cookies.get('ACT_SSO_COOKIE') is None:
+        return not_found
+
+    # Check if matchID from our game table and get the year of the match
+    table = STT.get_table(game_mode).table
+    match = db.query(table.time).filter(table.matchID == matchID).first()
+    if match is None:
+        return not_found
+
+    job = MJ.add(matchID, game_mode, str(match.time.year))
+    return JSONResponse(job, status.HTTP_202_ACCEPTED)
+
+
+async def match_job_get(job_id: str, wait: int) -> MatchJob | Error:
+    '''Job state, request held up to `wait` seconds until job finished'''
+    job = await MJ.wait(job_id, wait)
+    if job is None:
+        return json_error(status.HTTP_404_NOT_FOUND, f'[{job_id}] {C.NOT_FOUND}')
+
+    if job[C.STATUS] == STask.COMPLETED:
+        with next(get_db()) as db:
+            match = await run_in_threadpool(
+                match_get, db, job[C.MATCHID], job[C.GAME_MODE]
+            )
+        if isinstance(match, dict):
+            job[C.MATCH] = match
+
+    return job
+
+
+def match_job_run(db: Session, job: MatchJob):
+    '''Parse requested match in monitor, result read by `match_job_get`'''
+    job_id, matchID, game_mode = job[C.ID], job[C.MATCHID], job[C.GAME_MODE]
+    MJ.status_set(job_id, STask.RUNNING)
+    start = time.perf_counter()
+
+    try:
+        pars_list: list[FullmatchData] = [{C.MATCHID: matchID, C.YEAR: job[C.YEAR]}]
+        fullmatches_pars_pack(db, pars_list, game_mode)
+        is_found = match_data_get(db, matchID, game_mode) is not None
+        job_status = STask.COMPLETED if is_found else C.NOT_FOUND
+    except Exception as e:
+        in_logs(
+            job_id,
+            f'{match_job_run.__name__} {type(e).__name__}',
+            'cod_logs_error',
+            {'trace': traceback.format_exc()},
+        )
+        job_status = STask.ERROR
+
+    MJ.status_set(job_id, job_status)
+    in_logs_cod_logs_cache(
+        matchID, game_mode, f'{job_status} {C.MATCH} [{time_taken_get(start)}]'
+    )
+
+
 def clear_fullmatches_doubles(
     db: Session, body: ClearFullmatchDoublesBody
 ) -> ClearFullmatchesDoublesResponse | Error:
-    data = match_data_get(db, body.matchID, body.game_mode, False)
+    data = match_data_get(db, body.matchID, body.game_mode)
 
     if data is None:
         return json_error(
@@ -2006,6 +2639,9 @@ def clear_fullmatches_doubles(
         else:
             match_unos.add(uno)
 
+    if result:
+        MI.summary_delete(db, body.matchID, body.game_mode)
+
     if not result:
         return json_error(
             status.HTTP_404_NOT_FOUND,
@@ -2014,6 +2650,13 @@ def clear_fullmatches_doubles(
 
     db.commit()
 
+    player_to_group = players_groups_get()
+    MC.invalidate(
+        match_unos,
+        {player_to_group.get(uno) for uno in match_unos},
+        body.game_mode,
+    )
+
     message = f'[{body.matchID}] {body.game_mode} doubles {C.DELETED} [{len(result)}]'
 
     in_logs(
@@ -2058,7 +2701,12 @@ def player_clear_match_doubles(db: Session, uno: str, game_mode: GameMode) -> Me
     message = f'{game_mode} {C.DELETED} [{doubles_found}] doubles'
 
     if doubles_found:
+        CR.player_rebuild(db, uno, [game_mode])
+        if SGM.is_game_mode_mw(game_mode):
+            LC.player_rebuild(db, uno, [game_mode])
         db.commit()
+        player_group = redis_manage(f'{C.PLAYER}:{C.UNO}_{uno}', 'hget', C.GROUP)
+        MC.invalidate([uno], [player_group], game_mode)
         in_logs(uno, message, 'cod_logs_player')
 
     return {C.MESSAGE: message}
@@ -2097,6 +2745,14 @@ def match_stats_get(db: Session, body: MatchBody) -> MatchStatsPlayer | Error:
         or 'unknown'
     )
 
+    # binary columns filled for new matches, string for not migrated
+    loadout = match_data.pop('loadout_bin', None) or match_data.pop(C.LOADOUT, None)
+    match_data.pop(C.LOADOUT, None)
+    weapon_stats = match_data.pop('weaponStats_bin', None) or match_data.pop(
+        'weaponStats', None
+    )
+    match_data.pop('weaponStats', None)
+
     match_stats: MatchStatsPlayer = {
         C.ID: match_data.pop(C.ID),
         C.UNO: uno,
@@ -2107,8 +2763,8 @@ def match_stats_get(db: Session, body: MatchBody) -> MatchStatsPlayer | Error:
         C.MAP: MF.get_mode(match_data.pop(C.MAP), C.MAP, body.game_mode),
         C.MODE: MF.get_mode(match_data.pop(C.MODE), C.MODE, body.game_mode),
         C.TEAM: match_data.pop(C.TEAM) or 'unknown',
-        C.LOADOUT: MF.decode_loadout(match_data.pop(C.LOADOUT, None)),
-        'weaponStats': MF.decode_weapon_stats(match_data.pop('weaponStats', None)),
+        C.LOADOUT: MF.decode_loadout(loadout),
+        'weaponStats': MF.decode_weapon_stats(weapon_stats),
         C.SOURCE: C.ALL if body.source in Year.__args__ else body.source,
         C.TIME: match_data.pop(C.TIME),
         C.STATS: {
@@ -2166,98 +2822,181 @@ def fill_all_matches(
     return tuple_all_matches
 
 
-@log_time_wrap
-def loadout_update(db: Session):
+def players_groups_get() -> dict[str, str]:
+    '''uno -> group of players added to group'''
     player_to_group: dict[str, str] = {}
     for uno in target_unos_get(C.PLAYER):
         if player_group := redis_manage(f'{C.PLAYER}:{C.UNO}_{uno}', 'hget', C.GROUP):
             player_to_group[uno] = player_group
+    return player_to_group
 
-    game_modes = SGM.modes(C.MW)
-    targets: dict[str, dict[GameMode, list[LoadoutStatsData]]] = {
-        uno: {game_mode: [] for game_mode in game_modes}
-        for uno in (
-            set(player_to_group) | set(player_to_group.values()) | {C.ALL, C.TRACKER}
-        )
-    }
 
-    # fill player loadout
-    for game_mode in game_modes:
-        table = STT.get_table(game_mode).table
-        matches = db.query(table.loadout, table.uno).all()
-        for match in matches:
-            if not match.loadout:
+def loadout_targets_update(db: Session, targets: Iterable[str]):
+    '''Save top loadout of players, groups, `all` and `tracker` from counters'''
+    if not LC.is_filled():
+        return  # saved loadouts kept until counters filled by `loadout` reset
+
+    player_to_group = players_groups_get()
+
+    game_modes = list(SGM.modes(C.MW))
+    for target in targets:
+        if target == C.TRACKER:
+            unos = None
+        elif target == C.ALL:
+            unos = list(player_to_group)
+        elif target in player_to_group:
+            unos = [target]
+        else:
+            unos = [uno for uno, group in player_to_group.items() if group == target]
+            if not unos:
                 continue
-            targets[C.TRACKER][game_mode].append(match.loadout)
-            if match.uno in targets:
-                targets[match.uno][game_mode].append(match.loadout)
-
-    # summary player loadout by groups
-    for uno, loadout in targets.items():
-        player_group = player_to_group.get(uno)
-        if player_group is None:
-            continue
-        for game_mode, game_mode_loadout in loadout.items():
-            targets[player_group][game_mode] += game_mode_loadout
-            targets[C.ALL][game_mode] += game_mode_loadout
-
-    for uno, loadout in targets.items():
-        # summary all game_mode loadout
-        loadout[C.ALL] = [
-            i for game_mode_loadout in loadout.values() for i in game_mode_loadout
+
+        loadout: Loadout = {
+            game_mode: LC.top_get(db, [game_mode], unos) for game_mode in game_modes
+        }
+        loadout[C.ALL] = LC.top_get(db, game_modes, unos)
+        target_data_stats_save(db, target, C.LOADOUT, loadout)
+
+
+@log_time_wrap
+def loadout_update(db: Session):
+    '''Count loadouts of all matches again and save for every target'''
+    LC.rebuild(db)
+    player_to_group = players_groups_get()
+    loadout_targets_update(
+        db,
+        set(player_to_group) | set(player_to_group.values()) | {C.ALL, C.TRACKER},
+    )
+
+
+def play_with_save(db: Session, targets: set[PlayWithTarget]):
+    for (_, target), most_play_with in PW.most_play_with_get(db, targets).items():
+        target_data_stats_save(db, target, C.MOST_PLAY_WITH, most_play_with)
+
+
+def play_with_fold(db: Session, deltas: list[PlayWithDelta]):
+    '''Count logged fullmatches, then save most play with of affected targets'''
+    play_with_save(db, PW.fold(db, deltas))
+
+
+def play_with_rebuild(db: Session):
+    play_with_save(db, PW.rebuild(db))
+
+
+def play_with_groups_rebuild(db: Session, groups: set[str]):
+    '''Count logged groups again, then save most play with of groups'''
+    targets = PW.groups_rebuild(db, groups)
+    db.commit()
+    play_with_save(db, targets)
+
+
+def loadout_bin_migrate(db: Session):
+    '''Move string loadout and weaponStats of MW tables into binary columns'''
+    STEP = 10_000
+    tables = STT.get_tables(C.MW, C.ALL, C.MATCHES) + STT.get_tables(
+        C.MW, C.ALL, C.MAIN
+    )
+
+    for t in tables:
+        table = t.table
+        columns = table.__table__.columns
+        is_weapon_stats = 'weaponStats' in columns
+        start = time.perf_counter()
+        last_id = 0
+        migrated = 0
+
+        while True:
+            query = db.query(
+                table.id,
+                table.loadout,
+                table.weaponStats if is_weapon_stats else null(),
+            ).filter(table.id > last_id)
+            if is_weapon_stats:
+                query = query.filter(
+                    (table.loadout.is_not(None)) | (table.weaponStats.is_not(None))
+                )
+            else:
+                query = query.filter(table.loadout.is_not(None))
+            rows = query.order_by(table.id).limit(STEP).all()
+            if not rows:
+                break
+
+            values = []
+            for row_id, loadout, weapon_stats in rows:
+                values.append(
+                    {
+                        C.ID: row_id,
+                        'loadout_bin': loadout_string_to_bin(loadout),
+                        'weaponStats_bin': weapon_stats_string_to_bin(weapon_stats),
+                    }
+                )
+            set_columns = 'loadout_bin = :loadout_bin, loadout = NULL'
+            if is_weapon_stats:
+                set_columns += ', "weaponStats_bin" = :weaponStats_bin'
+                set_columns += ', "weaponStats" = NULL'
+            db.execute(
+                text(f'UPDATE {t.name} SET {set_columns} WHERE id = :id'), values
+            )
+            db.commit()
+
+            last_id = rows[-1][0]
+            migrated += len(rows)
+            seconds = time.perf_counter() - start
+            print(f'{t.name} {migrated} migrated {int(migrated / seconds)} rows/s')
+
+        print(f'{t.name} {migrated} migrated [{time_taken_get(start)}]')
+
+
+def loadout_string_to_bin(loadout: str | None):
+    if not loadout:
+        return None
+    return MF.pack_loadouts(
+        [
+            [[int(index) for index in indexes if index] for indexes in slots]
+            for slots in MF.loadout_slots(loadout)
         ]
-        # sort and save top 50 game_mode loadout
-        for game_mode, game_mode_loadout in loadout.items():
-            loadout[game_mode] = sorted(
-                (
-                    {C.NAME: name, C.COUNT: count}
-                    for name, count in MF.format_loadout(game_mode_loadout).items()
-                    if 'fists' not in name.lower()
-                ),
-                key=lambda x: x[C.COUNT],
-                reverse=True,
-            )[:50]
-        target_data_stats_save(db, uno, C.LOADOUT, loadout)
+    )
+
+
+def weapon_stats_string_to_bin(weapon_stats: str | None):
+    if not weapon_stats:
+        return None
+    return MF.pack_indexes(
+        [int(value) for row in MF.weapon_stats_rows(weapon_stats) for value in row]
+    )
 
 
 @log_time_wrap
 def update_chart(db: Session) -> None:
-    player_to_group: dict[str, str] = {}
-    for uno in target_unos_get(C.PLAYER):
-        if player_group := redis_manage(f'{C.PLAYER}:{C.UNO}_{uno}', 'hget', C.GROUP):
-            player_to_group[uno] = player_group
+    player_to_group = players_groups_get()
 
     # Fill targets with game modes
-    targets: dict[str, dict[GameMode, list[str]]] = {
-        uno: {game_mode: [] for game_mode in SGM.modes(C.ALL, C.ALL)}
+    targets: dict[str, dict[GameMode, Counter[datetime.date]]] = {
+        uno: {game_mode: Counter() for game_mode in SGM.modes(C.ALL, C.ALL)}
         for uno in (
             set(player_to_group) | set(player_to_group.values()) | {C.ALL, C.TRACKER}
         )
     }
 
-    game_tables = STT.get_tables(C.ALL, C.ALL, C.MATCHES)
-    for t in game_tables:
-        query = db.query(t.table.time, t.table.uno).all()
-        # Fill match dates to all, groups, players.
-        for match in query:
-            date = date_format(match.time, C.DATE)
-            targets[C.TRACKER][C.ALL].append(date)
-            targets[C.TRACKER][t.game_mode].append(date)
-            if match.uno not in targets:
-                continue
-            # fill dates for player
-            targets[match.uno][C.ALL].append(date)
-            targets[match.uno][t.game_mode].append(date)
-            # fill dates for group
-            player_group = player_to_group[match.uno]
-            targets[player_group][C.ALL].append(date)
-            targets[player_group][t.game_mode].append(date)
-            # fill dates for all
-            targets[C.ALL][C.ALL].append(date)
-            targets[C.ALL][t.game_mode].append(date)
+    # Matches counted by day in sql, rows summed to all, groups, players
+    for date, uno, game_mode, count in CR.rows_get(db):
+        targets[C.TRACKER][C.ALL][date] += count
+        targets[C.TRACKER][game_mode][date] += count
+        if uno not in targets:
+            continue
+        # fill dates for player
+        targets[uno][C.ALL][date] += count
+        targets[uno][game_mode][date] += count
+        # fill dates for group
+        player_group = player_to_group[uno]
+        targets[player_group][C.ALL][date] += count
+        targets[player_group][game_mode][date] += count
+        # fill dates for all
+        targets[C.ALL][C.ALL][date] += count
+        targets[C.ALL][game_mode][date] += count
 
     for uno, chart in targets.items():
-        for game_mode, dates_list in chart.items():
+        for game_mode, dates_count in chart.items():
             years: dict[Year, dict[str, int]] = {
                 year: {
                     'summ': 0,
@@ -2265,15 +3004,20 @@ def update_chart(db: Session) -> None:
                 }
                 for year in Year.__args__
             }
-            dates_count = {i: dates_list.count(i) for i in sorted(set(dates_list))}
-            for date, count in dates_count.items():
-                year, month, day = tuple(map(lambda x: str(int(x)), date.split('-')))
+            for date, count in sorted(dates_count.items()):
+                year, month, day = str(date.year), str(date.month), str(date.day)
+                if year not in years:
+                    continue
                 years[year]['summ'] += count
                 years[year]['months'].setdefault(month, {'summ': 0, 'days': {}})
                 years[year]['months'][month]['summ'] += count
                 years[year]['months'][month]['days'][day] = count
 
-            chart[game_mode] = {'summ': len(dates_list), 'years': years}
+            # dates out of `Year` skipped in summ too
+            chart[game_mode] = {
+                'summ': sum(year['summ'] for year in years.values()),
+                'years': years,
+            }
 
         target_data_stats_save(db, uno, C.CHART, chart)
 
@@ -2518,6 +3262,7 @@ def labels_put(db: Session, body: LabelsItem, label_type: LabelType):
     db.commit()
 
     label = to_dict(query.first())
+    MF.announce(label_type, [(str(label[C.ID]), body.name)])
 
     return label
 
@@ -2533,7 +3278,6 @@ def labels_post(db: Session, body: LabelsItem, label_type: LabelType):
         )
 
     label = table(
-        id=get_last_id(db, table) + 1,
         name=body.name,
         label=body.label,
         game_mode=body.game_mode,
@@ -2558,6 +3302,7 @@ def labels_delete(db: Session, name: str, label_type: LabelType):
 
     db.delete(label)
     db.commit()
+    MF.announce(label_type, [(str(res[C.ID]), name)])
 
     set_table_sequence(db, table.__tablename__)
 
@@ -2566,8 +3311,11 @@ def labels_delete(db: Session, name: str, label_type: LabelType):
 
 def labels_delete_all(db: Session, label_type: LabelType):
     table = STT.label_tables[label_type]
+    labels = [(str(label.id), label.name) for label in db.query(table.id, table.name)]
     deleted_labels = db.query(table).delete()
     db.commit()
+    if labels:
+        MF.announce(label_type, labels)
     set_table_sequence(db, table.__tablename__, 0)
 
     return {C.MESSAGE: f'[{label_type}] {C.DELETED} labels - {deleted_labels}'}
@@ -1,12 +1,22 @@
 import copy
-from collections import defaultdict
-from typing import Literal
+import sys
+import threading
+import time
+from array import array
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Callable, Literal
+import redis
+import simplejson as json
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
+from core.config import settings
 from core.database import get_db
 
 from apps.base.schemas.main import C
-from apps.base.crud.utils import date_format, in_logs, get_last_id
+from apps.base.crud.utils import date_format, in_logs
 
 from apps.tracker.crud.store_tables import STT
 from apps.tracker.crud.store_game_modes import SGM
@@ -20,10 +30,20 @@ from apps.tracker.schemas.main import (
     GameMode,
     LabelType,
     MatchResultMp,
+    FormatPlan,
 )
 
 
 class TrackerLabels:
+    '''
+    Label indexes cached in process, mirrored in redis hash for other processes,
+    ids allocated by table sequence \n
+    Changes announced in redis channel,
+    every process drop changed labels from own cache
+    '''
+
+    CHANNEL = 'labels'
+
     def __init__(self):
         self.decoded: dict[str, dict[str, LabelData]] = {
             label_type: {} for label_type in STT.label_tables
@@ -31,9 +51,11 @@ class TrackerLabels:
         self.encoded: dict[str, dict[str, str]] = {
             label_type: {} for label_type in STT.label_tables
         }
+        self.conn = redis.Redis(connection_pool=settings.REDIS_CONNECTION_POOL)
 
         with next(get_db()) as db:
             for name, table in STT.label_tables.items():
+                self.sequence_sync(db, table.__tablename__)
                 all_label_data = db.query(table).all()
                 for label_data in all_label_data:
                     index = str(label_data.id)
@@ -43,38 +65,180 @@ class TrackerLabels:
                     }
                     self.encoded[name][label_data.name] = index
 
-    def create_index(
+        threading.Thread(
+            target=self.listen, name=TrackerLabels.__name__, daemon=True
+        ).start()
+
+    def sequence_sync(self, db: Session, table_name: str):
+        '''Ids was set by max id before, move sequence forward only'''
+        table_seq = f'{table_name}_id_seq'
+        db.execute(
+            text(
+                f'''SELECT setval('{table_seq}', MAX(id)) FROM {table_name} \
+HAVING MAX(id) > (SELECT last_value FROM {table_seq})'''
+            )
+        )
+        db.commit()
+
+    def listen(self):
+        is_subscribed = False
+        while True:
+            try:
+                pubsub = self.conn.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.CHANNEL)
+                if is_subscribed:
+                    # changes can be missed while was disconnected
+                    for label_type in STT.label_tables:
+                        self.encoded[label_type] = {}
+                        self.decoded[label_type] = {}
+                is_subscribed = True
+                for message in pubsub.listen():
+                    changed = json.loads(message[C.DATA])
+                    self.forget(changed['label_type'], changed['labels'])
+            except Exception as e:
+                in_logs(
+                    TrackerLabels.__name__,
+                    f'{self.listen.__name__} {type(e).__name__}: {e}',
+                    'logs_error',
+                )
+                time.sleep(5)
+
+    def forget(self, label_type: LabelType, labels: list[tuple[str | None, str]]):
+        for index, name in labels:
+            if name is None:
+                # created label, was cached as unknown only if requested by index
+                if self.decoded[label_type].get(index, {}).get(C.NAME) == 'unknown':
+                    del self.decoded[label_type][index]
+                continue
+            index = self.encoded[label_type].pop(name, None) or index
+            self.decoded[label_type].pop(index, None)
+
+    def announce(self, label_type: LabelType, labels: list[tuple[str | None, str]]):
+        '''Drop changed labels from cache in all processes'''
+        self.conn.hdel(f'{C.LABEL}:{label_type}', *(name for _, name in labels))
+        self.conn.publish(
+            self.CHANNEL, json.dumps({'label_type': label_type, 'labels': labels})
+        )
+
+    def labels_create(
         self,
         db: Session,
-        label_data: LabelData,
         label_type: LabelType,
+        labels: dict[str, LabelData],
         game_mode: GameMode,
-    ):
+    ) -> dict[str, str]:
+        '''Missing labels inserted with one statement, returns indexes by name'''
         table = STT.label_tables[label_type]
-        exist = db.query(table).filter(table.name == label_data[C.NAME]).first()
-
-        if exist:
-            label_data = exist
-        else:
-            label_data = table(
-                id=get_last_id(db, table) + 1,
-                name=label_data[C.NAME],
-                label=label_data[C.LABEL][:99] if label_data[C.LABEL] else None,
-                game_mode=game_mode,
+        db.execute(
+            insert(table)
+            .values(
+                [
+                    {
+                        C.NAME: name,
+                        C.LABEL: label_data[C.LABEL][:99]
+                        if label_data[C.LABEL]
+                        else None,
+                        C.GAME_MODE: game_mode,
+                    }
+                    for name, label_data in labels.items()
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=[C.NAME])
+        )
+        rows = (
+            db.query(table.id, table.name, table.label)
+            .filter(table.name.in_(labels))
+            .all()
+        )
+        db.commit()
+
+        indexes: dict[str, str] = {}
+        mirror: dict[str, str] = {}
+        for row in rows:
+            index = str(row.id)
+            self.decoded[label_type][index] = {C.NAME: row.name, C.LABEL: row.label}
+            self.encoded[label_type][row.name] = index
+            indexes[row.name] = index
+            mirror[row.name] = json.dumps([index, row.label])
+
+        if mirror:
+            self.conn.hset(f'{C.LABEL}:{label_type}', mapping=mirror)
+            # cached as unknown by index in other processes
+            self.conn.publish(
+                self.CHANNEL,
+                json.dumps(
+                    {
+                        'label_type': label_type,
+                        'labels': [(index, None) for index in indexes.values()],
+                    }
+                ),
             )
-            db.add(label_data)
-            db.commit()
-            db.refresh(label_data)
 
-        index = str(label_data.id)
+        return indexes
 
-        self.decoded[label_type][index] = {
-            C.NAME: label_data.name,
-            C.LABEL: label_data.label,
-        }
-        self.encoded[label_type][label_data.name] = index
+    def labels_resolve(
+        self,
+        label_type: LabelType,
+        labels: dict[str, LabelData],
+        game_mode: GameMode,
+    ) -> dict[str, str]:
+        '''Indexes from process cache, then redis mirror, missing created'''
+        encoded = self.encoded[label_type]
+        indexes = {name: encoded[name] for name in labels if name in encoded}
+        missing = [name for name in labels if name not in indexes]
+        if not missing:
+            return indexes
+
+        mirrored = self.conn.hmget(f'{C.LABEL}:{label_type}', missing)
+        for name, value in zip(missing, mirrored):
+            if value is None:
+                continue
+            index, label = json.loads(value)
+            self.decoded[label_type][index] = {C.NAME: name, C.LABEL: label}
+            encoded[name] = index
+            indexes[name] = index
 
-        return index
+        missing = {name: labels[name] for name in missing if name not in indexes}
+        if missing:
+            with next(get_db()) as db:
+                indexes |= self.labels_create(db, label_type, missing, game_mode)
+
+        return indexes
+
+    def labels_prepare(self, players: list[dict], game_mode: GameMode):
+        '''Create all unknown labels of match players at once before encoding'''
+        if SGM.is_game_mode_mw(game_mode) is False:
+            return
+
+        unknown: dict[LabelType, dict[str, LabelData]] = defaultdict(dict)
+
+        def add(label_type: LabelType, name: str | None, label: str | None):
+            if name == 'specialty_null' or is_none_value(name):
+                return
+            if name not in self.encoded[label_type]:
+                unknown[label_type][name] = {C.NAME: name, C.LABEL: label}
+
+        for match_data in players:
+            for loadout in match_data[C.PLAYER].get(C.LOADOUT) or []:
+                for weapon_type in ('primaryWeapon', 'secondaryWeapon'):
+                    weapon: dict = loadout[weapon_type]
+                    add('weapons', weapon[C.NAME], weapon.get(C.LABEL))
+                    for attachment in weapon['attachments']:
+                        add('attachments', attachment[C.NAME], attachment.get(C.LABEL))
+                for perk in loadout['perks'] + loadout['extraPerks']:
+                    name = perk[C.NAME].replace('specialty_', '')
+                    add('perks', name, perk.get(C.LABEL))
+                for killstreak in loadout['killstreaks']:
+                    add('killstreaks', killstreak[C.NAME], killstreak.get(C.LABEL))
+                for weapon_type in ('tactical', 'lethal'):
+                    if equip := loadout[weapon_type]:
+                        name = equip[C.NAME].replace('equip_', '')
+                        add(weapon_type, name, equip.get(C.LABEL))
+            for weapon_name in match_data.get('weaponStats') or {}:
+                add('weapons', weapon_name, None)
+
+        for label_type, labels in unknown.items():
+            self.labels_resolve(label_type, labels, game_mode)
 
     def get_index(
         self, label_data: LabelData, label_type: LabelType, game_mode: GameMode
@@ -85,8 +249,9 @@ class TrackerLabels:
         index: str | None = self.encoded[label_type].get(label_data[C.NAME])
 
         if index is None:
-            with next(get_db()) as db:
-                index = self.create_index(db, label_data, label_type, game_mode)
+            index = self.labels_resolve(
+                label_type, {label_data[C.NAME]: label_data}, game_mode
+            ).get(label_data[C.NAME])
 
         return index
 
@@ -133,6 +298,23 @@ class TrackerLabels:
         label_data = self.get_label_data(index, label_type)
         return label_data
 
+    def get_modes(
+        self,
+        names: set[str | None],
+        label_type: Literal['map', 'mode'],
+        game_mode: GameMode,
+    ) -> dict[str | None, LabelData]:
+        '''Same as `get_mode` for many names, unknown names created at once'''
+        labels: dict[str, LabelData] = {
+            name: {C.NAME: name, C.LABEL: None}
+            for name in names
+            if name != 'specialty_null' and not is_none_value(name)
+        }
+        indexes = self.labels_resolve(label_type, labels, game_mode) if labels else {}
+        return {
+            name: self.get_label_data(indexes.get(name), label_type) for name in names
+        }
+
 
 class MatchFormatter(TrackerLabels):
     def __init__(self):
@@ -147,67 +329,148 @@ class MatchFormatter(TrackerLabels):
                 if '__' not in column and '_sa_class_manager' not in column
             ]
 
+        self.GAME_COLUMNS_SET = {
+            game_mode: frozenset(columns)
+            for game_mode, columns in self.GAME_COLUMNS.items()
+        }
+        self.PLAYER_COLUMNS = frozenset(SC.PLAYER)
+        self.CONVERTERS: dict[str, Callable] = {
+            C.DURATION: self.convert_seconds,
+            'teamSurvivalTime': self.convert_seconds,
+            C.ACCURACY: self.convert_percent,
+        } | {name: self.convert_round for name in SC.ROUND}
+        # (game_mode, playerStats keys) -> ((key, column), ...)
+        self.format_plans: dict[tuple[GameMode, tuple[str, ...]], FormatPlan] = {}
+
         self.WEAPON_TYPES = tuple(MatchLoadout.model_fields)
         self.STAT_TYPES = tuple(MatchLoadoutDataWeaponStats.model_fields)
 
         self.SPLIT_ON_LOADOUTS = '\n'
         self.SPLIT_ON_WEAPONS = ','
         self.SPLIT_ON_INDEXES = ' '
+        # first byte of binary loadout and weaponStats
+        self.BIN_TYPECODES = {1: 'H', 2: 'I', 3: 'q'}
+        self.BIN_COUNT_LIMIT = 0xFF
+        self.loadout_pairs_cached = lru_cache(maxsize=50_000)(
+            self.loadout_pairs_cached
+        )
+
+    @staticmethod
+    def convert_round(value: float):
+        return round(value, 2)
+
+    @staticmethod
+    def convert_seconds(value: int):
+        return value / 1000
+
+    @staticmethod
+    def convert_percent(value: float):
+        return round(value * 100, 2)
+
+    def format_plan_get(self, game_mode: GameMode, keys: tuple[str, ...]) -> FormatPlan:
+        '''
+        Which `playerStats` keys saved and under which column,
+        compiled once for every key set, unknown columns reported once
+        '''
+        plan = self.format_plans.get((game_mode, keys))
+        if plan is not None:
+            return plan
+
+        columns = self.GAME_COLUMNS_SET[game_mode]
+        plan_columns: list[tuple[str, str]] = []
+        for name in keys:
+            column = SC.RENAME_TO_BASIC.get(name, name)
+            if column in columns:
+                plan_columns.append((name, column))
+            else:
+                SC.new_columns.add(column)
+
+        plan = tuple(plan_columns)
+        self.format_plans[(game_mode, keys)] = plan
+
+        return plan
 
     def format_match(self, match_data: dict, game_mode: GameMode):
         match = {}
         match[C.TIME] = date_format(match_data['utcStartSeconds'])
 
         for name, value in match_data[C.PLAYER].items():
-            if name in SC.PLAYER and not is_none_value(value):
+            if name in self.PLAYER_COLUMNS and not is_none_value(value):
                 match[name] = value
 
-        for name, value in match_data.items():
-            if name in SC.META:
-                if name == C.RESULT:
-                    if value == 'win':
-                        value = MatchResultMp.WIN
-                    elif value == 'loss':
-                        value = MatchResultMp.LOSS
-                    else:
-                        value = MatchResultMp.DRAW
+        for name in SC.META:
+            if name in match_data:
+                match[name] = match_data[name]
 
-                match[name] = value
-
-        for name, value in match_data['playerStats'].items():
-            name = SC.RENAME_TO_BASIC.get(name, name)
-            if name in self.GAME_COLUMNS[game_mode]:
-                match[name] = value
+        if C.RESULT in match:
+            value = match[C.RESULT]
+            if value == 'win':
+                match[C.RESULT] = MatchResultMp.WIN
+            elif value == 'loss':
+                match[C.RESULT] = MatchResultMp.LOSS
             else:
-                SC.new_columns.add(name)
+                match[C.RESULT] = MatchResultMp.DRAW
 
-        is_mw = SGM.is_game_mode_mw(game_mode)
+        player_stats: dict = match_data['playerStats']
+        for name, column in self.format_plan_get(game_mode, tuple(player_stats)):
+            match[column] = player_stats[name]
 
-        if is_mw is False and 'weaponStats' in match:
-            del match['weaponStats']
-        if is_mw is False and C.LOADOUT in match:
-            del match[C.LOADOUT]
-
-        for name, value in match.items():
-            if name in SC.ROUND:
-                value = round(value, 2)
-            elif name in (C.DURATION, 'teamSurvivalTime'):
-                value = value / 1000
-            elif name == C.ACCURACY:
-                value = round(value * 100, 2)
-            elif name == C.LOADOUT:
-                value = self.encode_loadouts(value, game_mode)
-            elif name == 'weaponStats':
-                value = self.encode_weapon_stats(value, game_mode)
-            else:
-                continue
+        for name, converter in self.CONVERTERS.items():
+            if name in match:
+                match[name] = converter(match[name])
+
+        is_mw = SGM.is_game_mode_mw(game_mode)
 
-            match[name] = value
+        if C.LOADOUT in match:
+            loadouts = match.pop(C.LOADOUT)
+            if is_mw:
+                match['loadout_bin'] = self.encode_loadouts(loadouts, game_mode)
+        if 'weaponStats' in match:
+            weapon_stats = match.pop('weaponStats')
+            if is_mw:
+                match['weaponStats_bin'] = self.encode_weapon_stats(
+                    weapon_stats, game_mode
+                )
 
         return match
 
+    def pack_indexes(self, values: list[int], header=b'') -> bytes | None:
+        '''
+        First byte is typecode of array, smallest that fit all values,
+        then header and array itself \n
+        Without values only header kept, None if header empty too
+        '''
+        if not values and not header:
+            return None
+
+        if not values:
+            code = 1
+        elif min(values) < 0:
+            code = 3
+        elif max(values) <= 0xFFFF:
+            code = 1
+        elif max(values) <= 0xFFFFFFFF:
+            code = 2
+        else:
+            code = 3
+
+        packed = array(self.BIN_TYPECODES[code], values)
+        if sys.byteorder == 'big':
+            packed.byteswap()
+
+        return bytes((code,)) + header + packed.tobytes()
+
+    def unpack_indexes(self, data: bytes, header_size=0) -> array:
+        values = array(self.BIN_TYPECODES[data[0]])
+        values.frombytes(data[1 + header_size :])
+        if sys.byteorder == 'big':
+            values.byteswap()
+
+        return values
+
     def encode_loadout(self, loadout: dict[str, dict | list], game_mode: GameMode):
-        encoded_loadout = []
+        '''Label indexes for every `WEAPON_TYPES` slot'''
+        encoded_loadout: list[list[str]] = []
 
         for weapon_type in self.WEAPON_TYPES:
             encoded = []
@@ -243,51 +506,129 @@ class MatchFormatter(TrackerLabels):
                 if index := self.get_index(equip, weapon_type, game_mode):
                     encoded.append(index)
 
-            encoded_loadout.append(self.SPLIT_ON_INDEXES.join(encoded))
+            encoded_loadout.append(encoded)
 
-        encoded_loadout = self.SPLIT_ON_WEAPONS.join(encoded_loadout)
+        return encoded_loadout
 
-        return encoded_loadout or None
+    def pack_loadouts(self, loadouts: list[list[list[int]]]) -> bytes | None:
+        '''
+        Binary loadouts, header is loadouts count byte
+        and indexes count byte for every slot of every loadout \n
+        Counts are one byte, loadouts and slot indexes over 255 dropped
+        '''
+        if not loadouts:
+            return None
 
-    def encode_loadouts(self, loadouts: list[dict], game_mode: GameMode):
-        encoded_loadouts = [
-            self.encode_loadout(loadout, game_mode) for loadout in loadouts
-        ]
-        encoded_loadouts = self.SPLIT_ON_LOADOUTS.join(encoded_loadouts)
+        loadouts = loadouts[: self.BIN_COUNT_LIMIT]
+        counts = bytearray((len(loadouts),))
+        values: list[int] = []
+        for slots in loadouts:
+            for indexes in slots:
+                indexes = indexes[: self.BIN_COUNT_LIMIT]
+                counts.append(len(indexes))
+                values += indexes
 
-        return encoded_loadouts
+        return self.pack_indexes(values, bytes(counts))
+
+    def encode_loadouts(self, loadouts: list[dict], game_mode: GameMode):
+        return self.pack_loadouts(
+            [
+                [
+                    list(map(int, encoded))
+                    for encoded in self.encode_loadout(loadout, game_mode)
+                ]
+                for loadout in loadouts
+            ]
+        )
 
     def encode_weapon_stats(
         self, weapon_stats: dict[str, MatchLoadoutDataWeaponStats], game_mode: GameMode
     ):
-        encoded_stats = []
+        '''Binary weapon stats, weapon index and `STAT_TYPES` values for each weapon'''
+        values: list[int] = []
 
         for weapon_name, stats in weapon_stats.items():
             label_data = {C.NAME: weapon_name, C.LABEL: None}
             weapon_index = self.get_index(label_data, 'weapons', game_mode)
             if not weapon_index:
                 continue
-            stat_values = [str(int(stats[stat_type])) for stat_type in self.STAT_TYPES]
-            encoded_stat = self.SPLIT_ON_INDEXES.join([weapon_index] + stat_values)
-            encoded_stats.append(encoded_stat)
+            values.append(int(weapon_index))
+            values += (int(stats[stat_type]) for stat_type in self.STAT_TYPES)
+
+        return self.pack_indexes(values)
+
+    def loadout_counts(self, data: bytes) -> tuple[bytes, array]:
+        '''Slots indexes counts of all loadouts and indexes'''
+        counts = data[2 : 2 + data[1] * len(self.WEAPON_TYPES)]
+        return counts, self.unpack_indexes(data, 1 + len(counts))
+
+    def loadout_slots(
+        self, loadouts: str | bytes | memoryview
+    ) -> list[list[list[str]]]:
+        '''Label indexes by slot for every loadout, from string or binary format'''
+        if isinstance(loadouts, str):
+            return [
+                [
+                    weapon.split(self.SPLIT_ON_INDEXES)
+                    for weapon in loadout.split(self.SPLIT_ON_WEAPONS)
+                ]
+                for loadout in loadouts.split(self.SPLIT_ON_LOADOUTS)
+            ]
 
-        encoded_stats = self.SPLIT_ON_LOADOUTS.join(encoded_stats)
+        # psycopg2 returns bytea as memoryview
+        counts, values = self.loadout_counts(bytes(loadouts))
+        slots_count = len(self.WEAPON_TYPES)
+        decoded: list[list[list[str]]] = []
+        position = 0
+        for index in range(0, len(counts), slots_count):
+            slots: list[list[str]] = []
+            for count in counts[index : index + slots_count]:
+                indexes = values[position : position + count]
+                # same as split of empty string slot
+                slots.append([str(value) for value in indexes] or [''])
+                position += count
+            decoded.append(slots)
+
+        return decoded
+
+    def loadout_pairs(
+        self, loadouts: str | bytes | memoryview
+    ) -> list[tuple[str, str]]:
+        '''Only primary and secondary weapon indexes of every loadout'''
+        if isinstance(loadouts, str):
+            return [
+                (slots[0][0], slots[1][0]) for slots in self.loadout_slots(loadouts)
+            ]
 
-        return encoded_stats or None
+        counts, values = self.loadout_counts(bytes(loadouts))
+        slots_count = len(self.WEAPON_TYPES)
+        pairs: list[tuple[str, str]] = []
+        position = 0
+        for index in range(0, len(counts), slots_count):
+            primary, secondary = counts[index], counts[index + 1]
+            pairs.append(
+                (
+                    str(values[position]) if primary else '',
+                    str(values[position + primary]) if secondary else '',
+                )
+            )
+            position += sum(counts[index : index + slots_count])
 
-    def decode_loadout(self, loadouts: str | None) -> list[MatchLoadout]:
+        return pairs
+
+    def decode_loadout(
+        self, loadouts: str | bytes | memoryview | None
+    ) -> list[MatchLoadout]:
         if not loadouts:
             return []
 
         decoded_loadouts = []
-        loadouts = loadouts.split(self.SPLIT_ON_LOADOUTS)
 
-        for loadout in loadouts:
+        for weapons in self.loadout_slots(loadouts):
             decoded_loadout = {}
-            weapons = loadout.split(self.SPLIT_ON_WEAPONS)
 
             for index, weapon_type in enumerate(self.WEAPON_TYPES):
-                weapon_indexes = weapons[index].split(self.SPLIT_ON_INDEXES)
+                weapon_indexes = weapons[index]
 
                 if weapon_type in ('primaryWeapon', 'secondaryWeapon'):
                     # first element is weapon index
@@ -321,18 +662,31 @@ class MatchFormatter(TrackerLabels):
 
         return decoded_loadouts
 
+    def weapon_stats_rows(
+        self, weapon_stats: str | bytes | memoryview
+    ) -> list[list[str]]:
+        if isinstance(weapon_stats, str):
+            return [
+                row.split(self.SPLIT_ON_INDEXES)
+                for row in weapon_stats.split(self.SPLIT_ON_LOADOUTS)
+            ]
+
+        values = self.unpack_indexes(bytes(weapon_stats))
+        stride = len(self.STAT_TYPES) + 1
+        return [
+            [str(value) for value in values[index : index + stride]]
+            for index in range(0, len(values), stride)
+        ]
+
     def decode_weapon_stats(
-        self, weapon_stats: str | None
+        self, weapon_stats: str | bytes | memoryview | None
     ) -> list[MatchLoadoutDataStats]:
         decoded_weapon_stats = []
 
         if not weapon_stats:
             return decoded_weapon_stats
 
-        weapon_stats = weapon_stats.split(self.SPLIT_ON_LOADOUTS)
-        for encoded_weapon_stat in weapon_stats:
-            encoded_weapon_stat = encoded_weapon_stat.split(self.SPLIT_ON_INDEXES)
-
+        for encoded_weapon_stat in self.weapon_stats_rows(weapon_stats):
             weapon_index = encoded_weapon_stat[0]
             weapon_stat_values = encoded_weapon_stat[1:]
 
@@ -345,21 +699,38 @@ class MatchFormatter(TrackerLabels):
 
         return decoded_weapon_stats
 
-    def format_loadout(self, player_loadouts: list[str]):
-        '''Count (Primary + Secondary) weapon loadout'''
-        loadout: defaultdict[str, int] = defaultdict(int)
-
-        for loadouts in player_loadouts:
-            decoded_loadouts = self.decode_loadout(loadouts)
-            for decoded_loadout in decoded_loadouts:
-                weapon_names = []
-                for weapon_name in ('primaryWeapon', 'secondaryWeapon'):
-                    weapon_names.append(
-                        decoded_loadout[weapon_name][C.LABEL]
-                        or decoded_loadout[weapon_name][C.NAME]
-                    )
-                weapon_names = ' + '.join(weapon_names)
-                loadout[weapon_names] += 1
+    def loadout_pairs_cached(
+        self, loadouts: str | bytes
+    ) -> tuple[tuple[str, str], ...]:
+        '''Same encoded loadouts shared by many matches'''
+        return tuple(self.loadout_pairs(loadouts))
+
+    def weapon_name_get(self, index: str) -> str:
+        label_data = self.decoded['weapons'].get(index) if index else None
+        if label_data is None:
+            label_data = self.get_label_data(index, 'weapons')
+        return label_data[C.LABEL] or label_data[C.NAME]
+
+    def format_loadout(self, player_loadouts: list[str | bytes | memoryview | None]):
+        '''
+        Count (Primary + Secondary) weapon loadout \n
+        Equal encoded loadouts counted first, each decoded once
+        '''
+        loadout: Counter[str] = Counter()
+        encoded_count = Counter(
+            bytes(loadouts) if isinstance(loadouts, memoryview) else loadouts
+            for loadouts in player_loadouts
+            if loadouts
+        )
+        names: dict[tuple[str, str], str] = {}
+
+        for loadouts, count in encoded_count.items():
+            for pair in self.loadout_pairs_cached(loadouts):
+                weapon_names = names.get(pair)
+                if weapon_names is None:
+                    weapon_names = ' + '.join(map(self.weapon_name_get, pair))
+                    names[pair] = weapon_names
+                loadout[weapon_names] += count
 
         return loadout
 
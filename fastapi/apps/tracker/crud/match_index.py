@@ -0,0 +1,237 @@
+import time
+import zlib
+import redis
+import simplejson as json
+from sqlalchemy import text, update, bindparam, null
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from core.config import settings
+
+from apps.base.schemas.main import C
+from apps.base.crud.utils import time_taken_get
+
+from apps.tracker.crud.store_tables import STT
+from apps.tracker.schemas.main import (
+    GameModeMw,
+    MatchesSource,
+    MatchSummary,
+    TableGameData,
+    YearWzTable,
+)
+
+
+class MatchIndex:
+    '''
+    matchID -> fullmatches table with match players \n
+    Stored in `cod_fullmatches_index`, found locations cached in redis
+    as `match_index:{game_mode}_{matchID}` = `{source}_{year}`,
+    year saved only for warzone tables splitted by years \n
+    Same rows keep zlib compressed match summary built once after match saved
+    '''
+
+    PREFIX = 'match_index'
+    SUMMARY_PREFIX = 'match_summary'
+    TTL = 24 * 60 * 60
+    COMPRESS_LEVEL = 6
+
+    def __init__(self):
+        self.table = STT.fullmatches_index
+        self.conn = redis.Redis(connection_pool=settings.REDIS_CONNECTION_POOL)
+
+    def key_get(self, matchID: str, game_mode: GameModeMw) -> str:
+        return f'{self.PREFIX}:{game_mode}_{matchID}'
+
+    def summary_key_get(self, matchID: str, game_mode: GameModeMw) -> str:
+        return f'{self.SUMMARY_PREFIX}:{game_mode}_{matchID}'
+
+    def year_get(self, t: TableGameData) -> YearWzTable | None:
+        if t.game_mode != C.MW_WZ:
+            return None
+        for year, table in STT.FULLMATCHES[C.MW_WZ][t.source].items():
+            if table is t.table:
+                return year
+
+    def table_get(
+        self, game_mode: GameModeMw, source: MatchesSource, year: str | None
+    ) -> TableGameData | None:
+        if game_mode == C.MW_WZ and year not in YearWzTable.__args__:
+            return None
+        return STT.get_table(game_mode, source, year or None)
+
+    def get(
+        self, db: Session, matchID: str, game_mode: GameModeMw
+    ) -> TableGameData | None:
+        key = self.key_get(matchID, game_mode)
+        cached: bytes | None = self.conn.get(key)
+        if cached is not None:
+            source, year = cached.decode().split('_')
+        else:
+            location = (
+                db.query(self.table.source, self.table.year)
+                .filter(
+                    self.table.matchID == matchID, self.table.game_mode == game_mode
+                )
+                .first()
+            )
+            if location is None:
+                return None
+            source, year = location.source, location.year or ''
+            self.conn.set(key, f'{source}_{year}', ex=self.TTL)
+
+        return self.table_get(game_mode, source, year)
+
+    def put(
+        self,
+        db: Session,
+        game_mode: GameModeMw,
+        source: MatchesSource,
+        locations: dict[str, YearWzTable | None],
+    ):
+        '''
+        Save matchID -> year locations, commit left to caller \n
+        Summary of moved match dropped, it was built from other table
+        '''
+        if not locations:
+            return
+
+        stmt = insert(self.table)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[self.table.matchID, self.table.game_mode],
+                set_={
+                    C.SOURCE: stmt.excluded.source,
+                    C.YEAR: stmt.excluded.year,
+                    'summary': null(),
+                },
+                where=self.table.source != stmt.excluded.source,
+            ),
+            [
+                {
+                    C.MATCHID: matchID,
+                    C.GAME_MODE: game_mode,
+                    C.SOURCE: source,
+                    C.YEAR: year if game_mode == C.MW_WZ else None,
+                }
+                for matchID, year in locations.items()
+            ],
+        )
+        self.conn.delete(
+            *(self.key_get(matchID, game_mode) for matchID in locations),
+            *(self.summary_key_get(matchID, game_mode) for matchID in locations),
+        )
+
+    def delete(self, db: Session, matchID: str, game_mode: GameModeMw):
+        '''Remove location of deleted match, commit left to caller'''
+        db.query(self.table).filter(
+            self.table.matchID == matchID, self.table.game_mode == game_mode
+        ).delete()
+        self.conn.delete(
+            self.key_get(matchID, game_mode), self.summary_key_get(matchID, game_mode)
+        )
+
+    def summary_get(
+        self, db: Session, matchID: str, game_mode: GameModeMw
+    ) -> MatchSummary | None:
+        key = self.summary_key_get(matchID, game_mode)
+        compressed: bytes | None = self.conn.get(key)
+        if compressed is None:
+            compressed = (
+                db.query(self.table.summary)
+                .filter(
+                    self.table.matchID == matchID, self.table.game_mode == game_mode
+                )
+                .scalar()
+            )
+            if compressed is None:
+                return None
+            compressed = bytes(compressed)
+            self.conn.set(key, compressed, ex=self.TTL)
+
+        return json.loads(zlib.decompress(compressed))
+
+    def summaries_put(
+        self,
+        db: Session,
+        game_mode: GameModeMw,
+        summaries: dict[str, MatchSummary],
+    ):
+        '''Save summaries of indexed matches, commit left to caller'''
+        if not summaries:
+            return
+
+        table = self.table.__table__
+        db.execute(
+            update(table)
+            .where(
+                table.c.matchID == bindparam('b_matchID'),
+                table.c.game_mode == bindparam('b_game_mode'),
+            )
+            .values(summary=bindparam('b_summary')),
+            [
+                {
+                    'b_matchID': matchID,
+                    'b_game_mode': game_mode,
+                    'b_summary': zlib.compress(
+                        json.dumps(summary).encode(), self.COMPRESS_LEVEL
+                    ),
+                }
+                for matchID, summary in summaries.items()
+            ],
+        )
+        self.conn.delete(
+            *(self.summary_key_get(matchID, game_mode) for matchID in summaries)
+        )
+
+    def summary_delete(self, db: Session, matchID: str, game_mode: GameModeMw):
+        '''Summary built again on next read, commit left to caller'''
+        db.query(self.table).filter(
+            self.table.matchID == matchID, self.table.game_mode == game_mode
+        ).update({self.table.summary: null()})
+        self.conn.delete(self.summary_key_get(matchID, game_mode))
+
+    def table_sync(self, db: Session, t: TableGameData, from_table: str = '') -> int:
+        '''
+        Add matchIDs of table `t` or of `from_table` rows going into it \n
+        Main tables override basic locations, basic only fill missing
+        '''
+        conflict = (
+            f'''DO UPDATE SET source = EXCLUDED.source, year = EXCLUDED.year, \
+summary = NULL WHERE {self.table.__tablename__}.source <> EXCLUDED.source'''
+            if t.source == C.MAIN
+            else 'DO NOTHING'
+        )
+        added = db.execute(
+            text(
+                f'''INSERT INTO {self.table.__tablename__} \
+("matchID", game_mode, source, year)
+SELECT DISTINCT "matchID", CAST(:game_mode AS varchar), \
+CAST(:source AS varchar), CAST(:year AS varchar)
+FROM {from_table or t.name} WHERE "matchID" IS NOT NULL
+ON CONFLICT ("matchID", game_mode) {conflict}'''
+            ),
+            {
+                C.GAME_MODE: t.game_mode,
+                C.SOURCE: t.source,
+                C.YEAR: self.year_get(t),
+            },
+        ).rowcount
+
+        return added
+
+    def backfill(self, db: Session):
+        '''Index all fullmatches tables, basic first so main locations win'''
+        start = time.perf_counter()
+        tables = STT.fullmatches_tables(C.ALL, C.ALL)
+        tables.sort(key=lambda t: t.source != C.BASIC)
+
+        for t in tables:
+            table_start = time.perf_counter()
+            added = self.table_sync(db, t)
+            db.commit()
+            print(f'{t.name} {added} indexed [{time_taken_get(table_start)}]')
+
+        print(f'{C.FULLMATCHES} index done [{time_taken_get(start)}]')
+
+
+MI = MatchIndex()
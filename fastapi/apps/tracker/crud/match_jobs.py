@@ -0,0 +1,90 @@
+import asyncio
+import redis
+
+from core.config import settings
+
+from apps.base.schemas.main import C, STask
+from apps.base.crud.utils import now
+
+from apps.tracker.schemas.main import GameModeMw, MatchJob
+
+
+class MatchJobs:
+    '''
+    Fullmatches parsing requested from match page, done by monitor \n
+    Job id is `{game_mode}_{matchID}`, same match requested again
+    joins existing job, job state kept in `match_job:{id}` hash for `TTL` \n
+    Failed job replaced by new one when match requested again
+    '''
+
+    QUEUE = 'match_jobs'
+    PREFIX = 'match_job'
+    TTL = 10 * 60
+    POLL_INTERVAL = 0.5
+    WAIT_LIMIT = 20
+    FINISHED = (STask.COMPLETED, STask.ERROR, C.NOT_FOUND)
+    RETRY = (STask.ERROR, C.NOT_FOUND)
+
+    def __init__(self):
+        self.conn = redis.Redis(connection_pool=settings.REDIS_CONNECTION_POOL)
+
+    def key_get(self, job_id: str) -> str:
+        return f'{self.PREFIX}:{job_id}'
+
+    def add(self, matchID: str, game_mode: GameModeMw, year: str) -> MatchJob:
+        job_id = f'{game_mode}_{matchID}'
+        key = self.key_get(job_id)
+        job: MatchJob = {
+            C.ID: job_id,
+            C.MATCHID: matchID,
+            C.GAME_MODE: game_mode,
+            C.YEAR: year,
+            C.STATUS: STask.PENDING,
+            C.TIME: now(C.ISO),
+        }
+        with self.conn.pipeline() as pipe:
+            try:
+                pipe.watch(key)
+                job_status = pipe.hget(key, C.STATUS)
+                if job_status is None or job_status.decode() in self.RETRY:
+                    pipe.multi()
+                    pipe.delete(key)
+                    pipe.hset(key, mapping=job)
+                    pipe.expire(key, self.TTL)
+                    pipe.rpush(self.QUEUE, job_id)
+                    pipe.execute()
+                    return job
+            except redis.WatchError:
+                pass  # same match requested at same time
+
+        return self.get(job_id) or job
+
+    def get(self, job_id: str) -> MatchJob | None:
+        job = self.conn.hgetall(self.key_get(job_id))
+        job = {k.decode(): v.decode() for k, v in job.items()}
+        if C.MATCHID not in job:
+            return None
+        return job
+
+    def status_set(self, job_id: str, job_status: str):
+        self.conn.hset(self.key_get(job_id), C.STATUS, job_status)
+
+    def pop(self, timeout: float) -> MatchJob | None:
+        '''Next job for monitor, waits `timeout` seconds for new one'''
+        popped = self.conn.blpop([self.QUEUE], timeout)
+        if popped is None:
+            return None
+        return self.get(popped[1].decode())
+
+    async def wait(self, job_id: str, seconds: int) -> MatchJob | None:
+        '''Job state after it finished or `seconds` passed'''
+        tries = int(min(seconds, self.WAIT_LIMIT) / self.POLL_INTERVAL)
+        job = await asyncio.to_thread(self.get, job_id)
+        while job and job[C.STATUS] not in self.FINISHED and tries > 0:
+            await asyncio.sleep(self.POLL_INTERVAL)
+            job = await asyncio.to_thread(self.get, job_id)
+            tries -= 1
+        return job
+
+
+MJ = MatchJobs()
@@ -0,0 +1,154 @@
+from typing import Iterable
+import redis
+import simplejson as json
+
+from core.config import settings
+
+from apps.base.schemas.main import C
+from apps.tracker.schemas.main import (
+    GameMode,
+    MatchesCacheStats,
+    MatchesResponse,
+    Router,
+)
+
+
+class MatchesCache:
+    '''
+    Read-through cache for `matches_router` responses \n
+    Pages of one target stored in hash `matches:{data_type}_{target}_{game_mode}`,
+    hash name added to tag sets `matches_tag:{tag}`,
+    ingestion paths drop only hashes tagged with changed uno, group or game mode \n
+    Invalidate increments tag generations `matches_gen:{tag}`,
+    page built from query started before invalidate not cached
+    '''
+
+    PREFIX = C.MATCHES
+    TAG_PREFIX = 'matches_tag'
+    GEN_PREFIX = 'matches_gen'
+    STATS_KEY = 'matches_cache_stats'
+    DELETE_STEP = 500
+
+    def __init__(self):
+        self.ttl = settings.MATCHES_CACHE_TTL
+        self.conn = redis.Redis(connection_pool=settings.REDIS_CONNECTION_POOL)
+
+    def uid_get(self, body: Router) -> str:
+        return f'{self.PREFIX}:{body.data_type}_{body.target}_{body.game_mode}'
+
+    def key_get(self, body: Router) -> str:
+        return f'{body.order}_{body.date}_{body.page}_{body.cursor}'
+
+    def tag_get(self, tag_type: str, value: str) -> str:
+        return f'{self.TAG_PREFIX}:{tag_type}_{value}'
+
+    def generation_key_get(self, tag: str) -> str:
+        return tag.replace(self.TAG_PREFIX, self.GEN_PREFIX, 1)
+
+    def generations_get(self, tags: list[str]) -> list[bytes | None]:
+        '''Read before query, passed to `set` with its result'''
+        return self.conn.mget([self.generation_key_get(tag) for tag in tags])
+
+    def get(self, body: Router) -> MatchesResponse | None:
+        cached = self.conn.hget(self.uid_get(body), self.key_get(body))
+        self.conn.hincrby(self.STATS_KEY, 'misses' if cached is None else 'hits')
+        if cached is None:
+            return None
+        return json.loads(cached)
+
+    def set(
+        self,
+        body: Router,
+        res: MatchesResponse,
+        tags: list[str],
+        generations: list[bytes | None],
+    ):
+        uid = self.uid_get(body)
+        generation_keys = [self.generation_key_get(tag) for tag in tags]
+        with self.conn.pipeline() as pipe:
+            try:
+                pipe.watch(*generation_keys)
+                if pipe.mget(generation_keys) != generations:
+                    return  # invalidated while page was built
+                pipe.multi()
+                pipe.hset(uid, self.key_get(body), json.dumps(res))
+                pipe.ttl(uid)
+                for tag in tags:
+                    pipe.sadd(tag, uid)
+                    pipe.expire(tag, self.ttl)
+                ttl = pipe.execute()[1]
+            except redis.WatchError:
+                return
+        # ttl counted from first cached page, not refreshed by next pages
+        if ttl < 0:
+            self.conn.expire(uid, self.ttl)
+
+    def tags_get(
+        self,
+        unos: Iterable[str] = (),
+        groups: Iterable[str] = (),
+        game_modes: Iterable[GameMode] = (),
+    ) -> list[str]:
+        tags = [self.tag_get(C.UNO, uno) for uno in unos if uno]
+        tags += [self.tag_get(C.GROUP, group) for group in groups if group]
+        tags += [self.tag_get(C.GAME_MODE, game_mode) for game_mode in game_modes]
+        return tags
+
+    def invalidate(
+        self,
+        unos: Iterable[str] = (),
+        groups: Iterable[str] = (),
+        game_mode: GameMode | None = None,
+    ) -> int:
+        '''
+        Drop cached pages of players, groups
+        and tracker wide pages for `game_mode` and `all`
+        '''
+        game_modes = [game_mode, C.ALL] if game_mode else []
+        tags = self.tags_get(set(unos), set(groups), game_modes)
+        pipe = self.conn.pipeline(transaction=False)
+        for tag in tags:
+            pipe.incr(self.generation_key_get(tag))
+            pipe.expire(self.generation_key_get(tag), self.ttl)
+        pipe.execute()
+
+        deleted = 0
+        for index in range(0, len(tags), self.DELETE_STEP):
+            tags_step = tags[index : index + self.DELETE_STEP]
+            uids = self.conn.sunion(tags_step)
+            self.conn.delete(*uids, *tags_step)
+            deleted += len(uids)
+        return deleted
+
+    def reset(self) -> int:
+        '''Drop all cached pages and tags'''
+        deleted = 0
+        for pattern in (
+            f'{self.PREFIX}:*',
+            f'{self.TAG_PREFIX}:*',
+            f'{self.GEN_PREFIX}:*',
+        ):
+            keys = []
+            for key in self.conn.scan_iter(pattern, count=self.DELETE_STEP):
+                keys.append(key)
+                if len(keys) == self.DELETE_STEP:
+                    deleted += self.conn.delete(*keys)
+                    keys = []
+            if keys:
+                deleted += self.conn.delete(*keys)
+        self.conn.delete(self.STATS_KEY)
+        return deleted
+
+    def stats(self) -> MatchesCacheStats:
+        hits, misses = self.conn.hmget(self.STATS_KEY, 'hits', 'misses')
+        hits, misses = int(hits or 0), int(misses or 0)
+        requests = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / requests * 100, 2) if requests else 0,
+            'ttl': self.ttl,
+        }
+
+
+MC = MatchesCache()
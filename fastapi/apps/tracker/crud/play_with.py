@@ -0,0 +1,320 @@
+import time
+from collections import Counter
+import redis
+import simplejson as json
+from sqlalchemy import func, literal, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from core.config import settings
+
+from apps.base.schemas.main import C
+from apps.base.crud.utils import now, time_taken_get
+
+from apps.tracker.crud.store_tables import STT
+from apps.tracker.crud.store_game_modes import SGM
+from apps.tracker.crud.co_occurrence import CO
+from apps.tracker.schemas.main import (
+    GameModeMw,
+    MostPlayWith,
+    PlayWithDelta,
+    TargetType,
+)
+
+PlayWithTarget = tuple[TargetType, str]
+
+
+class PlayWith:
+    '''
+    Matches played together of saved players and any other uno,
+    kept in `cod_play_with` counters by game mode \n
+    Group counters kept with `group` target type and group name as uno,
+    match counted once for group and own members not counted,
+    same as `CO.groups_count` \n
+    Groups with changed members pushed to `play_with_groups` set,
+    monitor counts them again \n
+    Fullmatches saving push unos of new matches to `play_with_delta` list,
+    monitor folds them into counters and saves affected players and groups \n
+    Folded matches marked in fullmatches index, so match saved again
+    or moved from basic to main table counted once \n
+    Nothing logged or folded until counters filled by `rebuild`
+    '''
+
+    QUEUE = 'play_with_delta'
+    PROCESSING = 'play_with_delta_processing'
+    GROUPS = 'play_with_groups'
+    STEP = 500
+    TOP_LIMIT = 50
+    COUNT_REQUIRED = 2
+
+    def __init__(self):
+        self.table = STT.play_with
+        self.name = self.table.__tablename__
+        self.filled_key = f'{self.name}_filled'
+        self.conn = redis.Redis(connection_pool=settings.REDIS_CONNECTION_POOL)
+
+    def is_filled(self) -> bool:
+        return bool(self.conn.exists(self.filled_key))
+
+    def delta_add(self, game_mode: GameModeMw, matches: dict[str, set[str]]):
+        '''Log unos of saved matches, `matches` is matchID -> unos'''
+        if not self.is_filled():
+            return  # counted by `rebuild`
+        deltas = [
+            json.dumps({C.GAME_MODE: game_mode, C.MATCHID: matchID, 'unos': list(unos)})
+            for matchID, unos in matches.items()
+            if matchID
+        ]
+        pipe = self.conn.pipeline(transaction=False)
+        for index in range(0, len(deltas), self.STEP):
+            pipe.rpush(self.QUEUE, *deltas[index : index + self.STEP])
+        pipe.execute()
+
+    def deltas_pop(self, timeout: float) -> list[PlayWithDelta]:
+        '''
+        Up to `STEP` logged matches, waits `timeout` seconds for first one \n
+        Popped matches kept in `PROCESSING` list until `deltas_done`,
+        not finished ones returned again first
+        '''
+        deltas = self.conn.lrange(self.PROCESSING, 0, -1)
+        if not deltas:
+            moved = self.conn.blmove(self.QUEUE, self.PROCESSING, timeout)
+            if moved is None:
+                return []
+            pipe = self.conn.pipeline()
+            for _ in range(self.STEP - 1):
+                pipe.lmove(self.QUEUE, self.PROCESSING)
+            deltas = [moved] + [delta for delta in pipe.execute() if delta]
+        return [json.loads(delta) for delta in deltas]
+
+    def deltas_done(self):
+        '''Drop popped matches after their fold committed'''
+        self.conn.delete(self.PROCESSING)
+
+    def groups_add(self, groups: set[str]):
+        '''Log groups with changed members'''
+        if groups and self.is_filled():
+            self.conn.sadd(self.GROUPS, *groups)
+
+    def groups_get(self) -> set[str]:
+        return {group.decode() for group in self.conn.smembers(self.GROUPS)}
+
+    def groups_done(self, groups: set[str]):
+        '''Drop logged groups after they counted again'''
+        if groups:
+            self.conn.srem(self.GROUPS, *groups)
+
+    def matches_mark(
+        self, db: Session, game_mode: GameModeMw, match_ids: list[str]
+    ) -> list[str]:
+        '''Mark matches folded, returns only not folded before'''
+        index = STT.fullmatches_index
+        return db.execute(
+            update(index)
+            .where(
+                index.game_mode == game_mode,
+                index.matchID.in_(match_ids),
+                index.play_with.is_(False),
+            )
+            .values(play_with=True)
+            .returning(index.matchID)
+        ).scalars().all()
+
+    def counters_save(self, db: Session, game_mode: GameModeMw, counter: Counter):
+        if not counter:
+            return
+
+        stmt = insert(self.table)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[
+                    self.table.target_type,
+                    self.table.uno,
+                    self.table.game_mode,
+                    self.table.other_uno,
+                ],
+                set_={'count': self.table.count + stmt.excluded.count},
+            ),
+            [
+                {
+                    'target_type': target_type,
+                    C.UNO: uno,
+                    C.GAME_MODE: game_mode,
+                    'other_uno': other_uno,
+                    'count': count,
+                }
+                for (target_type, uno, other_uno), count in counter.items()
+            ],
+        )
+
+    def players_groups_get(self, db: Session) -> dict[str, str]:
+        '''uno -> group of saved players added to group'''
+        return {
+            uno: group
+            for uno, group in db.query(STT.players.uno, STT.players.group)
+            .filter(STT.players.group.isnot(None))
+            .all()
+            if group
+        }
+
+    def fold(self, db: Session, deltas: list[PlayWithDelta]) -> set[PlayWithTarget]:
+        '''
+        Count logged matches for saved players and their groups,
+        returns players and groups with new counts
+        '''
+        matches: dict[GameModeMw, dict[str, set[str]]] = {}
+        for delta in deltas:
+            matches.setdefault(delta[C.GAME_MODE], {}).setdefault(
+                delta[C.MATCHID], set()
+            ).update(delta['unos'])
+
+        saved_unos = {row.uno for row in db.query(STT.players.uno).all()}
+        player_to_group = self.players_groups_get(db)
+        affected: set[PlayWithTarget] = set()
+
+        for game_mode, game_mode_matches in matches.items():
+            counter: Counter[tuple[TargetType, str, str]] = Counter()
+            for matchID in self.matches_mark(db, game_mode, list(game_mode_matches)):
+                unos = game_mode_matches[matchID]
+                players = unos & saved_unos
+                groups = {
+                    player_to_group[uno] for uno in players if uno in player_to_group
+                }
+                affected |= {(C.PLAYER, uno) for uno in players}
+                affected |= {(C.GROUP, group) for group in groups}
+                for uno in players:
+                    for other_uno in unos - {uno}:
+                        counter[(C.PLAYER, uno, other_uno)] += 1
+                for group in groups:
+                    for other_uno in unos:
+                        if player_to_group.get(other_uno) != group:
+                            counter[(C.GROUP, group, other_uno)] += 1
+            self.counters_save(db, game_mode, counter)
+
+        db.commit()
+        return affected
+
+    def groups_fill(self, db: Session, player_to_group: dict[str, str]):
+        '''Count matches of groups in `player_to_group`, commit left to caller'''
+        for game_mode, (game, mode) in SGM.modes(C.MW, C.ALL).items():
+            groups = CO.groups_count(
+                db, STT.get_tables(game, mode, C.ALL), player_to_group
+            )
+            self.counters_save(
+                db,
+                game_mode,
+                Counter(
+                    {
+                        (C.GROUP, group, other_uno): count
+                        for group, counter in groups.items()
+                        for other_uno, count in counter.items()
+                    }
+                ),
+            )
+
+    def groups_rebuild(self, db: Session, groups: set[str]) -> set[PlayWithTarget]:
+        '''
+        Count matches of `groups` again after members changed,
+        commit left to caller, returns groups still having members
+        '''
+        db.query(self.table).filter(
+            self.table.target_type == C.GROUP, self.table.uno.in_(groups)
+        ).delete(synchronize_session=False)
+        player_to_group = {
+            uno: group
+            for uno, group in self.players_groups_get(db).items()
+            if group in groups
+        }
+        self.groups_fill(db, player_to_group)
+        return {(C.GROUP, group) for group in player_to_group.values()}
+
+    def top_get(
+        self, db: Session, target: PlayWithTarget, game_modes: list[GameModeMw]
+    ) -> list[tuple[str, int]]:
+        '''Most common players of player or group `target` summed in `game_modes`'''
+        target_type, uno = target
+        count = func.sum(self.table.count)
+        return (
+            db.query(self.table.other_uno, count)
+            .filter(
+                self.table.target_type == target_type,
+                self.table.uno == uno,
+                self.table.game_mode.in_(game_modes),
+            )
+            .group_by(self.table.other_uno)
+            .having(count > self.COUNT_REQUIRED)
+            .order_by(count.desc())
+            .limit(self.TOP_LIMIT)
+            .all()
+        )
+
+    def most_play_with_get(
+        self, db: Session, targets: set[PlayWithTarget]
+    ) -> dict[PlayWithTarget, MostPlayWith]:
+        '''Most play with of players and groups `targets` from counters'''
+        if not targets:
+            return {}
+
+        game_modes = list(SGM.modes(C.MW, C.ALL))
+        tops: dict[PlayWithTarget, dict[str, list[tuple[str, int]]]] = {
+            target: {
+                C.ALL: self.top_get(db, target, game_modes),
+                **{
+                    game_mode: self.top_get(db, target, [game_mode])
+                    for game_mode in game_modes
+                },
+            }
+            for target in targets
+        }
+
+        tags = CO.tags_get(
+            db,
+            STT.get_tables(C.MW, C.ALL, C.ALL),
+            {uno for top in tops.values() for rows in top.values() for uno, _ in rows},
+        )
+        unknown = {C.USERNAME: 'unknown', C.CLANTAG: ''}
+        return {
+            target: {
+                game_mode: [
+                    {C.UNO: uno, C.COUNT: count} | tags.get(uno, unknown)
+                    for uno, count in rows
+                ]
+                for game_mode, rows in top.items()
+            }
+            for target, top in tops.items()
+        }
+
+    def rebuild(self, db: Session) -> set[PlayWithTarget]:
+        '''
+        Count all fullmatches of saved players and groups again,
+        returns saved players and groups
+        '''
+        start = time.perf_counter()
+        saved_unos = [row.uno for row in db.query(STT.players.uno).all()]
+        player_to_group = self.players_groups_get(db)
+        db.execute(text(f'TRUNCATE {self.name}'))
+
+        for game_mode, (game, mode) in SGM.modes(C.MW, C.ALL).items():
+            pairs = CO.pairs_get(
+                STT.get_tables(game, mode, C.ALL), saved_unos
+            ).add_columns(literal(game_mode), literal(C.PLAYER))
+            db.execute(
+                insert(self.table).from_select(
+                    [C.UNO, 'other_uno', 'count', C.GAME_MODE, 'target_type'], pairs
+                )
+            )
+        self.groups_fill(db, player_to_group)
+
+        # logged matches already counted by pairs above
+        db.execute(update(STT.fullmatches_index).values(play_with=True))
+        self.conn.delete(self.QUEUE, self.PROCESSING, self.GROUPS)
+        db.commit()
+        self.conn.set(self.filled_key, now(C.ISO))
+        print(f'{self.name} rebuild done [{time_taken_get(start)}]')
+
+        return {(C.PLAYER, uno) for uno in saved_unos} | {
+            (C.GROUP, group) for group in player_to_group.values()
+        }
+
+
+PW = PlayWith()
@@ -0,0 +1,73 @@
+import redis
+
+from core.config import settings
+
+from apps.tracker.schemas.main import RateLimit
+
+
+class RateLimiter:
+    '''
+    Token bucket for game data api, state stored in redis
+    so every monitor process and api worker share same budget \n
+    Each request reserves token ahead, bucket may go negative,
+    in that case caller wait until his token refilled
+    '''
+
+    KEY = 'rate_limit'
+
+    ACQUIRE = '''
+local capacity = tonumber(ARGV[1])
+local refill = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local redis_time = redis.call('TIME')
+local now = tonumber(redis_time[1]) + tonumber(redis_time[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'time')
+local tokens = tonumber(state[1]) or capacity
+local last = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - last) * refill)
+tokens = tokens - requested
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'time', tostring(now))
+if tokens >= 0 then
+    return '0'
+end
+return tostring(-tokens / refill)
+'''
+
+    def __init__(self):
+        self.capacity = settings.RATE_LIMIT_CAPACITY
+        self.refill = settings.RATE_LIMIT_PER_MINUTE / 60
+        self.conn = redis.Redis(connection_pool=settings.REDIS_CONNECTION_POOL)
+        self.script = self.conn.register_script(self.ACQUIRE)
+
+    def acquire(self, tokens: float = 1) -> float:
+        '''Reserve tokens, returns seconds to wait before request'''
+        wait = self.script(
+            keys=[self.KEY], args=[self.capacity, self.refill, tokens]
+        )
+        return float(wait)
+
+    def penalty(self, seconds: float):
+        '''Drain budget for `seconds` after api answered with limit error'''
+        self.acquire(self.capacity + seconds * self.refill)
+
+    def status(self) -> RateLimit:
+        tokens, last = self.conn.hmget(self.KEY, 'tokens', 'time')
+        seconds, microseconds = self.conn.time()
+        current = seconds + microseconds / 1_000_000
+        tokens = self.capacity if tokens is None else float(tokens)
+        if last is not None:
+            tokens += max(0, current - float(last)) * self.refill
+        tokens = min(self.capacity, tokens)
+
+        return {
+            'tokens': round(tokens, 2),
+            'capacity': self.capacity,
+            'refill_per_minute': settings.RATE_LIMIT_PER_MINUTE,
+            'wait': round(max(0, -tokens) / self.refill, 2),
+        }
+
+    def reset(self):
+        self.conn.delete(self.KEY)
+
+
+RATE_LIMIT = RateLimiter()
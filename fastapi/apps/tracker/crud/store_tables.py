@@ -27,6 +27,10 @@ from apps.tracker.models.main import (
     cod_fullmatches_basic_mw_wz_2021,
     cod_fullmatches_basic_mw_wz_2022,
     cod_fullmatches_basic_mw_wz_2023,
+    cod_fullmatches_index,
+    cod_matches_daily,
+    cod_loadout_counts,
+    cod_play_with,
     cod_logs,
     cod_logs_player,
     cod_logs_error,
@@ -82,6 +86,9 @@ class TrackerMatches(TrackerPlayers):
             C.CW_MP: cod_matches_cw_mp,
             C.VG_MP: cod_matches_vg_mp,
         }
+        self.matches_daily = cod_matches_daily
+        self.loadout_counts = cod_loadout_counts
+        self.play_with = cod_play_with
 
     def matches_table(self, game_mode: GameMode, source: MatchesSource):
         table = self.__dict__[source][game_mode]
@@ -146,6 +153,7 @@ class TrackerFullmatches(TrackerMatches):
                 },
             },
         }
+        self.fullmatches_index = cod_fullmatches_index
         self.FULLMATCHES_TABLE_DATA = {
             C.MW_MP: [
                 create_table_data(C.MW_MP, table, source)
@@ -2,12 +2,16 @@ import asyncio
 import csv
 import datetime
 import inspect
+import io
 import time
 from typing import Literal
 from collections import Counter
+import redis
+import simplejson as json
 
-from sqlalchemy import select, union_all, func
+from sqlalchemy import select, union_all, func, text, update, bindparam
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects import postgresql
 from fastapi import WebSocket
 
 from core.config import settings
@@ -23,6 +27,8 @@ from apps.base.crud.utils import (
     seconds_wait_expire,
     to_dict,
     log_time_wrap,
+    time_taken_get,
+    redis_value_get,
     redis_manage,
     date_format,
     config_get,
@@ -32,6 +38,10 @@ from apps.base.crud.utils import (
 
 from apps.tracker.crud.store_tables import STT
 from apps.tracker.crud.store_game_modes import SGM
+from apps.tracker.crud.rate_limit import RATE_LIMIT
+from apps.tracker.crud.match_index import MI
+from apps.tracker.crud.co_occurrence import CO
+from apps.tracker.crud.play_with import PW
 from apps.tracker.crud.utils_data_init import (
     GAMES_LIST,
     MATCHES_STATS,
@@ -71,32 +81,45 @@ from apps.tracker.schemas.main import (
     YearWzTable,
     TaskStatus,
     TargetType,
+    FullmatchData,
+    MatchesSource,
+    PlatformAffinity,
 )
 
 
 def search_uno_tags(db: Session, uno: str, column: Literal['username', 'clantag']):
+    return unos_tags_search(db, [uno], column)[uno]
+
+
+def unos_tags_search(
+    db: Session, unos: list[str], column: Literal['username', 'clantag']
+) -> dict[str, list[str]]:
+    '''Tags of every uno from all tables, latest first, with one query'''
+    tags: dict[str, list[str]] = {uno: [] for uno in unos}
+    if not unos:
+        return tags
+
     game_tables = STT.get_tables(C.ALL, C.ALL, C.ALL)
     selects = [
-        select(t.table.uno, t.table.time, t.table.__dict__[column]) for t in game_tables
+        select(t.table.uno, t.table.time, t.table.__dict__[column]).where(
+            t.table.uno.in_(unos)
+        )
+        for t in game_tables
     ]
     all_entries = union_all(*selects).cte(name='all_entries')
     entry_column = all_entries.c.get(column)
-    subq = (
-        select(
-            entry_column,
-            func.max(all_entries.c.time).label('latest_time'),
-        )
-        .filter(
-            all_entries.c.uno == uno,
-            entry_column.isnot(None),
-        )
-        .group_by(entry_column)
-        .subquery()
+    latest_time = func.max(all_entries.c.time)
+    query = (
+        select(all_entries.c.uno, entry_column)
+        .filter(entry_column.isnot(None))
+        .group_by(all_entries.c.uno, entry_column)
+        .order_by(all_entries.c.uno, latest_time.desc())
     )
-    query = select(subq.c.get(column)).order_by(subq.c.latest_time.desc())
-    result = db.execute(query)
 
-    return [row[0] for row in result]
+    for uno, tag in db.execute(query):
+        tags[uno].append(tag)
+
+    return tags
 
 
 def most_common_uno_game_mode_get(db: Session, game_mode: GameMode):
@@ -113,14 +136,17 @@ def most_common_uno_game_mode_get(db: Session, game_mode: GameMode):
         # .order_by(desc(text(C.COUNT)))
         .limit(1000)
     )
-    query_result = db.execute(query)
+    query_result = db.execute(query).all()
 
+    unos = [row.uno for row in query_result]
+    usernames = unos_tags_search(db, unos, C.USERNAME)
+    clantags = unos_tags_search(db, unos, C.CLANTAG)
     most_common_uno_game_mode: dict[str, MostCommonUnoData] = {
         row.uno: {
             C.UNO: row.uno,
             C.COUNT: row.count,
-            C.USERNAME: search_uno_tags(db, row.uno, C.USERNAME),
-            C.CLANTAG: search_uno_tags(db, row.uno, C.CLANTAG),
+            C.USERNAME: usernames[row.uno],
+            C.CLANTAG: clantags[row.uno],
         }
         for row in query_result
     }
@@ -134,20 +160,25 @@ def most_common_uno_game_mode_get(db: Session, game_mode: GameMode):
             STT.players.username,
             STT.players.clantag,
         )
-        .filter(STT.players.group != None)
+        .filter(
+            STT.players.group != None,
+            STT.players.uno.not_in(list(most_common_uno_game_mode)),
+        )
         .all()
     )
+    registered_count: dict[str, int] = dict(
+        db.execute(
+            select(all_entries.c.uno, func.count())
+            .where(all_entries.c.uno.in_([player.uno for player in players_with_group]))
+            .group_by(all_entries.c.uno)
+        ).all()
+    )
 
     for player in players_with_group:
-        if player.uno in most_common_uno_game_mode:
-            continue
-
         most_common_uno_game_mode[player.uno] = {
             C.UNO: player.uno,
             C.GROUP: player.group,
-            C.COUNT: db.query(all_entries)
-            .filter(all_entries.c.uno == player.uno)
-            .count(),
+            C.COUNT: registered_count.get(player.uno, 0),
             C.USERNAME: player.username,
             C.CLANTAG: player.clantag,
         }
@@ -188,8 +219,7 @@ def most_play_with_update(db: Session):
     }
 
     uno_tags: dict[str, dict[Literal['username', 'clantag'], str]] = {}
-    groups: dict[str, dict[GameModeMw, Counter[str, int]]] = {}
-    groups_match_counted: dict[str, set[str]] = {}
+    player_to_group: dict[str, str] = {}
     players: dict[
         str,
         dict[Literal['most_play_with'], MostPlayWith]
@@ -216,116 +246,49 @@ def most_play_with_update(db: Session):
             ),
         }
 
-        if (group := most_common_uno.get(C.GROUP)) and group not in groups:
-            groups[group] = {C.MW_MP: Counter(), C.MW_WZ: Counter()}
-            groups_match_counted[group] = set()
+        if group := most_common_uno.get(C.GROUP):
+            player_to_group[most_common_uno[C.UNO]] = group
+
+    unos = list(players)
+    groups: dict[str, dict[GameModeMw, Counter[str]]] = {
+        group: {} for group in player_to_group.values()
+    }
 
     for game_mode, (game, mode) in SGM.modes(C.MW, C.ALL).items():
+        start = time.perf_counter()
         game_tables = STT.get_tables(game, mode, C.ALL)
 
-        selects = [select(t.table.uno, t.table.matchID) for t in game_tables]
-        all_entries = union_all(*selects).cte(name='all_entries')
-
-        # store for all matches game_mode
-        all_matches: dict[str, list[str]] = {}
-
-        def find_uno_tag(uno: str):
-            if uno in uno_tags:
-                return uno_tags[uno]
-
-            for t in game_tables:
-                find = (
-                    db.query(t.table.username, t.table.clantag)
-                    .filter(t.table.uno == uno, t.table.username != None)
-                    .first()
-                )
-                if find:
-                    uno_tags[uno] = {
-                        C.USERNAME: find.username,
-                        C.CLANTAG: find.clantag or '',
-                    }
-                    break
-
-            if uno not in uno_tags:
-                uno_tags[uno] = {
-                    C.USERNAME: 'unknown',
-                    C.CLANTAG: '',
-                }
-
-            return uno_tags[uno]
-
-        for index, most_common_uno in enumerate(most_common_uno_all, 1):
+        matches_count = CO.matches_count(db, game_tables, unos)
+        players_top = CO.players_top(db, game_tables, unos, TOP_LIMIT, 2)
+        for group, counter in CO.groups_count(db, game_tables, player_to_group).items():
+            groups[group][game_mode] = counter
 
-            uno: str = most_common_uno[C.UNO]
-            group: str | None = most_common_uno.get(C.GROUP)
-
-            player_matches_count = Counter()
-            result = db.execute(
-                select(all_entries.c.matchID).where(all_entries.c.uno == uno)
-            )
-            player_matches_list = [row.matchID for row in result]
+        # players without username in game mode tables stay unknown
+        missing = {uno for top in players_top.values() for uno, _ in top}
+        missing -= uno_tags.keys()
+        uno_tags |= CO.tags_get(db, game_tables, missing)
+        for uno in missing - uno_tags.keys():
+            uno_tags[uno] = {C.USERNAME: 'unknown', C.CLANTAG: ''}
 
-            players[uno][C.FULLMATCHES][game_mode] = len(player_matches_list)
+        for uno in unos:
+            players[uno][C.FULLMATCHES][game_mode] = matches_count.get(uno, 0)
             most_play_with[game_mode].append(
-                {
-                    C.UNO: uno,
-                    C.COUNT: len(player_matches_list),
-                }
-                | find_uno_tag(uno)
+                {C.UNO: uno, C.COUNT: matches_count.get(uno, 0)} | uno_tags[uno]
             )
+            players[uno][C.MOST_PLAY_WITH][game_mode] = [
+                {C.UNO: match_uno, C.COUNT: count} | uno_tags[match_uno]
+                for match_uno, count in players_top[uno]
+            ]
 
-            for matchID in player_matches_list:
-
-                if matchID not in all_matches:
-                    result = db.execute(
-                        select(all_entries.c.uno).where(
-                            all_entries.c.matchID == matchID
-                        )
-                    )
-                    match_unos = [row.uno for row in result]
-
-                    # check on doubles in a match
-                    unic_unos = set(match_unos)
-                    if len(unic_unos) != len(match_unos):
-                        # clear_fullmatches_doubles(db, matchID, game_mode) TODO
-                        all_matches[matchID] = list(unic_unos)
-                    else:
-                        all_matches[matchID] = match_unos
-
-                is_need_match_group_count = (
-                    group != None and matchID not in groups_match_counted[group]
-                )
-
-                for match_uno in all_matches[matchID]:
-                    # count all players in a match that play with this uno
-                    if match_uno != uno:
-                        player_matches_count[match_uno] += 1
-
-                        if is_need_match_group_count:
-                            groups[group][game_mode][match_uno] += 1
-
-                if is_need_match_group_count:
-                    groups_match_counted[group].add(matchID)
-
-            player_matches_count_top = sorted(
-                [i for i in player_matches_count.items() if i[1] > 2],
-                key=lambda x: x[1],
-                reverse=True,
-            )[:TOP_LIMIT]
-
-            for match_uno, count in player_matches_count_top:
-
-                players[uno][C.MOST_PLAY_WITH][game_mode].append(
-                    {
-                        C.UNO: match_uno,
-                        C.COUNT: count,
-                    }
-                    | find_uno_tag(match_uno)
-                )
+        print(most_play_with_update.__name__, game_mode, time_taken_get(start))
 
-            if (index % 50) == 0:
-                current_percent = int(index / len(most_common_uno_all) * 100)
-                print(most_play_with_update.__name__, game_mode, f'{current_percent}%')
+    saved_players = {
+        player.uno: player
+        for player in db.query(STT.players.id, STT.players.uno, STT.players.games)
+        .filter(STT.players.uno.in_(unos))
+        .all()
+    }
+    players_update: list[dict] = []
 
     for most_common_uno in most_common_uno_all:
         uno: str = most_common_uno[C.UNO]
@@ -352,22 +315,24 @@ def most_play_with_update(db: Session):
             reverse=True,
         )[:TOP_LIMIT]
 
-        if games := player_get(db, uno, C.GAMES, most_play_with_update.__name__):
+        saved_player = saved_players.get(uno)
+        if saved_player and (games := saved_player.games):
             games[C.MW_MP][C.MATCHES][C.STATS][C.FULLMATCHES] = players[uno][
                 C.FULLMATCHES
             ][C.MW_MP]
             games[C.MW_WZ][C.MATCHES][C.STATS][C.FULLMATCHES] = players[uno][
                 C.FULLMATCHES
             ][C.MW_WZ]
-            player_get(db, uno, C.RAW, most_play_with_update.__name__).update(
+            players_update.append(
                 {
-                    STT.players.username: most_common_uno[C.USERNAME],
-                    STT.players.clantag: most_common_uno[C.CLANTAG],
-                    STT.players.games: games,
-                    STT.players.most_play_with: players[uno][C.MOST_PLAY_WITH],
+                    'b_id': saved_player.id,
+                    'b_username': most_common_uno[C.USERNAME],
+                    'b_clantag': most_common_uno[C.CLANTAG],
+                    'b_games': games,
+                    'b_most_play_with': players[uno][C.MOST_PLAY_WITH],
                 }
             )
-        else:
+        elif saved_player is None:
             save_player = STT.players(
                 uno=uno,
                 username=most_common_uno[C.USERNAME],
@@ -397,46 +362,66 @@ def most_play_with_update(db: Session):
                 most_play_with=players[uno][C.MOST_PLAY_WITH],
             )
             db.add(save_player)
-        db.commit()
+
+    if players_update:
+        table = STT.players.__table__
+        db.execute(
+            update(table)
+            .where(table.c.id == bindparam('b_id'))
+            .values(
+                username=bindparam('b_username'),
+                clantag=bindparam('b_clantag'),
+                games=bindparam('b_games'),
+                most_play_with=bindparam('b_most_play_with'),
+            ),
+            players_update,
+        )
+    db.commit()
 
     # =================== formating most_play_with for groups ===================
-    def format_most_play_with_data(data: Counter[str, int]):
-        most_play_with_data: list[MostPlayWithData] = []
-        group_matches_count_top = sorted(
+    def top_get(data: Counter[str]) -> list[tuple[str, int]]:
+        return sorted(
             [i for i in data.items() if i[1] > 2],
             key=lambda x: x[1],
             reverse=True,
         )[:TOP_LIMIT]
 
-        for uno, count in group_matches_count_top:
-            clantag = search_uno_tags(db, uno, C.CLANTAG)
-            most_play_with_data.append(
-                {
-                    C.UNO: uno,
-                    C.COUNT: count,
-                    C.USERNAME: search_uno_tags(db, uno, C.USERNAME)[0],
-                    C.CLANTAG: clantag[0] if clantag else '',
-                }
-            )
-
-        return most_play_with_data
-
+    groups_top: dict[str, dict[GameMode, list[tuple[str, int]]]] = {}
     for group_uno, data in groups.items():
         summary_all = Counter()
         for game_mode in SGM.modes(C.MW, C.ALL):
             for player_uno, count in data[game_mode].items():
                 summary_all[player_uno] += count
 
-        most_play_with: MostPlayWith = {
-            C.ALL: format_most_play_with_data(summary_all),
-            C.MW_MP: format_most_play_with_data(data[C.MW_MP]),
-            C.MW_WZ: format_most_play_with_data(data[C.MW_WZ]),
-            C.TIME: time_now,
+        groups_top[group_uno] = {
+            C.ALL: top_get(summary_all),
+            C.MW_MP: top_get(data[C.MW_MP]),
+            C.MW_WZ: top_get(data[C.MW_WZ]),
+        }
+
+    missing = {
+        uno
+        for group_top in groups_top.values()
+        for top in group_top.values()
+        for uno, _ in top
+        if uno not in uno_tags
+    }
+    uno_tags |= CO.tags_get(db, STT.get_tables(C.MW, C.ALL, C.ALL), missing)
+
+    for group_uno, group_top in groups_top.items():
+        group_most_play_with: MostPlayWith = {
+            game_mode: [
+                {C.UNO: uno, C.COUNT: count}
+                | uno_tags.get(uno, {C.USERNAME: 'unknown', C.CLANTAG: ''})
+                for uno, count in top
+            ]
+            for game_mode, top in group_top.items()
         }
+        group_most_play_with[C.TIME] = time_now
         redis_manage(
             f'{C.GROUP}:{C.UNO}_{group_uno}',
             'hset',
-            {C.MOST_PLAY_WITH: most_play_with},
+            {C.MOST_PLAY_WITH: group_most_play_with},
         )
     # =================== formating most_play_with for groups ===================
 
@@ -1262,6 +1247,11 @@ def make_break(
     source: str,
     minutes: int | None = None,
 ):
+    '''
+    Disable fetching when `minutes` is None,
+    otherwise drain shared rate limit budget for `minutes`,
+    next requests of every process wait for refill instead of sleep here
+    '''
     if minutes is None:
         message = f'fetch {C.DATA} {C.DISABLED} {source=}'
     else:
@@ -1278,22 +1268,127 @@ def make_break(
         redis_manage(C.STATUS, 'set', C.INACTIVE)
         return
 
-    redis_manage(C.STATUS, 'set', 'break')
+    RATE_LIMIT.penalty(get_delay(minutes, 'minutes', True))
 
-    task: Task | None = redis_manage(C.TASK_QUEUES, 'lindex')
-    if task is None or task[C.STATUS] != STask.RUNNING:
-        time.sleep(get_delay(minutes, 'minutes', True))
-        redis_manage(C.STATUS, 'set', C.ACTIVE)
-        return
 
-    task[C.STATUS] = STask.PAUSE
-    redis_manage(C.TASK_QUEUES, 'lset', task)
+def fullmatches_exist_get(
+    db: Session, pars_list: list[FullmatchData], game_mode: GameMode
+) -> dict[MatchesSource, set[str]]:
+    '''Which matchIDs already saved, one query for each year tables'''
+    exist: dict[MatchesSource, set[str]] = {C.MAIN: set(), C.BASIC: set()}
+    years: dict[YearWzTable, list[str]] = {}
+    for match in pars_list:
+        years.setdefault(match[C.YEAR], []).append(match[C.MATCHID])
 
-    time.sleep(get_delay(minutes, 'minutes', True))
-    redis_manage(C.STATUS, 'set', C.ACTIVE)
+    for year, match_ids in years.items():
+        table_main = STT.get_table(game_mode, C.MAIN, year)
+        table_basic = STT.get_table(game_mode, C.BASIC, year)
+        if table_main is None or table_basic is None:
+            continue
+        table_main, table_basic = table_main.name, table_basic.name
+        rows = db.execute(
+            text(
+                f'''
+SELECT DISTINCT "matchID", '{C.MAIN}' AS source FROM {table_main}
+WHERE "matchID" = ANY(:match_ids)
+UNION ALL
+SELECT DISTINCT "matchID", '{C.BASIC}' AS source FROM {table_basic}
+WHERE "matchID" = ANY(:match_ids)
+'''
+            ),
+            {'match_ids': match_ids},
+        )
+        for row in rows:
+            exist[row.source].add(row.matchID)
+
+    return exist
+
+
+def players_usernames_get(unos: list[str]) -> dict[str, str | None]:
+    '''Last username of players with one redis round trip'''
+    unos = list(dict.fromkeys(unos))
+    if not unos:
+        return {}
+
+    conn = redis.Redis(connection_pool=settings.REDIS_CONNECTION_POOL)
+    pipe = conn.pipeline(transaction=False)
+    for uno in unos:
+        pipe.hget(f'{C.PLAYER}:{C.UNO}_{uno}', C.USERNAME)
+    usernames = {}
+    for uno, username in zip(unos, pipe.execute()):
+        username: list[str] | None = redis_value_get(username)
+        usernames[uno] = username[0] if username else None
+    conn.close()
+
+    return usernames
+
+
+def platform_affinity_get(
+    db: Session, unos: list[str], game_mode: GameMode
+) -> dict[str, PlatformAffinity]:
+    '''Platform that last answered for players, missing in redis loaded from db'''
+    if not unos:
+        return {}
+    fields = [f'{uno}_{game_mode}' for uno in unos]
+    cached = redis_manage('platform_affinity', 'hmget', fields)
+    affinities = {
+        uno: affinity for uno, affinity in zip(unos, cached) if affinity is not None
+    }
 
-    task[C.STATUS] = STask.RUNNING
-    redis_manage(C.TASK_QUEUES, 'lset', task)
+    missing = [uno for uno in unos if uno not in affinities]
+    if missing:
+        rows = db.execute(
+            text(
+                '''
+SELECT uno, data -> 'platform_affinity' -> :game_mode AS affinity
+FROM cod_players WHERE uno = ANY(:unos)
+'''
+            ),
+            {C.GAME_MODE: game_mode, 'unos': missing},
+        )
+        for row in rows:
+            # empty dict saved for players without affinity
+            affinities[row.uno] = row.affinity or {}
+            redis_manage(
+                'platform_affinity',
+                'hset',
+                {f'{row.uno}_{game_mode}': affinities[row.uno]},
+            )
+
+    return {uno: affinity for uno, affinity in affinities.items() if affinity}
+
+
+def platform_affinities_set(
+    db: Session,
+    game_mode: GameMode,
+    affinities: dict[str, PlatformAffinity | None],
+):
+    '''Save changed affinities of players in one update, commit left to caller'''
+    if not affinities:
+        return
+
+    affinities = {uno: affinity or {} for uno, affinity in affinities.items()}
+    redis_manage(
+        'platform_affinity',
+        'hset',
+        {f'{uno}_{game_mode}': affinity for uno, affinity in affinities.items()},
+    )
+    db.execute(
+        text(
+            '''
+UPDATE cod_players SET data = data || jsonb_build_object(
+    'platform_affinity',
+    COALESCE(data -> 'platform_affinity', '{}'::jsonb)
+    || jsonb_build_object(CAST(:game_mode AS text), CAST(:affinity AS jsonb))
+)
+WHERE uno = :uno
+'''
+        ),
+        [
+            {C.GAME_MODE: game_mode, 'affinity': json.dumps(affinity), C.UNO: uno}
+            for uno, affinity in affinities.items()
+        ],
+    )
 
 
 @log_time_wrap
@@ -1302,61 +1397,174 @@ def fullmatches_basic_load_from_csv(
     game_mode: GameMode,
     year: YearWzTable,
     path: str,
+    staged=False,
 ):
-    table_main = STT.get_table(game_mode, C.MAIN, year).table
-    table_basic = STT.get_table(game_mode, C.BASIC, year).table
+    if staged:
+        return fullmatches_basic_load_from_csv_staged(db, game_mode, year, path)
 
-    already_exist = (
-        db.query(table_basic.matchID.distinct(), table_basic.matchID)
-        .union(db.query(table_main.matchID.distinct(), table_main.matchID))
-        .all()
-    )
-    already_exist = tuple(match.matchID for match in already_exist)
-
-    print(
-        f'collected exist {C.MATCHES} [{len(already_exist)}] from',
-        f'table {C.MAIN} {table_main.__tablename__}',
-        f'table {C.BASIC} {table_basic.__tablename__}',
-        sep='\n',
-    )
+    table_basic = STT.get_table(game_mode, C.BASIC, year).table
 
     STEP = 10_000
-    matches_not_saved = 0
+    matches_saved = 0
     current_line = 0
-    current_step = 0
+    # matchIDs saved by this load, players rows of match can be in next step
+    saved_match_ids: set[str] = set()
+    # logged for play with after load, so match is not split between steps
+    matches_unos: dict[str, set[str]] = {}
+
+    def save_step(step: list[dict]):
+        exist = fullmatches_exist_get(
+            db,
+            [{C.MATCHID: match[C.MATCHID], C.YEAR: year} for match in step],
+            game_mode,
+        )
+        exist = (exist[C.MAIN] | exist[C.BASIC]) - saved_match_ids
+
+        saved = 0
+        for match in step:
+            if match[C.MATCHID] in exist:
+                continue
+            match_row = table_basic()
+            match_row.__dict__.update(match)
+            db.add(match_row)
+            saved_match_ids.add(match[C.MATCHID])
+            saved += 1
+        MI.put(
+            db,
+            game_mode,
+            C.BASIC,
+            {match[C.MATCHID]: year for match in step if match[C.MATCHID] not in exist},
+        )
+        db.commit()
+
+        for match in step:
+            if match[C.MATCHID] not in exist and match.get(C.UNO):
+                matches_unos.setdefault(match[C.MATCHID], set()).add(match[C.UNO])
+
+        return saved
 
     pure_path = f'{path}/cod_{C.FULLMATCHES}_{game_mode}_{year}.csv'
     with open(pure_path, 'r', encoding='utf8') as file:
         matches = csv.DictReader(file)
+        step: list[dict] = []
 
-        for current_line, match in enumerate(matches):
-            if current_line >= current_step + STEP:
-                db.commit()
-                current_step = current_line
-                print(f'{current_step=} saved {current_step - matches_not_saved}')
+        for current_line, match in enumerate(matches, 1):
+            del match[C.ID]
+            step.append({k: v for k, v in match.items() if v})
 
-            if match[C.MATCHID] in already_exist:
-                continue
+            if len(step) >= STEP:
+                matches_saved += save_step(step)
+                step = []
+                print(f'{current_line=} saved {matches_saved}')
 
-            del match[C.ID]
-            match = {k: v for k, v in match.items() if v}
-            match_row = table_basic()
-            match_row.__dict__.update(match)
-            db.add(match_row)
+        if step:
+            matches_saved += save_step(step)
+
+    PW.delta_add(game_mode, matches_unos)
+    print(f'{current_line=} saved {matches_saved}')
 
-            # try:
-            #     db.commit()
-            # except Exception as e:
-            #     matches_not_saved += 1
-            #     in_logs(
-            #         fullmatches_basic_load_from_csv.__name__,
-            #         f'{type(e).__name__} {current_line}',
-            #         'cod_logs_error',
-            #         {
-            #             'trace': traceback.format_exc(),
-            #             C.MATCH: match,
-            #         },
-            #     )
+
+def fullmatches_basic_load_from_csv_staged(
+    db: Session,
+    game_mode: GameMode,
+    year: YearWzTable,
+    path: str,
+):
+    '''
+    `COPY` csv by chunks into unlogged staging table,
+    then move rows with matchID absent in main and basic tables
+    with one anti-join `INSERT ... SELECT`
+    '''
+    STEP = 100_000
+    table_basic = STT.get_table(game_mode, C.BASIC, year)
+    table_main = STT.get_table(game_mode, C.MAIN, year)
+    staging = f'{table_basic.name}_staging'
+    start = time.perf_counter()
+
+    pure_path = f'{path}/cod_{C.FULLMATCHES}_{game_mode}_{year}.csv'
+    with open(pure_path, 'r', encoding='utf8') as file:
+        reader = csv.reader(file)
+        header = next(reader)
+        # CREATE TABLE AS keep only names and types, without not null
+        db.execute(text(f'DROP TABLE IF EXISTS {staging}'))
+        db.execute(
+            text(
+                f'''CREATE UNLOGGED TABLE {staging} AS \
+SELECT * FROM {table_basic.name} WITH NO DATA'''
+            )
+        )
+        db.commit()
+
+        columns_sql = ', '.join(f'"{column}"' for column in header)
+        copy_sql = f'COPY {staging} ({columns_sql}) FROM STDIN WITH (FORMAT csv)'
+        cursor = db.connection().connection.cursor()
+        current_line = 0
+
+        while True:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            step = 0
+            for row in reader:
+                writer.writerow(row)
+                step += 1
+                if step >= STEP:
+                    break
+            if not step:
+                break
+
+            buffer.seek(0)
+            cursor.copy_expert(copy_sql, buffer)
+            db.commit()
+            current_line += step
+            seconds = time.perf_counter() - start
+            print(f'{current_line=} staged {int(current_line / seconds)} rows/s')
+
+        cursor.close()
+
+    table_columns = table_basic.table.__table__.columns
+    insert_columns: list[str] = []
+    select_columns: list[str] = []
+    for column in header:
+        if column not in table_columns or table_columns[column].primary_key:
+            continue
+        insert_columns.append(f'"{column}"')
+        select_columns.append(
+            fullmatches_staged_column_get(table_columns[column], f's."{column}"')
+        )
+
+    exist_in_main = ''
+    if table_main is not None:
+        exist_in_main = f'''AND NOT EXISTS (
+SELECT 1 FROM {table_main.name} m WHERE m."matchID" = s."matchID")'''
+
+    matches_saved = db.execute(
+        text(
+            f'''INSERT INTO {table_basic.name} ({', '.join(insert_columns)})
+SELECT {', '.join(select_columns)} FROM {staging} s
+WHERE NOT EXISTS (
+SELECT 1 FROM {table_basic.name} b WHERE b."matchID" = s."matchID")
+{exist_in_main}'''
+        )
+    ).rowcount
+    # matchIDs indexed in main keep their location
+    # matches not logged for play with, 'play_with' reset counts them
+    MI.table_sync(db, table_basic, staging)
+    db.execute(text(f'DROP TABLE {staging}'))
+    db.commit()
+
+    print(f'{current_line=} saved {matches_saved} [{time_taken_get(start)}]')
+
+
+def fullmatches_staged_column_get(column, value: str):
+    '''Staging value or server default, same as missing key in orm insert'''
+    default = column.server_default
+    if default is None:
+        return value
+    if isinstance(default.arg, str):
+        default_sql = "'" + default.arg.replace("'", "''") + "'"
+    else:
+        default_sql = str(default.arg.compile(dialect=postgresql.dialect()))
+    return f'COALESCE({value}, {default_sql})'
 
 
 def is_best_record(stat_name: str):
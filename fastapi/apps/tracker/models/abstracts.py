@@ -6,6 +6,7 @@ from sqlalchemy import (
     Integer,
     BigInteger,
     String,
+    LargeBinary,
 )
 from sqlalchemy.sql import func
 
@@ -92,6 +93,7 @@ class basic_mw(matches_basic):
 
     damageTaken = Column(BigInteger)
     loadout = Column(String)
+    loadout_bin = Column(LargeBinary)
 
     objectiveMedalScoreKillSsAssaultDrone = Column(SmallInteger)
     objectiveMedalScoreKillSsManualTurret = Column(SmallInteger)
@@ -144,6 +146,7 @@ class matches_mw_mp(basic_mw):
     team1Score = Column(SmallInteger)
     team2Score = Column(SmallInteger)
     weaponStats = Column(String)
+    weaponStats_bin = Column(LargeBinary)
 
     objectiveBrDoomstationActivation = Column(SmallInteger)
     objectiveBrDoomstationSuccess = Column(SmallInteger)
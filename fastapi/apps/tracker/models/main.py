@@ -1,4 +1,14 @@
-from sqlalchemy import Column, TIMESTAMP, Integer, String, Text, JSON
+from sqlalchemy import (
+    Column,
+    TIMESTAMP,
+    Boolean,
+    Date,
+    Integer,
+    String,
+    Text,
+    JSON,
+    LargeBinary,
+)
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 
@@ -134,3 +144,43 @@ class cod_fullmatches_basic_mw_wz_2022(fullmatches_mw_wz_basic): ...
 
 
 class cod_fullmatches_basic_mw_wz_2023(fullmatches_mw_wz_basic): ...
+
+
+class cod_fullmatches_index(Base):
+    '''Fullmatches table of each matchID'''
+
+    matchID = Column(String(settings.NAME_LIMIT_2), primary_key=True)
+    game_mode = Column(String(settings.NAME_LIMIT), primary_key=True)
+    source = Column(String(settings.NAME_LIMIT), nullable=False)
+    year = Column(String(4))
+    summary = Column(LargeBinary)
+    play_with = Column(Boolean, nullable=False, server_default='false')
+
+
+class cod_matches_daily(Base):
+    '''Matches count of player by day'''
+
+    date = Column(Date, primary_key=True)
+    uno = Column(String(settings.NAME_LIMIT_2), primary_key=True)
+    game_mode = Column(String(settings.NAME_LIMIT), primary_key=True)
+    count = Column(Integer, nullable=False, server_default='0')
+
+
+class cod_play_with(Base):
+    '''Matches count of saved player or group played with other uno'''
+
+    target_type = Column(String(settings.NAME_LIMIT), primary_key=True)
+    uno = Column(String(settings.NAME_LIMIT_2), primary_key=True)
+    game_mode = Column(String(settings.NAME_LIMIT), primary_key=True)
+    other_uno = Column(String(settings.NAME_LIMIT_2), primary_key=True)
+    count = Column(Integer, nullable=False, server_default='0')
+
+
+class cod_loadout_counts(Base):
+    '''Matches count of player by (Primary + Secondary) weapon labels indexes'''
+
+    uno = Column(String(settings.NAME_LIMIT_2), primary_key=True)
+    game_mode = Column(String(settings.NAME_LIMIT), primary_key=True)
+    primary_weapon = Column(String(settings.NAME_LIMIT), primary_key=True)
+    secondary_weapon = Column(String(settings.NAME_LIMIT), primary_key=True)
+    count = Column(Integer, nullable=False, server_default='0')
@@ -13,6 +13,7 @@ from apps.tracker.schemas.main import (
     Router,
     MatchBody,
     MatchData,
+    MatchJob,
     PlayerAdd,
     PlayerSearch,
     SearchResp,
@@ -33,11 +34,18 @@ def matches_router(body: Router, db: Session = Depends(get_db)):
     return tracker.matches_router(db, body)
 
 
-@router.get('/match/{matchID}/{game_mode}', response_model=MatchData | Error)
+@router.get(
+    '/match/{matchID}/{game_mode}', response_model=MatchData | MatchJob | Error
+)
 def match_get(matchID: str, game_mode: GameMode, db: Session = Depends(get_db)):
     return tracker.match_get(db, matchID, game_mode)
 
 
+@router.get('/match_job/{job_id}', response_model=MatchJob | Error)
+async def match_job_get(job_id: str, wait: int = 0):
+    return await tracker.match_job_get(job_id, wait)
+
+
 @router.post('/match_stats', response_model=MatchStatsPlayer | Error)
 def match_stats_get(body: MatchBody, db: Session = Depends(get_db)):
     return tracker.match_stats_get(db, body)
@@ -64,6 +64,8 @@ DataType = DataTypeOnly | Literal['fullmatches', 'search', 'fullmatches_pars']
 TargetType = Literal['player', 'group']
 
 GameDataSlugs = tuple[str, GameMode, DataType, PlatformOnly, int]
+# playerStats key -> table column
+FormatPlan = tuple[tuple[str, str], ...]
 RouterOrder = (
     GameBasicColumn
     | Literal[
@@ -89,6 +91,8 @@ ResetType = Literal[
     'users',
     'loadout',
     'chart',
+    'chart_rollup',
+    'play_with',
     'matches_stats',
     'task_queues',
     'base_stats',
@@ -100,6 +104,7 @@ ResetType = Literal[
     'status',
     'matches',
     'monitor',
+    'rate_limit',
     'reboot',
     'shutdown',
 ]
@@ -234,6 +239,8 @@ class Router(BaseModel):
     order: RouterOrder
     page: int
     date: str
+    # last row of previous page, used instead of page offset
+    cursor: str = ''
 
     @field_validator(C.DATE)
     def validate_date(cls, value: str):
@@ -345,6 +352,7 @@ class MatchesData(BaseModel):
 class MatchesResponse(BaseModel):
     matches: list[MatchesData]
     found: int
+    cursor: str | None = None
 
 
 class UpdateResponse(BaseModel):
@@ -869,6 +877,17 @@ class AllPlayers(BaseModel):
     players: list[PlayerBasic]
 
 
+class PlatformData(BaseModel):
+    data: dict
+    player_tag: str | None = None
+    platform: PlatformOnly | None = None
+
+
+class PlatformAffinity(BaseModel):
+    platform: PlatformOnly
+    fails: int = 0
+
+
 class MatchPlayer(BaseModel):
     id: int
     uno: str
@@ -913,6 +932,35 @@ class MatchData(BaseModel):
     team: list[TeamData]
 
 
+MatchJobStatus = Literal['pending', 'running', 'completed', 'error', 'not found']
+
+
+class MatchJob(BaseModel):
+    id: str
+    matchID: str
+    game_mode: GameModeMw
+    year: str
+    status: MatchJobStatus
+    time: str
+    match: MatchData | None = None
+
+
+class PlayWithDelta(BaseModel):
+    game_mode: GameModeMw
+    matchID: str
+    unos: list[str]
+
+
+class MatchSummary(BaseModel):
+    map: str | None
+    mode: str | None
+    duration: str
+    time: str
+    source: MatchesSource
+    stats: dict[MatchColumn, int | float]
+    team: list[TeamData]
+
+
 class LogsTracker(BaseModel):
     target: str
     game_mode: GameMode
@@ -989,6 +1037,11 @@ class TableGameData(BaseModel):
     source: MatchesSource
 
 
+class ColumnPlan(BaseModel):
+    columns: tuple[str, ...]
+    defaults: tuple
+
+
 class UpdatePlayers(BaseModel):
     uno: str
     player: str
@@ -1066,9 +1119,25 @@ class PanelStatuses(BaseModel):
     store_data: bool
 
 
+class RateLimit(BaseModel):
+    tokens: float
+    capacity: int
+    refill_per_minute: int
+    wait: float
+
+
+class MatchesCacheStats(BaseModel):
+    hits: int
+    misses: int
+    hit_rate: float
+    ttl: int
+
+
 class Panel(BaseModel):
     time: str | None
     statuses: PanelStatuses
+    rate_limit: RateLimit
+    matches_cache: MatchesCacheStats
     pages: dict[str, int | None]
     task_queues: list[Task]
     update_players: list[UpdatePlayers]
@@ -2,6 +2,7 @@
 import time
 import copy
 import csv
+from collections import Counter
 from pathlib import Path
 import pytest
 
@@ -12,7 +13,7 @@ from core.config import settings
 from core.database import get_db
 
 from apps.base.tests.store import TS
-from apps.base.schemas.main import C, STaskStatus, Error
+from apps.base.schemas.main import C, STask, STaskStatus, Error
 from apps.base.crud.utils import (
     in_logs,
     now,
@@ -24,6 +25,9 @@ from apps.base.crud.utils import (
 from apps.tracker.crud.store_game_modes import SGM
 from apps.tracker.crud.store_tables import STT
 from apps.tracker.crud.get_game_data import GameData
+from apps.tracker.crud.match_formatter import MF
+from apps.tracker.crud.match_jobs import MJ
+from apps.tracker.crud.play_with import PW
 from apps.tracker.crud.utils_data_init import GAMES_LIST, MATCHES_STATS
 from apps.tracker.crud.main import (
     fullmatches_delete,
@@ -31,9 +35,13 @@ from apps.tracker.crud.main import (
     match_get,
     labels_delete_all,
     labels_post,
+    loadout_string_to_bin,
     player_delete,
     player_matches_delete,
     player_matches_update,
+    play_with_fold,
+    play_with_rebuild,
+    play_with_save,
     stats_add_summary_all_modes,
 )
 from apps.tracker.crud.utils import (
@@ -49,6 +57,7 @@ from apps.tracker.schemas.main import (
     FixtureMatches,
     FullmatchData,
     MatchData,
+    MatchJob,
     Player,
     SearchResp,
     PlayerSearch,
@@ -942,6 +951,110 @@ def test_match_get(f_matches: FixtureMatches):
         )
 
 
+def test_match_job():
+    game_mode = C.MW_MP
+    job_id = f'{game_mode}_{TS.NON_EXIST_ID}'
+
+    # non exist job
+    resp = TS.client.get(f'{TS.FASTAPI_API_PATH}/match_job/{job_id}')
+    TS.check_response(
+        resp,
+        status.HTTP_404_NOT_FOUND,
+        test_match_job.__name__,
+        (C.DETAIL, f'[{job_id}] {C.NOT_FOUND}'),
+    )
+
+    # job not pushed to queue, so monitor don't run it
+    job: MatchJob = {
+        C.ID: job_id,
+        C.MATCHID: str(TS.NON_EXIST_ID),
+        C.GAME_MODE: game_mode,
+        C.YEAR: '2020',
+        C.STATUS: STask.PENDING,
+        C.TIME: now(C.ISO),
+    }
+    MJ.conn.hset(MJ.key_get(job_id), mapping=job)
+    MJ.conn.expire(MJ.key_get(job_id), MJ.TTL)
+
+    # request held until wait passed
+    start = time.perf_counter()
+    resp = TS.client.get(f'{TS.FASTAPI_API_PATH}/match_job/{job_id}?wait=1')
+    TS.check_response(
+        resp, status.HTTP_200_OK, test_match_job.__name__, (C.STATUS, STask.PENDING)
+    )
+    assert time.perf_counter() - start >= 1
+
+    # finished job returned without wait
+    for job_status in MJ.FINISHED:
+        MJ.status_set(job_id, job_status)
+        start = time.perf_counter()
+        resp = TS.client.get(
+            f'{TS.FASTAPI_API_PATH}/match_job/{job_id}?wait={MJ.WAIT_LIMIT}'
+        )
+        TS.check_response(
+            resp, status.HTTP_200_OK, test_match_job.__name__, (C.STATUS, job_status)
+        )
+        assert time.perf_counter() - start < MJ.WAIT_LIMIT / 2
+
+    MJ.conn.delete(MJ.key_get(job_id))
+
+    # stored match without fullmatch starts job
+    with next(get_db()) as db:
+        table = STT.get_table(game_mode).table
+        index = STT.fullmatches_index
+        match = (
+            db.query(table.matchID)
+            .filter(
+                table.matchID.isnot(None),
+                table.matchID.not_in(
+                    db.query(index.matchID).filter(index.game_mode == game_mode)
+                ),
+            )
+            .first()
+        )
+    if match is None:
+        return
+
+    match_path = f'{TS.FASTAPI_API_PATH}/match/{match.matchID}/{game_mode}'
+    job_id = f'{game_mode}_{match.matchID}'
+
+    if settings.SESSION.cookies.get('ACT_SSO_COOKIE') is None:
+        resp = TS.client.get(match_path)
+        TS.check_response(
+            resp,
+            status.HTTP_404_NOT_FOUND,
+            test_match_job.__name__,
+            (C.DETAIL, f'{C.MATCHID} [{match.matchID}] {C.NOT_FOUND}'),
+        )
+        return
+
+    resp = TS.client.get(match_path)
+    TS.check_response(
+        resp,
+        (status.HTTP_200_OK, status.HTTP_202_ACCEPTED),
+        test_match_job.__name__,
+    )
+    if resp.status_code == status.HTTP_200_OK:
+        return  # match was not indexed, found in fullmatches tables
+    assert resp.json()[C.ID] == job_id
+
+    # failed job replaced by new one
+    for job_status in MJ.RETRY:
+        MJ.status_set(job_id, job_status)
+        resp = TS.client.get(match_path)
+        TS.check_response(
+            resp,
+            status.HTTP_202_ACCEPTED,
+            test_match_job.__name__,
+            (C.STATUS, STask.PENDING),
+        )
+
+    resp = TS.client.get(
+        f'{TS.FASTAPI_API_PATH}/match_job/{job_id}?wait={MJ.WAIT_LIMIT}'
+    )
+    TS.check_response(resp, status.HTTP_200_OK, test_match_job.__name__)
+
+
 def test_match_stats_get(f_matches: FixtureMatches):
     body: MatchBody = {
         C.GAME_MODE: C.MW_WZ,
@@ -977,6 +1090,31 @@ def test_match_stats_get(f_matches: FixtureMatches):
         )
 
 
+def test_loadouts_encode():
+    slots_count = len(MF.WEAPON_TYPES)
+    loadouts = (
+        ','.join(('1 2 3', '4 5', '6 7', '8', '9', '10')),
+        ','.join(('', '11') + ('',) * (slots_count - 2)),
+        ','.join(('70000',) + ('',) * (slots_count - 1)),
+    )
+    loadout = MF.SPLIT_ON_LOADOUTS.join(loadouts)
+    encoded = loadout_string_to_bin(loadout)
+
+    for binary in (encoded, memoryview(encoded)):
+        assert MF.loadout_slots(binary) == MF.loadout_slots(loadout)
+        assert MF.loadout_pairs(binary) == MF.loadout_pairs(loadout)
+        assert MF.loadout_pairs(binary) == [('1', '4'), ('', '11'), ('70000', '')]
+
+    # loadouts count kept when every slot empty
+    empty = MF.pack_loadouts([[[]] * slots_count] * 2)
+    assert MF.loadout_slots(empty) == [[['']] * slots_count] * 2
+    assert MF.loadout_pairs(empty) == [('', '')] * 2
+
+    # count header is one byte
+    many = MF.pack_loadouts([[[1]] * slots_count] * 300)
+    assert len(MF.loadout_pairs(many)) == MF.BIN_COUNT_LIMIT
+
+
 def test_clear_fullmatches_doubles(f_matches: FixtureMatches):
     body: ClearFullmatchDoublesBody = {
         C.GAME_MODE: C.MW_WZ,
@@ -1163,6 +1301,8 @@ def test_reset():
         C.MOST_PLAY_WITH,
         'matches_stats',
         'clear_players_match_doubles',
+        'chart_rollup',
+        'play_with',
     )
     resets += status_resets
 
@@ -1188,6 +1328,64 @@ def test_reset():
         )
 
 
+def test_play_with():
+    game_mode = C.MW_MP
+    other_uno = str(TS.NON_EXIST_ID)
+    count = 1_000_000  # enough to be first in top
+
+    with next(get_db()) as db:
+        if not PW.is_filled():
+            play_with_rebuild(db)
+
+        index = STT.fullmatches_index
+        player = db.query(STT.players.uno).first()
+        match = db.query(index.matchID).filter(index.game_mode == game_mode).first()
+        if player is None or match is None:
+            return
+
+        target = (C.PLAYER, player.uno)
+        counter_filter = (
+            PW.table.target_type == C.PLAYER,
+            PW.table.uno == player.uno,
+            PW.table.game_mode == game_mode,
+            PW.table.other_uno == other_uno,
+        )
+        db.query(PW.table).filter(*counter_filter).delete()
+        PW.counters_save(
+            db, game_mode, Counter({(C.PLAYER, player.uno, other_uno): count})
+        )
+        # match logged but not folded yet
+        db.query(index).filter(
+            index.game_mode == game_mode, index.matchID == match.matchID
+        ).update({index.play_with: False})
+        db.commit()
+
+        delta = {
+            C.GAME_MODE: game_mode,
+            C.MATCHID: match.matchID,
+            'unos': [player.uno, other_uno],
+        }
+
+        # same match logged again counted once
+        for _ in range(2):
+            play_with_fold(db, [delta])
+            assert db.query(PW.table.count).filter(*counter_filter).scalar() == (
+                count + 1
+            ), f'{test_play_with.__name__} {delta=} not counted once'
+
+            most_play_with = (
+                db.query(STT.players.most_play_with)
+                .filter(STT.players.uno == player.uno)
+                .scalar()
+            )
+            assert most_play_with[game_mode][0][C.UNO] == other_uno
+            assert most_play_with[game_mode][0][C.COUNT] == count + 1
+
+        db.query(PW.table).filter(*counter_filter).delete()
+        db.commit()
+        play_with_save(db, {target})
+
+
 def test_player_delete(f_players: FixturePlayers):
     uno = TS.NON_EXIST_ID
     # resp = TS.client.request(M.DELETE, f'{TS.FASTAPI_API_PATH}/players/{uno}')
@@ -58,6 +58,12 @@ class Settings(BaseSettings):
     PARS_PRE_LIMIT: int = int(os.getenv('PARS_PRE_LIMIT'))
     MATCHES_LIMIT: int = int(os.getenv('MATCHES_LIMIT'))
     PAGE_LIMIT: int = int(os.getenv('PAGE_LIMIT'))
+    MATCHES_CACHE_TTL: int = int(os.getenv('MATCHES_CACHE_TTL'))
+
+    FETCH_CONCURRENCY: int = int(os.getenv('FETCH_CONCURRENCY'))
+    FETCH_TIMEOUT: int = int(os.getenv('FETCH_TIMEOUT'))
+    RATE_LIMIT_CAPACITY: int = int(os.getenv('RATE_LIMIT_CAPACITY'))
+    RATE_LIMIT_PER_MINUTE: int = int(os.getenv('RATE_LIMIT_PER_MINUTE'))
 
     LOGS_GAMES_LIMIT: int = int(os.getenv('LOGS_GAMES_LIMIT'))
     LOGS_CACHE_LIMIT: int = int(os.getenv('LOGS_CACHE_LIMIT'))
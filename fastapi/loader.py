@@ -0,0 +1,81 @@
+'''
+Offline data tools, run from fastapi folder
+
+python loader.py game_data_pack [--remove]
+python loader.py fullmatches_load mw_wz [--workers 4]
+python loader.py fullmatches_basic_load mw_wz 2022 ../static/files [--staged]
+python loader.py loadout_bin_migrate
+python loader.py match_index_backfill
+'''
+
+import argparse
+
+from core.database import get_db
+
+from apps.tracker.crud.game_data_store import GDS
+from apps.tracker.crud.match_index import MI
+from apps.tracker.crud.main import fullmatches_load, loadout_bin_migrate
+from apps.tracker.crud.utils import fullmatches_basic_load_from_csv
+
+
+def parser_get():
+    parser = argparse.ArgumentParser(description='tracker data loader')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    game_data_pack = commands.add_parser(
+        'game_data_pack', help='pack game data files into segment store'
+    )
+    game_data_pack.add_argument(
+        '--remove', action='store_true', help='delete files after pack'
+    )
+
+    load = commands.add_parser(
+        'fullmatches_load', help='load fullmatches files into main tables'
+    )
+    load.add_argument('game_mode', choices=('mw_mp', 'mw_wz'))
+    load.add_argument('--workers', type=int, help='processes for files parsing')
+
+    basic_load = commands.add_parser(
+        'fullmatches_basic_load', help='load fullmatches basic table from csv'
+    )
+    basic_load.add_argument('game_mode', choices=('mw_mp', 'mw_wz'))
+    basic_load.add_argument('year')
+    basic_load.add_argument('path', help='folder with csv file')
+    basic_load.add_argument(
+        '--staged', action='store_true', help='import through staging table'
+    )
+
+    commands.add_parser(
+        'loadout_bin_migrate', help='convert string loadouts to binary columns'
+    )
+
+    commands.add_parser(
+        'match_index_backfill', help='index matchIDs of all fullmatches tables'
+    )
+
+    return parser
+
+
+if __name__ == '__main__':
+    args = parser_get().parse_args()
+
+    if args.command == 'game_data_pack':
+        GDS.pack(args.remove)
+
+    elif args.command == 'fullmatches_load':
+        with next(get_db()) as db:
+            fullmatches_load(db, args.game_mode, args.workers)
+
+    elif args.command == 'fullmatches_basic_load':
+        with next(get_db()) as db:
+            fullmatches_basic_load_from_csv(
+                db, args.game_mode, args.year, args.path, args.staged
+            )
+
+    elif args.command == 'loadout_bin_migrate':
+        with next(get_db()) as db:
+            loadout_bin_migrate(db)
+
+    elif args.command == 'match_index_backfill':
+        with next(get_db()) as db:
+            MI.backfill(db)
@@ -20,7 +20,16 @@ from apps.base.crud.utils import (
 )
 
 from apps.tracker.schemas.main import ResetType, SocketBody, Task
-from apps.tracker.crud.main import get_data_from_platforms, reset, task_start
+from apps.tracker.crud.main import (
+    get_data_from_platforms,
+    match_job_run,
+    play_with_fold,
+    play_with_groups_rebuild,
+    reset,
+    task_start,
+)
+from apps.tracker.crud.match_jobs import MJ
+from apps.tracker.crud.play_with import PW
 from apps.tracker.crud.utils import (
     add_to_task_queues,
     player_get,
@@ -34,6 +43,8 @@ class Monitor:
         self.time: str = now(C.ISO)
         self.on: bool = True
         self.proccess: threading.Thread | None = None
+        self.match_jobs: threading.Thread | None = None
+        self.play_with: threading.Thread | None = None
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
 
         self.AUTO_UPDATE_INTERVAL = settings.AUTO_UPDATE_INTERVAL_DAYS.total_seconds()
@@ -55,6 +66,10 @@ def shutdown_monitor(signum=0, frame=''):
         MONITOR.socket.close()
         if MONITOR.proccess:
             MONITOR.proccess.join()
+        if MONITOR.match_jobs:
+            MONITOR.match_jobs.join()
+        if MONITOR.play_with:
+            MONITOR.play_with.join()
     except Exception as e:
         message += f'\n{C.ERROR} [{e}] while shutdown'
 
@@ -113,6 +128,7 @@ def handle_client(client: socket.socket):
                                 value[C.GAME_MODE],
                                 value[C.DATA_TYPE],
                             )
+                            db.commit()
                             res = '1' if res[C.DATA] else ''
                     client.send(res.encode())
                 break
@@ -161,6 +177,73 @@ def monitor_tasks():
                 )
 
 
+def monitor_match_jobs():
+    '''Separate from task queues, so long player updates not delay match pages'''
+    while MONITOR.on:
+        job = MJ.pop(MONITOR.TASK_QUEUES_INTERVAL)
+        if job is None:
+            continue
+
+        with next(get_db()) as db:
+            try:
+                match_job_run(db, job)
+            except Exception as e:
+                settings.LOGGING.error(traceback.format_exc())
+                in_logs(
+                    C.MONITOR,
+                    f'{C.MONITOR} {match_job_run.__name__} {C.ERROR} [{e}]',
+                    'logs_error',
+                    {C.DETAIL: type(e).__name__, 'job': job},
+                )
+
+
+def monitor_play_with():
+    '''
+    Fold fullmatches logged by saving into play with counters,
+    count again groups with changed members
+    '''
+    while MONITOR.on:
+        if not PW.is_filled():
+            # most play with saved from counters only after `play_with` reset
+            time.sleep(MONITOR.TASK_QUEUES_INTERVAL)
+            continue
+
+        if groups := PW.groups_get():
+            with next(get_db()) as db:
+                try:
+                    play_with_groups_rebuild(db, groups)
+                    PW.groups_done(groups)
+                except Exception as e:
+                    settings.LOGGING.error(traceback.format_exc())
+                    in_logs(
+                        C.MONITOR,
+                        f'{C.MONITOR} {play_with_groups_rebuild.__name__} '
+                        f'{C.ERROR} [{e}]',
+                        'logs_error',
+                        {C.DETAIL: type(e).__name__, C.GROUP: sorted(groups)},
+                    )
+                    time.sleep(MONITOR.TASK_QUEUES_INTERVAL)
+
+        deltas = PW.deltas_pop(MONITOR.TASK_QUEUES_INTERVAL)
+        if not deltas:
+            continue
+
+        with next(get_db()) as db:
+            try:
+                play_with_fold(db, deltas)
+                PW.deltas_done()
+            except Exception as e:
+                settings.LOGGING.error(traceback.format_exc())
+                in_logs(
+                    C.MONITOR,
+                    f'{C.MONITOR} {play_with_fold.__name__} {C.ERROR} [{e}]',
+                    'logs_error',
+                    {C.DETAIL: type(e).__name__, C.MATCHES: len(deltas)},
+                )
+                # deltas left in processing list and folded again after break
+                time.sleep(MONITOR.TASK_QUEUES_INTERVAL)
+
+
 if __name__ == '__main__':
     # Add listen signals for properly shutdown monitor
     signal.signal(signal.SIGTERM, shutdown_monitor)
@@ -195,6 +278,10 @@ if __name__ == '__main__':
 
     MONITOR.proccess = threading.Thread(target=monitor_tasks)
     MONITOR.proccess.start()
+    MONITOR.match_jobs = threading.Thread(target=monitor_match_jobs)
+    MONITOR.match_jobs.start()
+    MONITOR.play_with = threading.Thread(target=monitor_play_with)
+    MONITOR.play_with.start()
 
     settings.LOGGING.warning(f'{C.MONITOR} started')
 
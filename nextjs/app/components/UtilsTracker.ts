@@ -1381,7 +1381,7 @@ export const in_logs_game_status = async (
 export const cache_matches_get = async (slug_router: Router) => {
     const router = RouterSchema.parse(slug_router)
     const uid: CacheMatchesUid = `${C.MATCHES}:${router.data_type}_${router.target}_${router.game_mode}`
-    const key: CacheKey = `${router.order}_${router.date}_${router.page}`
+    const key: CacheKey = `${router.order}_${router.date}_${router.page}_${router.cursor ?? ''}`
     return redis_manage(uid, 'hget', key)
 }
 
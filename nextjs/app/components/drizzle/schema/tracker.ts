@@ -1,8 +1,12 @@
 import {
     pgTable,
+    primaryKey,
     serial,
     varchar,
     timestamp,
+    date,
+    integer,
+    boolean,
     jsonb,
     json,
 } from 'drizzle-orm/pg-core'
@@ -22,6 +26,10 @@ import { Loadout } from '@/app/components/zod/Loadout'
 import { PlayerUno, GroupUno } from '@/app/components/zod/Uno'
 import { Task } from '@/app/components/zod/Task'
 import { LogsSearchData } from '@/app/components/zod/Logs'
+import { GameModeMw, GameModeOnly } from '@/app/components/zod/GameMode'
+import { MatchesSource } from '@/app/components/zod/MatchesSource'
+import { TargetType } from '@/app/components/zod/Main'
+import { YearWzTable } from '@/app/components/zod/Table'
 import {
     Player,
     PlayerActi,
@@ -253,3 +261,53 @@ export const cod_fullmatches_basic_mw_wz_2023 = pgTable(
         []
     )
 )
+
+export const cod_fullmatches_index = pgTable(
+    'cod_fullmatches_index',
+    {
+        matchID: varchar(C.MATCHID, { length: NAME_LIMIT_2 }).notNull(),
+        game_mode: varchar(C.GAME_MODE, { length: NAME_LIMIT }).$type<GameModeMw>().notNull(),
+        source: varchar(C.SOURCE, { length: NAME_LIMIT }).$type<MatchesSource>().notNull(),
+        year: varchar(C.YEAR, { length: 4 }).$type<YearWzTable | null>(),
+        summary: tracker_abstract.bytea('summary'),
+        play_with: boolean('play_with').notNull().default(false),
+    },
+    table => [primaryKey({ columns: [table.matchID, table.game_mode] })]
+)
+
+export const cod_matches_daily = pgTable(
+    'cod_matches_daily',
+    {
+        date: date(C.DATE).notNull(),
+        uno: varchar(C.UNO, { length: NAME_LIMIT_2 }).notNull(),
+        game_mode: varchar(C.GAME_MODE, { length: NAME_LIMIT }).$type<GameModeOnly>().notNull(),
+        count: integer('count').notNull().default(0),
+    },
+    table => [primaryKey({ columns: [table.date, table.uno, table.game_mode] })]
+)
+
+export const cod_play_with = pgTable(
+    'cod_play_with',
+    {
+        target_type: varchar('target_type', { length: NAME_LIMIT }).$type<TargetType>().notNull(),
+        uno: varchar(C.UNO, { length: NAME_LIMIT_2 }).notNull(),
+        game_mode: varchar(C.GAME_MODE, { length: NAME_LIMIT }).$type<GameModeMw>().notNull(),
+        other_uno: varchar('other_uno', { length: NAME_LIMIT_2 }).notNull(),
+        count: integer('count').notNull().default(0),
+    },
+    table => [primaryKey({ columns: [table.target_type, table.uno, table.game_mode, table.other_uno] })]
+)
+
+export const cod_loadout_counts = pgTable(
+    'cod_loadout_counts',
+    {
+        uno: varchar(C.UNO, { length: NAME_LIMIT_2 }).notNull(),
+        game_mode: varchar(C.GAME_MODE, { length: NAME_LIMIT }).$type<GameModeMw>().notNull(),
+        primary_weapon: varchar('primary_weapon', { length: NAME_LIMIT }).notNull(),
+        secondary_weapon: varchar('secondary_weapon', { length: NAME_LIMIT }).notNull(),
+        count: integer('count').notNull().default(0),
+    },
+    table => [primaryKey({
+        columns: [table.uno, table.game_mode, table.primary_weapon, table.secondary_weapon]
+    })]
+)
@@ -6,6 +6,7 @@ import {
     smallint,
     integer,
     bigint,
+    customType,
 } from 'drizzle-orm/pg-core'
 import {
     C,
@@ -15,6 +16,12 @@ import {
 import { PlayerUno } from '@/app/components/zod/Uno'
 import { MatchID, MatchResult } from '@/app/components/zod/Match'
 
+export const bytea = customType<{ data: Buffer }>({
+    dataType() {
+        return 'bytea'
+    },
+})
+
 export const all_games_basic_indexes = [C.ID, C.TIME, C.MATCHID, C.UNO]
 export const matches_basic_indexes = [
     ...all_games_basic_indexes,
@@ -87,6 +94,7 @@ export const basic_mw = () => ({
 
     damageTaken: bigint('damageTaken', { mode: 'number' }),
     loadout: varchar(C.LOADOUT),
+    loadout_bin: bytea('loadout_bin'),
 
     objectiveMedalScoreKillSsAssaultDrone: smallint('objectiveMedalScoreKillSsAssaultDrone'),
     objectiveMedalScoreKillSsManualTurret: smallint('objectiveMedalScoreKillSsManualTurret'),
@@ -139,6 +147,7 @@ export const matches_mw_mp = () => ({
     team1Score: smallint('team1Score'),
     team2Score: smallint('team2Score'),
     weaponStats: varchar('weaponStats'),
+    weaponStats_bin: bytea('weaponStats_bin'),
 
     objectiveBrDoomstationActivation: smallint('objectiveBrDoomstationActivation'),
     objectiveBrDoomstationSuccess: smallint('objectiveBrDoomstationSuccess'),
@@ -147,6 +147,7 @@ export default function MatchesTable({ slug_router }: { slug_router?: Router })
     const [error, setError] = useState('')
     const [pageData, setPageData] = useState({ found: 0, is_has_more: true })
     const dateMatches = useRef<[RouterDate, DateData][]>([])
+    const cursor = useRef('')
     const summaryMatches = useRef(initial_date_data([]))
 
     const router = slug_router || context_router
@@ -155,7 +156,10 @@ export default function MatchesTable({ slug_router }: { slug_router?: Router })
         router.page = matches_loaded ? router.page + 1 : 1
         let res = await cache_matches_get(router)
         if (!res) {
-            const res1 = await fetch_request<MatchesResponse>('matches_router', router)
+            const res1 = await fetch_request<MatchesResponse>(
+                'matches_router',
+                { ...router, cursor: router.page > 1 ? cursor.current : '' },
+            )
             if (!res1 || res1.detail) {
                 setError(res1?.detail || `${C.DATA} ${C.NOT_FOUND}`)
                 return
@@ -163,6 +167,7 @@ export default function MatchesTable({ slug_router }: { slug_router?: Router })
             res = res1
         }
 
+        cursor.current = res.cursor || ''
         summaryMatches.current = initial_date_data([...summaryMatches.current.matches, ...res.matches])
         dateMatches.current = Object.entries(
             Object.groupBy(
@@ -173,7 +178,10 @@ export default function MatchesTable({ slug_router }: { slug_router?: Router })
             const found = router.page > 1 ? prev.found : res.found
             return {
                 found,
-                is_has_more: summaryMatches.current.matches.length < found,
+                // found can be estimated, next page cursor is exact
+                is_has_more: res.cursor === undefined
+                    ? summaryMatches.current.matches.length < found
+                    : Boolean(res.cursor),
             }
         })
     }
@@ -5,7 +5,7 @@ import { LabelDataSchema } from '@/app/components/zod/Label'
 import { PlayerUnoSchema } from '@/app/components/zod/Uno'
 import { MatchesSourceSchema } from '@/app/components/zod/MatchesSource'
 import { YearSchema } from '@/app/components/zod/Table'
-import { GameModeOnlySchema } from '@/app/components/zod/GameMode'
+import { GameModeOnlySchema, GameModeMwSchema } from '@/app/components/zod/GameMode'
 
 export const MatchColumnSchema = z.enum([
     C.TIME_PLAYED,
@@ -144,6 +144,22 @@ export const MatchDataSchema = z.object({
 })
 export type MatchData = z.infer<typeof MatchDataSchema>
 
+export const MatchJobStatusSchema = z.enum([
+    'pending', 'running', C.COMPLETED, C.ERROR, C.NOT_FOUND
+])
+export type MatchJobStatus = z.infer<typeof MatchJobStatusSchema>
+
+export const MatchJobSchema = z.object({
+    id: z.string(),
+    matchID: z.string(),
+    game_mode: GameModeMwSchema,
+    year: z.string(),
+    status: MatchJobStatusSchema,
+    time: z.string().datetime(),
+    match: MatchDataSchema.nullable().optional(),
+})
+export type MatchJob = z.infer<typeof MatchJobSchema>
+
 export const MatchBodySchema = z.object({
     game_mode: GameModeOnlySchema,
     match_id: z.number().nonnegative(),
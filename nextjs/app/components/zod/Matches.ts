@@ -50,5 +50,6 @@ export type DateData = z.infer<typeof DateDataSchema>
 export const MatchesResponseSchema = z.object({
     matches: z.array(MatchesDataSchema),
     found: z.number(),
+    cursor: z.string().nullable().optional(),
 })
 export type MatchesResponse = z.infer<typeof MatchesResponseSchema>
@@ -43,15 +43,34 @@ export const PanelStatusesSchema = z.object({
 })
 export type PanelStatuses = z.infer<typeof PanelStatusesSchema>
 
+export const RateLimitSchema = z.object({
+    tokens: z.number(),
+    capacity: z.number().nonnegative(),
+    refill_per_minute: z.number().nonnegative(),
+    wait: z.number().nonnegative(),
+})
+export type RateLimit = z.infer<typeof RateLimitSchema>
+
+export const MatchesCacheStatsSchema = z.object({
+    hits: z.number().nonnegative(),
+    misses: z.number().nonnegative(),
+    hit_rate: z.number().nonnegative(),
+    ttl: z.number().nonnegative(),
+})
+export type MatchesCacheStats = z.infer<typeof MatchesCacheStatsSchema>
+
 export const ResetTypeSchema = z.enum([
     C.PLAYERS,
     C.LOADOUT,
     C.CHART,
+    'chart_rollup',
+    'play_with',
     C.TASK_QUEUES,
     C.UPDATE_PLAYERS,
     C.STATUS,
     C.MATCHES,
     C.MONITOR,
+    'rate_limit',
     'matches_stats',
     'base_stats',
     'tracker_stats',
@@ -71,6 +90,8 @@ export type ResetResponse = z.infer<typeof ResetResponseSchema>
 export const PanelSchema = z.object({
     time: z.string().nullable(),
     statuses: PanelStatusesSchema,
+    rate_limit: RateLimitSchema,
+    matches_cache: MatchesCacheStatsSchema,
     pages: z.record(z.string(), z.number().nonnegative().nullable()),
     task_queues: z.array(TaskSchema),
     update_players: z.array(UpdatePlayersSchema),
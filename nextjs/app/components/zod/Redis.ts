@@ -95,19 +95,18 @@ export type CachePlayerUnoFind = z.infer<typeof CachePlayerUnoFindSchema>
 
 export const CacheKeySchema = z.string()
     .refine(
-        (val): val is `${RouterOrderAll}_${RouterDate}_${RouterPage}` => {
+        (val): val is `${RouterOrderAll}_${RouterDate}_${RouterPage}_${string}` => {
             const parts = val.split('_')
-            if (parts.length < 3) return false
+            if (parts.length < 4) return false
 
-            const [order, ...rest] = parts
-            const page = rest.pop()
-            const date = rest.join('_')
+            // cursor is urlsafe base64 and can contain `_`
+            const [order, date, page] = parts
 
             return RouterOrderAllSchema.safeParse(order).success &&
                 RouterDateSchema.safeParse(date).success &&
-                RouterPageSchema.safeParse(page).success
+                RouterPageSchema.safeParse(Number(page)).success
         },
-        { message: `Must follow format: <RouterOrderAll>_<RouterDate>_<RouterTargetPage>` }
+        { message: `Must follow format: <RouterOrderAll>_<RouterDate>_<RouterTargetPage>_<cursor>` }
     )
 export type CacheKey = z.infer<typeof CacheKeySchema>
 
@@ -70,6 +70,7 @@ export const RouterSchema = z.object({
     order: RouterOrderAllSchema,
     date: RouterDateSchema,
     page: RouterPageSchema,
+    cursor: z.string().optional(),
 })
 export type Router = z.infer<typeof RouterSchema>
 
@@ -32,6 +32,7 @@ import {
   MatchIDSchema,
   MatchColumn,
   MatchData,
+  MatchJob,
   MatchParams,
   MatchPlayer,
   TeamData,
@@ -110,12 +111,25 @@ export default function Match({ params }: {
   }
 
   const load_match = async () => {
-    const res = await fetch_request<MatchData>(`match/${matchID}/${game_mode}`)
+    const res = await fetch_request<MatchData | MatchJob>(`match/${matchID}/${game_mode}`)
     if (!res || res.detail) {
       setError(res?.detail || `${C.DATA} ${C.NOT_FOUND}`)
       return
     }
-    setMatch(res)
+    if ('team' in res) {
+      setMatch(res)
+    } else {
+      // match not saved yet, parsing job result waited with long poll
+      let job: MatchJob & { detail?: string } | undefined = res
+      while (job && !job.detail && ['pending', 'running'].includes(job.status)) {
+        job = await fetch_request<MatchJob>(`match_job/${job.id}?wait=20`)
+      }
+      if (!job?.match) {
+        setError(job?.detail || `${C.MATCH} ${job?.status || C.NOT_FOUND}`)
+        return
+      }
+      setMatch(job.match)
+    }
     setTimeout(() => scroll_to(follow), 1000)
   }
 
@@ -36,6 +36,8 @@ import {
 } from '@/app/components/zod/TrackerStats'
 import {
   PanelStatuses,
+  RateLimit,
+  MatchesCacheStats,
   BaseStats,
   UpdatePlayers,
   ResetType,
@@ -62,6 +64,8 @@ export default function AdminPanel() {
         </h3>
       )}
       <StatusButtons panel_statuses={panel.statuses} fetch_data={fetch_data} />
+      <RateLimitInfo rate_limit={panel.rate_limit} />
+      <MatchesCacheInfo matches_cache={panel.matches_cache} />
       <TaskQueues task_queues={panel.task_queues} />
       <AllUpdateTable update_players={panel.update_players} />
       <div className="p-4">
@@ -343,6 +347,35 @@ const ClearFullmatchDoubles = () => {
   </>
 }
 
+const RateLimitInfo = ({ rate_limit }: { rate_limit: RateLimit }) => {
+  const { t } = useAppContext()
+
+  return (
+    <div className="flex justify-center gap-2 text-sm">
+      <span title={t('rate limit')}>
+        {t('tokens')}: {rate_limit.tokens} / {rate_limit.capacity}
+      </span>
+      <span>{t('refill per minute')}: {rate_limit.refill_per_minute}</span>
+      {rate_limit.wait > 0 && (
+        <span className="text-yellow-400">{t('wait')}: {rate_limit.wait}s</span>
+      )}
+    </div>
+  )
+}
+
+const MatchesCacheInfo = ({ matches_cache }: { matches_cache: MatchesCacheStats }) => {
+  const { t } = useAppContext()
+
+  return (
+    <div className="flex justify-center gap-2 text-sm" title={t('matches cache')}>
+      <span>{t('hits')}: {matches_cache.hits}</span>
+      <span>{t('misses')}: {matches_cache.misses}</span>
+      <span>{t('hit rate')}: {matches_cache.hit_rate}%</span>
+      <span>{t('ttl')}: {matches_cache.ttl}s</span>
+    </div>
+  )
+}
+
 const TaskQueues = ({ task_queues = [] }: { task_queues: Task[] }) => {
   const { t } = useAppContext()
   const [fetching, setFetching] = useState(false)
@@ -659,6 +659,12 @@ GROUP_NAME_LENGTH_LIMIT=12
 PARS_PRE_LIMIT=800
 MATCHES_LIMIT=20
 PAGE_LIMIT=20
+MATCHES_CACHE_TTL=3600 # seconds, matches pages cache lifetime
+
+FETCH_CONCURRENCY=4 # parallel requests to game data api
+FETCH_TIMEOUT=30 # seconds, game data api request timeout
+RATE_LIMIT_CAPACITY=10 # game data api requests burst
+RATE_LIMIT_PER_MINUTE=60 # game data api requests shared by all processes
 
 LOGS_CACHE_LIMIT=40
 LOGS_GAMES_LIMIT=20